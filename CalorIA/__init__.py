@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 
 from CalorIA.mixins.tools import ToolsMixin
 from CalorIA.mixins.mongo import MongoMixin
+from CalorIA.mixins.fanout import FanOutMixin
+from CalorIA.mixins.cache import CacheMixin
 
 # Modules
 from CalorIA.mixins.modules.ingredients import IngredientMixin
@@ -18,6 +20,8 @@ from CalorIA.mixins.modules.activities import ActivityMixin
 from CalorIA.mixins.modules.meal_prep_assistants import MealPrepAssistantMixin
 from CalorIA.mixins.modules.ai_assistant import AIAssistantMixin
 from CalorIA.mixins.modules.inventory import InventoryMixin
+from CalorIA.mixins.modules.daily_rollups import DailyRollupMixin
+from CalorIA.mixins.modules.dashboard import DashboardMixin
 
 # Load environment variables from .env file
 load_dotenv()
@@ -25,6 +29,8 @@ load_dotenv()
 class Client(
     ToolsMixin,
     MongoMixin,
+    FanOutMixin,
+    CacheMixin,
     IngredientMixin,
     MealMixin,
     MealPrepMixin,
@@ -37,7 +43,9 @@ class Client(
     ActivityMixin,
     MealPrepAssistantMixin,
     AIAssistantMixin,
-    InventoryMixin
+    InventoryMixin,
+    DailyRollupMixin,
+    DashboardMixin
 ):
   
     def __init__(self, **kwargs):
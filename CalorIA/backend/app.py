@@ -2,12 +2,19 @@ from flask import Flask, jsonify, send_from_directory, send_file, g
 from flask_cors import CORS
 import os
 import sys
+import atexit
 import argparse
 from pathlib import Path
 import CalorIA as caloria
+from CalorIA.mixins.mongo import close_mongo_clients
+from CalorIA.mixins.fanout import shutdown_fanout_executor
 
 def get_client():
-    """Get CalorIA client instance from Flask's g context"""
+    """Get CalorIA client instance from Flask's g context.
+
+    The Client itself is cheap to build; its MongoDB connection comes from the
+    process-wide pooled MongoClient, so no connection is opened per request.
+    """
     if 'client' not in g:
         g.client = caloria.Client()
     return g.client
@@ -16,20 +23,72 @@ def close_client(error):
     """Close client connection when app context ends"""
     client = g.pop('client', None)
     if client is not None:
-        # The CalorIA Client uses connection pooling, no explicit close needed
+        # The pooled MongoClient is shared across requests; it is closed on shutdown
         pass
 
+def add_request_trace(response):
+    """Expose the request's fan-out/trace spans as a Server-Timing header"""
+    client = g.get('client')
+    if client is not None:
+        header = client.get_server_timing_header()
+        if header:
+            response.headers['Server-Timing'] = header
+            trace = client.get_request_trace()
+            print(f"Critical path {trace['critical_path_ms']}ms: {' -> '.join(trace['critical_path'])}")
+    return response
+
+# Whether this process has started building its in-memory search indexes
+_search_indexes_started = False
+
+def start_search_index_builds():
+    """Start building the in-memory search indexes in the background on the process's first request"""
+    global _search_indexes_started
+    if not _search_indexes_started:
+        _search_indexes_started = True
+        client = caloria.Client()
+        client.get_ready_ingredient_search_index()
+        client.get_ready_recipe_search_index()
+
+def shutdown_client():
+    """Close the pooled MongoDB connections and fan-out pool when the process exits"""
+    shutdown_fanout_executor()
+    close_mongo_clients()
+
+# Close pooled MongoDB connections on interpreter shutdown
+atexit.register(shutdown_client)
+
 def create_app():
     """Create and configure the Flask application"""
     # Configure Flask to serve static files from React build
     static_folder = Path(__file__).parent.parent / "frontend" / "build"
     app = Flask(__name__, static_folder=str(static_folder))
+
+    # Encode JSON responses with orjson when available (models can be passed to jsonify directly)
+    from CalorIA.backend.json_provider import CalorIAJSONProvider
+    app.json = CalorIAJSONProvider(app)
     
     # Enable CORS for the frontend running on various local origins
     CORS(app, origins=['http://localhost:3852', 'http://127.0.0.1:3852', 'http://localhost:4032', 'http://127.0.0.1:4032'])
 
     # Register the client teardown function
     app.teardown_appcontext(close_client)
+
+    # Optionally report each request's trace (Server-Timing header + critical path log)
+    if os.getenv('CALORIA_TRACE_REQUESTS', '').lower() in ('1', 'true', 'yes'):
+        app.after_request(add_request_trace)
+    
+    # Optionally report missing indexes (and hot query plans) at startup
+    check_indexes = os.getenv('CALORIA_CHECK_INDEXES', '').lower()
+    if check_indexes in ('1', 'true', 'yes', 'explain'):
+        try:
+            caloria.Client().check_indexes(explain=check_indexes == 'explain')
+        except Exception as e:
+            print(f"Index check failed: {e}")
+    
+    # Build the in-memory search indexes in the background once a worker serves requests,
+    # not here: startup must not wait for (or fail on) the database, and a preloaded
+    # server forks its workers after create_app. Searches use MongoDB until then.
+    app.before_request(start_search_index_builds)
     
     # Import and register blueprints (inside function to prevent circular imports)
     from CalorIA.mixins.routes import register_blueprints
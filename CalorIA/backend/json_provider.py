@@ -0,0 +1,74 @@
+from decimal import Decimal
+from datetime import datetime, date, time
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from flask.json.provider import DefaultJSONProvider
+
+from CalorIA.types import CalorIAModel
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class CalorIAJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses with orjson when it is installed.
+
+    UUIDs, datetimes/dates/times and Enums are encoded natively, and CalorIA
+    models can be passed to jsonify() as they are: they are encoded the same
+    way their to_dict() would encode them. Without orjson (or when dumps() is
+    called with stdlib json options) the stdlib encoder is used with the same
+    conversions.
+    """
+
+    use_orjson = ORJSON_AVAILABLE
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, CalorIAModel):
+            if type(o).to_dict is CalorIAModel.to_dict:
+                # pydantic's own dump keeps UUID/datetime/Enum values for the encoder
+                return o.model_dump(exclude_none=True)
+            return o.to_dict()  # models adding computed fields (e.g. WeightEntry.weight_kg)
+        if isinstance(o, Enum):
+            return o.value
+        if isinstance(o, UUID):
+            return str(o)
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return float(o)  # same choice as CalorIAModel.to_dict
+        if isinstance(o, (set, frozenset, tuple)):
+            return list(o)
+        return DefaultJSONProvider.default(o)
+
+    def _orjson_option(self, pretty: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not self.use_orjson or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if not self.use_orjson or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        if not self.use_orjson:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_option(pretty) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
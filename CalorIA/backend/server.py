@@ -0,0 +1,100 @@
+import os
+import sys
+from typing import Any, Dict
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    # gunicorn is POSIX-only (its import fails on Windows)
+    GUNICORN_AVAILABLE = False
+
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+
+if GUNICORN_AVAILABLE:
+    class CalorIAApplication(BaseApplication):
+        """gunicorn application serving create_app() with options set in code instead of a config file."""
+
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from CalorIA.backend.app import create_app
+            return create_app()
+
+
+def get_server_options(host: str, port: int, workers: int, threads: int, keep_alive: int,
+                       graceful_timeout: int, timeout: int, max_requests: int = 0) -> Dict[str, Any]:
+    """Build the gunicorn settings for the production server.
+
+    The app is preloaded in the master process and forked into the workers, so
+    startup work (imports, create_app(), the optional index check) runs once.
+    Pooled MongoDB clients and the fan-out pool are re-created in each worker.
+    """
+    return {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "threads": threads,
+        # gthread workers serve several requests per process while others wait on MongoDB
+        "worker_class": "gthread" if threads > 1 else "sync",
+        "preload_app": True,
+        "keepalive": keep_alive,
+        "graceful_timeout": graceful_timeout,
+        "timeout": timeout,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10 if max_requests else 0,
+        "accesslog": os.getenv('CALORIA_ACCESS_LOG') or None,
+    }
+
+
+def serve(host: str = '0.0.0.0', port: int = 4032, workers: int = 2, threads: int = 4,
+          keep_alive: int = 5, graceful_timeout: int = 30, timeout: int = 60,
+          max_requests: int = 0) -> None:
+    """Run the backend under a production WSGI server (blocks until it stops).
+
+    gunicorn is used where available: send SIGHUP to the master to restart the
+    workers gracefully (in-flight requests finish within graceful_timeout),
+    SIGTERM for a graceful shutdown. Because the app is preloaded, deploying
+    new code needs a full restart. On Windows, where gunicorn cannot run,
+    waitress serves the app from a single process with `threads` threads.
+
+    Args:
+        host: Interface to bind to
+        port: Port to bind to
+        workers: Worker processes
+        threads: Threads per worker process
+        keep_alive: Seconds an idle keep-alive connection is kept open
+        graceful_timeout: Seconds workers get to finish in-flight requests on reload/shutdown
+        timeout: Seconds a request may run before its worker is restarted
+        max_requests: Restart a worker after this many requests (0 disables)
+    """
+    if GUNICORN_AVAILABLE:
+        options = get_server_options(host, port, workers, threads, keep_alive, graceful_timeout,
+                                     timeout, max_requests)
+        print(f"Serving CalorIA on http://{host}:{port} with gunicorn "
+              f"({workers} workers x {threads} threads, master pid {os.getpid()})")
+        print(f"Graceful reload: kill -HUP {os.getpid()}")
+        CalorIAApplication(options).run()
+        return
+
+    if WAITRESS_AVAILABLE:
+        from CalorIA.backend.app import create_app
+        if workers > 1:
+            print("⚠️  waitress runs a single process; use --threads to scale it")
+        print(f"Serving CalorIA on http://{host}:{port} with waitress ({threads} threads)")
+        waitress.serve(create_app(), host=host, port=port, threads=threads, channel_timeout=keep_alive)
+        return
+
+    print("❌ No production WSGI server installed: pip install gunicorn (or waitress on Windows)", file=sys.stderr)
+    sys.exit(1)
+
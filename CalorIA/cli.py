@@ -25,15 +25,44 @@ def cli():
     pass
 
 
+def frontend_build_is_current(frontend_dir):
+    """Check whether the React build output is newer than every file it is built from."""
+    index_html = frontend_dir / "build" / "index.html"
+    if not index_html.exists():
+        return False
+    built_at = index_html.stat().st_mtime
+
+    sources = [frontend_dir / "src", frontend_dir / "public",
+               frontend_dir / "package.json", frontend_dir / "package-lock.json"]
+    sources += list(frontend_dir.glob(".env*")) + list(frontend_dir.glob("*.config.js"))
+    for source in sources:
+        if not source.exists():
+            continue
+        paths = source.rglob('*') if source.is_dir() else [source]
+        for path in paths:
+            if path.is_file() and path.stat().st_mtime > built_at:
+                return False
+    return True
+
+
 @cli.command()
 @click.option('--host', default='127.0.0.1', help='Host to bind to')
 @click.option('--port', default=4032, help='Port to bind to')
 @click.option('--debug', is_flag=True, help='Run in debug mode')
-def backend(host, port, debug):
-    """Start the Flask backend server."""
-    click.echo("Building frontend first...")
-    
-    # Build frontend before starting backend
+@click.option('--workers', type=int, help='Serve with a production WSGI server using this many worker processes')
+@click.option('--threads', default=4, help='Threads per worker process (production mode)')
+@click.option('--keep-alive', default=5, help='Seconds to keep idle keep-alive connections open (production mode)')
+@click.option('--graceful-timeout', default=30, help='Seconds workers get to finish requests on reload/shutdown (production mode)')
+@click.option('--timeout', default=60, help='Seconds a request may run before its worker is restarted (production mode)')
+@click.option('--force-build', is_flag=True, help='Rebuild the frontend even if the build is up to date')
+@click.option('--skip-build', is_flag=True, help='Do not build the frontend')
+def backend(host, port, debug, workers, threads, keep_alive, graceful_timeout, timeout, force_build, skip_build):
+    """Start the Flask backend server.
+
+    Without --workers the Flask development server is used. With --workers the
+    app is preloaded and served by gunicorn (waitress on Windows); send SIGHUP
+    to the master process for a graceful reload of the workers.
+    """
     project_root = get_project_root()
     frontend_dir = project_root / "CalorIA" / "frontend"
     package_json = frontend_dir / "package.json"
@@ -42,17 +71,43 @@ def backend(host, port, debug):
         click.echo(f"Error: {package_json} not found!", err=True)
         sys.exit(1)
     
-    # Change to frontend directory and build
     original_cwd = os.getcwd()
-    os.chdir(frontend_dir)
-    
-    try:
-        result = subprocess.run(['npm', 'run', 'build'], shell=True, check=True)
-        click.echo("Frontend build completed successfully!")
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ Error building React frontend: {e}", err=True)
-        sys.exit(1)
-    
+
+    # Build frontend before starting backend, unless the build output is up to date
+    if skip_build:
+        click.echo("Skipping frontend build.")
+    elif not force_build and frontend_build_is_current(frontend_dir):
+        click.echo("Frontend build is up to date, skipping build (use --force-build to rebuild).")
+    else:
+        click.echo("Building frontend first...")
+        os.chdir(frontend_dir)
+        try:
+            result = subprocess.run(['npm', 'run', 'build'], shell=True, check=True)
+            click.echo("Frontend build completed successfully!")
+        except subprocess.CalledProcessError as e:
+            click.echo(f"❌ Error building React frontend: {e}", err=True)
+            sys.exit(1)
+        finally:
+            os.chdir(original_cwd)
+
+    if workers:
+        from CalorIA.backend.server import serve
+
+        # The memory cache is per process: a write in one worker would leave the others serving stale dashboards
+        if workers > 1 and os.getenv('CALORIA_CACHE_BACKEND', '').lower() == 'memory':
+            click.echo("⚠️  CALORIA_CACHE_BACKEND=memory cannot be shared by several workers, "
+                       "dashboard caching disabled (use redis)", err=True)
+            os.environ['CALORIA_CACHE_BACKEND'] = 'none'
+
+        if debug:
+            click.echo("--debug is ignored in production mode", err=True)
+        try:
+            serve(host=host, port=port, workers=workers, threads=threads, keep_alive=keep_alive,
+                  graceful_timeout=graceful_timeout, timeout=timeout)
+        except KeyboardInterrupt:
+            click.echo("\nBackend server stopped.")
+        return
+
     # Now start the Flask backend server
     click.echo("Starting Flask backend server...")
     
@@ -198,6 +253,176 @@ def unseed(confirm):
         sys.exit(1)
 
 
+@cli.group()
+def db():
+    """Database maintenance commands (indexes, migrations)."""
+    pass
+
+
+@db.command('ensure-indexes')
+@click.option('--collection', 'collections', multiple=True, help='Only ensure indexes for this collection (repeatable)')
+def ensure_indexes(collections):
+    """Create the indexes declared by every mixin if they are missing."""
+    try:
+        import CalorIA as caloria
+
+        client = caloria.Client()
+        if client.get_db_connection() is None:
+            click.echo("❌ Failed to connect to database. Please check your MongoDB connection.", err=True)
+            sys.exit(1)
+
+        results = client.ensure_indexes(list(collections) or None)
+        for collection_name, index_names in results.items():
+            click.echo(f"   • {collection_name}: {', '.join(index_names) if index_names else 'no indexes ensured'}")
+        click.echo("✅ Indexes ensured")
+
+    except KeyboardInterrupt:
+        click.echo("\n Index creation interrupted.")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Unexpected error while ensuring indexes: {e}", err=True)
+        sys.exit(1)
+
+
+@db.command('check-indexes')
+@click.option('--explain', is_flag=True, help='Also explain the hot queries and show whether they use an index')
+def check_indexes(explain):
+    """Report declared indexes that are missing from the database."""
+    try:
+        import CalorIA as caloria
+
+        client = caloria.Client()
+        if client.get_db_connection() is None:
+            click.echo("❌ Failed to connect to database. Please check your MongoDB connection.", err=True)
+            sys.exit(1)
+
+        if not client.check_indexes(explain=explain):
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        click.echo("\n Index check interrupted.")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Unexpected error while checking indexes: {e}", err=True)
+        sys.exit(1)
+
+
+@db.command('backfill-meal-dates')
+def backfill_meal_dates():
+    """Set the indexed on_date field on meals logged before it existed."""
+    try:
+        import CalorIA as caloria
+
+        client = caloria.Client()
+        if client.get_db_connection() is None:
+            click.echo("❌ Failed to connect to database. Please check your MongoDB connection.", err=True)
+            sys.exit(1)
+
+        updated = client.backfill_meal_dates()
+        click.echo(f"✅ Backfilled on_date on {updated} meals")
+
+    except KeyboardInterrupt:
+        click.echo("\n Meal date backfill interrupted.")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Unexpected error while backfilling meal dates: {e}", err=True)
+        sys.exit(1)
+
+
+@db.command('rebuild-rollups')
+@click.option('--user-id', help='Only rebuild the daily rollups of this user')
+def rebuild_rollups(user_id):
+    """Recompute the daily_rollups collection from the raw meal, water, activity and weight entries."""
+    try:
+        import CalorIA as caloria
+        from uuid import UUID
+
+        if user_id:
+            try:
+                user_id = UUID(user_id)
+            except ValueError:
+                click.echo(f"❌ Invalid user ID: {user_id}", err=True)
+                sys.exit(1)
+
+        client = caloria.Client()
+        if client.get_db_connection() is None:
+            click.echo("❌ Failed to connect to database. Please check your MongoDB connection.", err=True)
+            sys.exit(1)
+
+        written = client.rebuild_daily_rollups(user_id)
+        click.echo(f"✅ Rebuilt {written} daily rollups")
+
+    except KeyboardInterrupt:
+        click.echo("\n Daily rollup rebuild interrupted.")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Unexpected error while rebuilding daily rollups: {e}", err=True)
+        sys.exit(1)
+
+
+@db.command('migrate-daily-logs')
+def migrate_daily_logs():
+    """Merge duplicate daily logs, make their (user_id, log_date) index unique and backfill meal_count/totals."""
+    try:
+        import CalorIA as caloria
+
+        client = caloria.Client()
+        if client.get_db_connection() is None:
+            click.echo("❌ Failed to connect to database. Please check your MongoDB connection.", err=True)
+            sys.exit(1)
+
+        result = client.migrate_daily_logs()
+        click.echo(f"✅ Merged {result['merged']} duplicate daily logs, backfilled {result['backfilled']} daily logs")
+        if not result['indexed']:
+            click.echo("❌ The unique user_id_log_date index could not be created", err=True)
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        click.echo("\n Daily log migration interrupted.")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Unexpected error while migrating daily logs: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.group()
+def recipes():
+    """Recipe maintenance commands."""
+    pass
+
+
+@recipes.command('recompute-nutrition')
+@click.option('--batch-size', default=1000, help='Recipes computed and written per batch')
+@click.option('--only-missing', is_flag=True, help='Only recipes without stored nutrition')
+def recompute_nutrition(batch_size, only_missing):
+    """Recompute the stored per-serving and total nutrition of every recipe from its ingredients."""
+    try:
+        import CalorIA as caloria
+        from CalorIA.mixins.nutrition import NUMPY_AVAILABLE
+
+        client = caloria.Client()
+        if client.get_db_connection() is None:
+            click.echo("❌ Failed to connect to database. Please check your MongoDB connection.", err=True)
+            sys.exit(1)
+
+        if not NUMPY_AVAILABLE:
+            click.echo("⚠️  numpy is not installed (pip install numpy), computing without vectorization")
+        stats = client.recompute_recipe_nutrition(batch_size=batch_size, only_missing=only_missing)
+        click.echo(f"✅ Recomputed {stats['processed']} recipes, {stats['updated']} changed")
+        if stats['failed']:
+            click.echo(f"❌ {stats['failed']} recipe updates failed", err=True)
+        if stats['unconverted_ingredients']:
+            click.echo(f"⚠️  {stats['unconverted_ingredients']} ingredient lines had no gram conversion "
+                       f"(e.g. 'unit' without grams_per_unit) and were left out")
+
+    except KeyboardInterrupt:
+        click.echo("\n Nutrition recompute interrupted.")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Unexpected error while recomputing nutrition: {e}", err=True)
+        sys.exit(1)
+
+
 @cli.command()
 @click.option('--category', help='Specific category to research (if not provided, will show available categories)')
 @click.option('--max-ingredients', default=20, help='Maximum number of ingredients to add')
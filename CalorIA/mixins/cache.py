@@ -0,0 +1,352 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Optional, Any, Callable, Dict, List, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL.
+
+    Entries live in this process only, so with several backend workers a write
+    handled by one worker cannot evict another worker's copy before its TTL
+    expires; use the redis backend there.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: int = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}     # never evicted, unlike the entries
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters[key] = self._counters.get(key, 0) + 1
+            return value
+
+
+class RedisCache:
+    """Cache backed by any Redis-compatible client (redis.Redis, fakeredis.FakeRedis, ...)."""
+
+    def __init__(self, redis_client: Any, default_ttl: int = 300):
+        self.redis = redis_client
+        self.default_ttl = default_ttl
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.redis.get(key)
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self.redis.set(key, value, ex=ttl if ttl is not None else self.default_ttl)
+
+    def delete(self, key: str) -> None:
+        self.redis.delete(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        keys = list(self.redis.scan_iter(match=f"{prefix}*"))
+        if keys:
+            self.redis.delete(*keys)
+
+    def get_counter(self, key: str) -> int:
+        return int(self.redis.get(key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self.redis.incr(key)
+
+
+# Process-wide cache shared by every Client (None until first use, False when disabled)
+_cache: Any = None
+_cache_lock = threading.Lock()
+
+
+def create_cache() -> Any:
+    """Build the cache backend selected by the environment.
+
+    Environment variables:
+        CALORIA_CACHE_BACKEND: 'none' (default), 'redis', 'fakeredis' or 'memory'. The
+            memory backend is per process: only use it with a single backend worker
+        CALORIA_CACHE_URL: Redis URL for the redis backend (default redis://localhost:6379/0)
+        CALORIA_CACHE_TTL: Entry lifetime in seconds (default 300)
+        CALORIA_CACHE_MAX_ENTRIES: Capacity of the memory backend (default 1024)
+
+    Returns:
+        MemoryCache or RedisCache instance, or None when caching is disabled
+    """
+    backend = os.getenv('CALORIA_CACHE_BACKEND', 'none').lower()
+    ttl = int(os.getenv('CALORIA_CACHE_TTL', '300'))
+
+    if backend == 'none':
+        return None
+    if backend == 'redis':
+        if not REDIS_AVAILABLE:
+            # Not the memory cache: redis is chosen for several workers, where it would serve stale data
+            print("⚠️  redis is not installed (pip install redis), dashboard caching disabled")
+            return None
+        url = os.getenv('CALORIA_CACHE_URL', 'redis://localhost:6379/0')
+        return RedisCache(redis.Redis.from_url(url), default_ttl=ttl)
+    if backend == 'fakeredis':
+        try:
+            import fakeredis
+            return RedisCache(fakeredis.FakeRedis(), default_ttl=ttl)
+        except ImportError:
+            print("⚠️  fakeredis is not installed (pip install fakeredis), falling back to the memory cache")
+
+    max_entries = int(os.getenv('CALORIA_CACHE_MAX_ENTRIES', '1024'))
+    return MemoryCache(max_entries=max_entries, default_ttl=ttl)
+
+
+def get_cache() -> Any:
+    """Return the shared cache backend (None when caching is disabled)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_cache() or False
+    return _cache or None
+
+
+class TaxonomyLookup:
+    """Read-only id/slug/name tables of one taxonomy collection (categories or tags).
+
+    The models are shared by every caller of the same snapshot; copy one
+    before modifying it.
+    """
+
+    __slots__ = ('version', 'items', 'by_id', 'by_slug', 'by_name')
+
+    def __init__(self, items: List[Any], version: int = 0):
+        self.version = version
+        self.items = items
+        self.by_id: Dict[str, Any] = {}
+        self.by_slug: Dict[str, Any] = {}
+        self.by_name: Dict[str, Any] = {}
+        for item in items:
+            self.by_id[str(item.id)] = item
+            if item.slug:
+                self.by_slug[item.slug] = item
+            # First one wins, like the sorted-by-name scan this replaces
+            self.by_name.setdefault(item.name.casefold(), item)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def names(self) -> Dict[str, str]:
+        """Map each id to its name."""
+        return {item_id: item.name for item_id, item in self.by_id.items()}
+
+    def resolve(self, value: str, slug_separator: str) -> Optional[Any]:
+        """Find an item by slug (spaces become slug_separator) or case-insensitive name."""
+        return self.by_slug.get(value.lower().replace(' ', slug_separator)) or self.by_name.get(value.casefold())
+
+
+class TaxonomyCache:
+    """Versioned in-process cache of a taxonomy collection's lookup tables.
+
+    Writes through the mixins call invalidate(), which bumps the version so the
+    next get() reloads. Writes made by other processes (or straight to the
+    collection) are picked up once the snapshot is older than ttl seconds.
+    """
+
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        self._lookup: Optional[TaxonomyLookup] = None
+        self._loaded_at = 0.0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def get(self, load: Callable[[], Optional[List[Any]]]) -> TaxonomyLookup:
+        """Return the current lookup tables, reloading them with load() when stale.
+
+        load returns the collection's models, or None when the read failed (an
+        empty snapshot is returned then and nothing is cached).
+        """
+        lookup = self._lookup
+        if (lookup is not None and lookup.version == self._version
+                and time.monotonic() - self._loaded_at < self.ttl):
+            return lookup
+
+        with self._lock:
+            version = self._version
+        items = load()
+        if items is None:
+            return TaxonomyLookup([], version)
+
+        lookup = TaxonomyLookup(items, version)
+        with self._lock:
+            # Keep the snapshot only if no write invalidated it while loading
+            if version == self._version:
+                self._lookup = lookup
+                self._loaded_at = time.monotonic()
+        return lookup
+
+
+# Process-wide taxonomy caches, keyed by collection name
+_taxonomy_caches: Dict[str, TaxonomyCache] = {}
+
+
+def get_taxonomy_cache(collection_name: str) -> TaxonomyCache:
+    """Return the shared taxonomy cache of a collection.
+
+    Environment variables:
+        CALORIA_TAXONOMY_CACHE_TTL: Seconds a snapshot is trusted without a local write (default 60)
+    """
+    taxonomy_cache = _taxonomy_caches.get(collection_name)
+    if taxonomy_cache is None:
+        with _cache_lock:
+            taxonomy_cache = _taxonomy_caches.get(collection_name)
+            if taxonomy_cache is None:
+                ttl = float(os.getenv('CALORIA_TAXONOMY_CACHE_TTL', '60'))
+                taxonomy_cache = _taxonomy_caches[collection_name] = TaxonomyCache(ttl=ttl)
+    return taxonomy_cache
+
+
+class CacheMixin:
+    """Mixin class that caches rendered dashboard payloads per (user_id, date).
+
+    Cache keys include the user's dashboard generation, which every write
+    bumps. A payload rendered before a write is stored under the previous
+    generation, even when a slow read stores it after the write, so it is
+    never served again and just expires. Cache failures are logged and
+    treated as misses.
+    """
+
+    # No __init__ needed as it will use the parent class's __init__
+
+    def _dashboard_generation_key(self, user_id: Any) -> str:
+        return f"dashboard-generation:{user_id}"
+
+    def _dashboard_cache_key(self, user_id: Any, on_date: Any, generation: int) -> str:
+        on_date = on_date.isoformat() if isinstance(on_date, date) else on_date
+        return f"dashboard:{user_id}:{generation}:{on_date}"
+
+    def get_dashboard_generation(self, user_id: Any) -> int:
+        """Get the user's dashboard generation; read it before rendering a payload to cache.
+
+        Returns:
+            The generation (0 when caching is disabled or the cache failed)
+        """
+        cache = get_cache()
+        if cache is None:
+            return 0
+        try:
+            return cache.get_counter(self._dashboard_generation_key(user_id))
+        except Exception as e:
+            print(f"Error reading dashboard cache: {e}")
+            return 0
+
+    def compute_etag(self, payload: Any) -> str:
+        """Compute a stable ETag for a JSON-serializable payload."""
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+    def get_cached_dashboard(self, user_id: Any, on_date: date, generation: int) -> Optional[Dict[str, Any]]:
+        """Get a cached dashboard payload.
+
+        Args:
+            user_id: UUID of the user
+            on_date: Date of the dashboard
+            generation: The user's dashboard generation (see get_dashboard_generation)
+
+        Returns:
+            Dictionary with "etag" and "payload" if cached, None otherwise
+        """
+        cache = get_cache()
+        if cache is None:
+            return None
+        try:
+            value = cache.get(self._dashboard_cache_key(user_id, on_date, generation))
+            return json.loads(value) if value else None
+        except Exception as e:
+            print(f"Error reading dashboard cache: {e}")
+            return None
+
+    def cache_dashboard(self, user_id: Any, on_date: date, payload: Dict[str, Any], generation: int) -> str:
+        """Store a dashboard payload and return its ETag.
+
+        Args:
+            user_id: UUID of the user
+            on_date: Date of the dashboard
+            payload: JSON-serializable dashboard data
+            generation: The user's dashboard generation read before the payload was rendered
+
+        Returns:
+            ETag of the payload (computed even when caching is disabled)
+        """
+        etag = self.compute_etag(payload)
+        cache = get_cache()
+        if cache is not None:
+            try:
+                value = json.dumps({"etag": etag, "payload": payload}, default=str)
+                cache.set(self._dashboard_cache_key(user_id, on_date, generation), value)
+            except Exception as e:
+                print(f"Error writing dashboard cache: {e}")
+        return etag
+
+    def invalidate_dashboard(self, user_id: Any, on_date: Any = None) -> None:
+        """Invalidate the cached dashboards of a user by bumping their generation.
+
+        Args:
+            user_id: UUID (or string) of the user
+            on_date: Date (or ISO string) the write changed; the generation is
+                per user, so every date is invalidated
+        """
+        cache = get_cache()
+        if cache is None or user_id is None:
+            return
+        try:
+            cache.incr(self._dashboard_generation_key(user_id))
+        except Exception as e:
+            print(f"Error invalidating dashboard cache: {e}")
@@ -0,0 +1,209 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Optional, Any, Callable, Dict, Iterator, List
+
+# Process-wide thread pool shared by every Client (and request)
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+_fanout_executor_lock = threading.Lock()
+
+
+def get_fanout_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used by FanOutMixin.fan_out.
+
+    The pool size is read once from CALORIA_FANOUT_WORKERS (default 16). It
+    should not exceed MONGODB_MAX_POOL_SIZE, since every worker may hold a
+    pooled MongoDB connection while it runs.
+    """
+    global _fanout_executor
+    executor = _fanout_executor
+    if executor is None:
+        with _fanout_executor_lock:
+            executor = _fanout_executor
+            if executor is None:
+                max_workers = int(os.getenv('CALORIA_FANOUT_WORKERS', '16'))
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='caloria-fanout')
+                _fanout_executor = executor
+    return executor
+
+
+def shutdown_fanout_executor() -> None:
+    """Shut down the shared fan-out thread pool (called on process exit)."""
+    global _fanout_executor
+    with _fanout_executor_lock:
+        executor, _fanout_executor = _fanout_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _forget_fanout_executor_after_fork() -> None:
+    """Drop the pool inherited from the parent process (its threads do not survive fork)."""
+    global _fanout_executor, _fanout_executor_lock
+    _fanout_executor = None
+    _fanout_executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_fanout_executor_after_fork)
+
+
+class FanOutMixin:
+    """Mixin class that runs independent reads concurrently and traces them.
+
+    A Client lives for one request (see backend.app.get_client), so the spans
+    recorded here describe that request only. Calls run on a shared thread
+    pool and use the shared pooled MongoClient, which is thread-safe.
+    """
+
+    def __init__(self, **kwargs):
+        self._trace_origin = time.perf_counter()
+        self._trace_spans: List[Dict[str, Any]] = []
+        self._trace_groups = 0
+        self._trace_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def fan_out(self, calls: Dict[str, Callable[[], Any]], timeout: Optional[float] = None,
+                timeouts: Optional[Dict[str, float]] = None,
+                defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run independent calls in parallel and collect their results by name.
+
+        A call that raises or misses its deadline yields its default instead, so
+        one slow source degrades the response rather than failing it. A call
+        that timed out keeps running on its worker until it finishes, because
+        threads cannot be interrupted; its result is discarded.
+
+        Bind callables in the calling thread, e.g. functools.partial(client.method,
+        ...): the routes' LocalProxy client cannot be resolved from pool threads.
+        Do not call fan_out from inside a fanned-out call. The nested calls
+        would wait on the same pool and can deadlock it.
+
+        Args:
+            calls: Mapping of name -> zero-argument callable (use lambdas/partials)
+            timeout: Default per-call timeout in seconds (None waits indefinitely)
+            timeouts: Optional per-call timeouts in seconds, overriding timeout
+            defaults: Optional per-call fallback values (default: None)
+
+        Returns:
+            Dictionary mapping each name to its call's result (or default)
+        """
+        timeouts = timeouts or {}
+        defaults = defaults or {}
+        executor = get_fanout_executor()
+
+        with self._trace_lock:
+            self._trace_groups += 1
+            group = self._trace_groups
+
+        timings: Dict[str, Dict[str, float]] = {name: {} for name in calls}
+
+        def timed(name: str, func: Callable[[], Any]) -> Callable[[], Any]:
+            def run():
+                timings[name]["start"] = time.perf_counter()
+                try:
+                    return func()
+                finally:
+                    timings[name]["end"] = time.perf_counter()
+            return run
+
+        submitted_at = time.perf_counter()
+        futures = {name: executor.submit(timed(name, func)) for name, func in calls.items()}
+
+        results = {}
+        for name, future in futures.items():
+            call_timeout = timeouts.get(name, timeout)
+            remaining = None
+            if call_timeout is not None:
+                remaining = max(0.0, submitted_at + call_timeout - time.perf_counter())
+
+            status = "ok"
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                status = "timeout"
+                print(f"Fan-out call '{name}' timed out after {call_timeout}s")
+                results[name] = defaults.get(name)
+            except Exception as e:
+                status = "error"
+                print(f"Fan-out call '{name}' failed: {e}")
+                results[name] = defaults.get(name)
+
+            start = timings[name].get("start", submitted_at)
+            end = timings[name].get("end", time.perf_counter())
+            self._record_span(name, start, end, status, group)
+
+        return results
+
+    @contextmanager
+    def trace_span(self, name: str) -> Iterator[None]:
+        """Record a sequential (non fanned-out) step of the request in the trace.
+
+        Args:
+            name: Name of the step
+        """
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            self._record_span(name, start, time.perf_counter(), status, None)
+
+    def _record_span(self, name: str, start: float, end: float, status: str, group: Optional[int]) -> None:
+        with self._trace_lock:
+            self._trace_spans.append({
+                "name": name,
+                "group": group,
+                "start_ms": round((start - self._trace_origin) * 1000, 3),
+                "duration_ms": round((end - start) * 1000, 3),
+                "status": status
+            })
+
+    def get_request_trace(self) -> Dict[str, Any]:
+        """Summarize the spans recorded for this request.
+
+        The critical path is every sequential span plus, for each fan_out
+        group, the slowest call, since that call decides when the group
+        completes.
+
+        Returns:
+            Dictionary containing:
+            - spans: all recorded spans in start order
+            - critical_path: names of the spans on the critical path
+            - critical_path_ms: summed duration of the critical path
+        """
+        with self._trace_lock:
+            spans = sorted(self._trace_spans, key=lambda span: span["start_ms"])
+
+        slowest: Dict[int, Dict[str, Any]] = {}
+        for span in spans:
+            if span["group"] is not None:
+                current = slowest.get(span["group"])
+                if current is None or span["duration_ms"] > current["duration_ms"]:
+                    slowest[span["group"]] = span
+
+        critical = [span for span in spans if span["group"] is None or slowest[span["group"]] is span]
+        return {
+            "spans": spans,
+            "critical_path": [span["name"] for span in critical],
+            "critical_path_ms": round(sum(span["duration_ms"] for span in critical), 3)
+        }
+
+    def get_server_timing_header(self) -> Optional[str]:
+        """Format the recorded spans as a Server-Timing header value (None if there are none)."""
+        trace = self.get_request_trace()
+        if not trace["spans"]:
+            return None
+
+        entries = []
+        for span in trace["spans"]:
+            prefix = f"g{span['group']}." if span["group"] is not None else ""
+            token = re.sub(r"[^A-Za-z0-9_.-]", "_", prefix + span["name"])
+            entries.append(f'{token};desc="{span["status"]}";dur={span["duration_ms"]}')
+        entries.append(f'critical-path;dur={trace["critical_path_ms"]}')
+        return ", ".join(entries)
@@ -3,12 +3,34 @@ from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
 from uuid import UUID
 from datetime import date
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..mongo import Page
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
 class ActivityMixin:
     """Mixin class that provides activity-related MongoDB operations."""
+
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "activity_entries": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING)], name="user_id_on_date"),
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING), ("_id", DESCENDING)], name="user_id_on_date_page"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "activity_entries", "filter": {"user_id": "", "on_date": ""},
+         "description": "activity entries of a user on a day"},
+    ]
+
+    # Sorts of the keyset-paginated listings (see MongoMixin.find_page)
+    PAGE_SORTS = {
+        "activity_entries": [("on_date", DESCENDING), ("_id", DESCENDING)],
+    }
     
     # No __init__ needed as it will use the parent class's __init__
     
@@ -21,7 +43,10 @@ class ActivityMixin:
         Returns:
             The inserted_id if successful, None otherwise
         """
-        return self.create_document("activity_entries", activity_entry)
+        inserted_id = self.create_document("activity_entries", activity_entry)
+        if inserted_id is not None:
+            self.apply_activity_to_rollup(activity_entry.to_dict())
+        return inserted_id
     
     def get_activity_entry_by_id(self, entry_id: UUID) -> Optional[Type.ActivityEntry]:
         """Retrieve an activity entry by its ID.
@@ -46,7 +71,15 @@ class ActivityMixin:
             True if update was successful, False otherwise
         """
         query = {"id": str(entry_id)}  # Convert UUID to string for MongoDB query
-        return self.update_document("activity_entries", query, entry_data)
+
+        # Swap the amount this write replaced for the new one in the daily rollups
+        images = self.find_and_update_document("activity_entries", query, entry_data)
+        if images is None or images[0] == images[1]:
+            return False
+        old_doc, new_doc = images
+        self.apply_activity_to_rollup(old_doc, sign=-1)
+        self.apply_activity_to_rollup(new_doc)
+        return True
     
     def delete_activity_entry(self, entry_id: UUID) -> bool:
         """Delete an activity entry by its ID.
@@ -58,11 +91,16 @@ class ActivityMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(entry_id)}  # Convert UUID to string for MongoDB query
-        return self.delete_document("activity_entries", query)
+        old_doc = self.find_and_delete_document("activity_entries", query)
+        if old_doc is None:
+            return False
+        self.apply_activity_to_rollup(old_doc, sign=-1)
+        return True
     
     def get_user_activity_entries(self, user_id: UUID, start_date: Optional[date] = None, 
                                end_date: Optional[date] = None, 
-                               skip: int = 0, limit: Optional[int] = None) -> List[Type.ActivityEntry]:
+                               skip: int = 0, limit: Optional[int] = None,
+                               after: Optional[str] = None) -> List[Type.ActivityEntry]:
         """Get activity entries for a user with optional date range and pagination.
         
         Args:
@@ -71,10 +109,13 @@ class ActivityMixin:
             end_date: Optional end date for filtering entries (inclusive)
             skip: Number of entries to skip for pagination (default: 0)
             limit: Maximum number of entries to return (default: None for all entries)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
             
         Returns:
             List of ActivityEntry instances
         """
+        keyset = self.decode_page_cursor(after, "activity_entries") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -96,16 +137,8 @@ class ActivityMixin:
                 if date_filter:
                     query["on_date"] = date_filter
             
-            # Find all matching entries
-            cursor = collection.find(query)
-            
-            # Sort by date (descending)
-            cursor = cursor.sort("on_date", -1)
-            
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Find matching entries by date (descending), one page at a time
+            cursor = self.find_page(collection, query, "activity_entries", skip=skip, limit=limit, after=keyset)
             
             entries = []
             for doc in cursor:
@@ -118,7 +151,7 @@ class ActivityMixin:
                     print(f"Error parsing activity entry: {e}")
                     continue
                     
-            return entries
+            return Page(entries, cursor.next_cursor)
             
         except Exception as e:
             print(f"Error getting user activity entries: {e}")
@@ -12,6 +12,8 @@ from typing import List, Dict, Optional, Any
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from prompture import extract_and_jsonify
 from prompture.drivers import get_driver
 
@@ -33,6 +35,23 @@ from ... import types as Type
 class AIAssistantMixin:
     """Mixin class that provides AI-powered meal planning functionality."""
 
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "ai_responses": [
+            IndexModel([("user_id", ASCENDING), ("profile_id", ASCENDING), ("is_active", ASCENDING),
+                        ("response_type", ASCENDING), ("created_at", DESCENDING)],
+                       name="user_id_profile_id_is_active_response_type_created_at"),
+            IndexModel([("user_id", ASCENDING), ("is_active", ASCENDING), ("created_at", DESCENDING)],
+                       name="user_id_is_active_created_at"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "ai_responses",
+         "filter": {"user_id": "", "profile_id": "", "is_active": True, "response_type": "meal_recommendations"},
+         "sort": [("created_at", -1)], "description": "latest AI response of a profile"},
+    ]
+
     def __init__(self, **kwargs):
         # Initialize AI configuration
         self.ai_provider = os.getenv('AI_PROVIDER', 'openai').lower()
@@ -0,0 +1,387 @@
+from typing import Optional, Any, Dict, List
+from uuid import UUID
+from datetime import date, datetime, timezone
+
+from pymongo import IndexModel, ReplaceOne, DeleteOne, ASCENDING, DESCENDING
+
+from ... import types as Type
+
+# Nutrient totals summed from a meal's food items into its daily rollup
+ROLLUP_NUTRIENT_FIELDS = ("calories", "protein_g", "carbs_g", "fat_g", "fiber_g", "sugar_g", "sodium_mg")
+
+
+def meal_nutrient_totals(meal_doc: Dict[str, Any], sign: int = 1) -> Dict[str, float]:
+    """Sum the ROLLUP_NUTRIENT_FIELDS of a stored meal's food items (negated when sign=-1)."""
+    totals = {field: 0 for field in ROLLUP_NUTRIENT_FIELDS}
+    for item in meal_doc.get("food_items") or []:
+        for field in ROLLUP_NUTRIENT_FIELDS:
+            totals[field] += sign * (item.get(field) or 0)
+    return totals
+
+
+class DailyRollupMixin:
+    """Mixin class that maintains the materialized per-user daily_rollups collection.
+
+    One document per (user_id, on_date) holds the day's consumed calories and
+    macros, water intake, burned calories, meal count and latest weight. The
+    meal, water, activity and weight mixins keep it current with atomic $inc
+    updates on every write; rebuild_daily_rollups() recomputes it from the raw
+    entries to repair drift.
+    """
+
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "daily_rollups": [
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING)], name="user_id_on_date"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "daily_rollups", "filter": {"user_id": "", "on_date": ""},
+         "description": "daily rollup of a user"},
+        {"collection": "daily_rollups", "filter": {"user_id": "", "on_date": {"$gte": "", "$lte": ""}},
+         "sort": [("on_date", 1)], "description": "daily rollups of a user in a date range"},
+    ]
+
+    # No __init__ needed as it will use the parent class's __init__
+
+    def _rollup_date(self, doc: Dict[str, Any]) -> Optional[str]:
+        """Return the ISO on_date of a raw entry document (falls back to its timestamp)."""
+        value = doc.get("on_date") or doc.get("timestamp")
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, str) and len(value) >= 10:
+            return value[:10]
+        return None
+
+    def _increment_daily_rollup(self, user_id: Any, on_date: Optional[str], increments: Dict[str, Any]) -> bool:
+        """Atomically apply increments to a user's rollup for a day, creating it if needed.
+
+        Args:
+            user_id: User ID (UUID or string)
+            on_date: ISO date string of the day
+            increments: Field -> amount to $inc
+
+        Returns:
+            True if the update was acknowledged, False otherwise
+        """
+        if user_id is None or on_date is None:
+            return False
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return False
+
+            db["daily_rollups"].update_one(
+                {"user_id": str(user_id), "on_date": on_date},
+                {
+                    "$inc": increments,
+                    "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+                },
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            print(f"Error updating daily rollup: {e}")
+            return False
+        finally:
+            # The day's dashboard is rendered from this rollup
+            self.invalidate_dashboard(user_id, on_date)
+
+    def apply_meal_to_rollup(self, meal_doc: Optional[Dict[str, Any]], sign: int = 1) -> bool:
+        """Add (sign=1) or remove (sign=-1) a stored meal's totals from its daily rollup.
+
+        Args:
+            meal_doc: Raw meal document as stored in the meals collection
+            sign: 1 when the meal was created, -1 when it was deleted
+
+        Returns:
+            True if the rollup was updated, False otherwise
+        """
+        if not meal_doc:
+            return False
+
+        increments = meal_nutrient_totals(meal_doc, sign)
+        increments["meal_count"] = sign
+
+        return self._increment_daily_rollup(meal_doc.get("user_id"), self._rollup_date(meal_doc), increments)
+
+    def apply_meals_to_rollups(self, meal_docs: List[Dict[str, Any]], sign: int = 1) -> int:
+        """Add (sign=1) or remove (sign=-1) many stored meals, with one rollup update per user and day.
+
+        Args:
+            meal_docs: Raw meal documents as stored in the meals collection
+            sign: 1 when the meals were created, -1 when they were deleted
+
+        Returns:
+            Number of daily rollups updated
+        """
+        days: Dict[tuple, Dict[str, Any]] = {}
+        for meal_doc in meal_docs:
+            if not meal_doc or meal_doc.get("user_id") is None:
+                continue
+            increments = days.setdefault((str(meal_doc["user_id"]), self._rollup_date(meal_doc)),
+                                         {"meal_count": 0, **{field: 0 for field in ROLLUP_NUTRIENT_FIELDS}})
+            for field, value in meal_nutrient_totals(meal_doc, sign).items():
+                increments[field] += value
+            increments["meal_count"] += sign
+
+        return sum(1 for (user_id, on_date), increments in days.items()
+                   if self._increment_daily_rollup(user_id, on_date, increments))
+
+    def apply_water_to_rollup(self, entry_doc: Optional[Dict[str, Any]], sign: int = 1) -> bool:
+        """Add (sign=1) or remove (sign=-1) a stored water entry from its daily rollup.
+
+        Args:
+            entry_doc: Raw water entry document as stored in the water_entries collection
+            sign: 1 when the entry was created, -1 when it was deleted
+
+        Returns:
+            True if the rollup was updated, False otherwise
+        """
+        if not entry_doc:
+            return False
+        try:
+            amount_ml = Type.WaterEntry.from_dict(entry_doc).amount_ml
+        except Exception as e:
+            print(f"Error parsing water entry for rollup: {e}")
+            return False
+
+        return self._increment_daily_rollup(entry_doc.get("user_id"), self._rollup_date(entry_doc),
+                                            {"water_ml": sign * amount_ml})
+
+    def apply_activity_to_rollup(self, entry_doc: Optional[Dict[str, Any]], sign: int = 1) -> bool:
+        """Add (sign=1) or remove (sign=-1) a stored activity entry from its daily rollup.
+
+        Args:
+            entry_doc: Raw activity entry document as stored in the activity_entries collection
+            sign: 1 when the entry was created, -1 when it was deleted
+
+        Returns:
+            True if the rollup was updated, False otherwise
+        """
+        if not entry_doc:
+            return False
+
+        return self._increment_daily_rollup(entry_doc.get("user_id"), self._rollup_date(entry_doc),
+                                            {"burned_calories": sign * (entry_doc.get("calories_burned") or 0)})
+
+    def refresh_rollup_weight(self, user_id: Any, on_date: Optional[str]) -> bool:
+        """Recompute latest_weight_kg of a user's rollup from that day's weight entries.
+
+        Weight is a level rather than a running total, so it is re-read from the
+        (indexed) weight entries of the day instead of being incremented.
+
+        Args:
+            user_id: User ID (UUID or string)
+            on_date: ISO date string of the day
+
+        Returns:
+            True if the rollup was updated, False otherwise
+        """
+        if user_id is None or on_date is None:
+            return False
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return False
+
+            latest = db["weight_entries"].find_one(
+                {"user_id": str(user_id), "on_date": on_date},
+                {"_id": 0},
+                sort=[("created_at", -1)]
+            )
+            latest_weight_kg = self._weight_to_kg(latest["weight"], latest.get("unit")) if latest else None
+
+            db["daily_rollups"].update_one(
+                {"user_id": str(user_id), "on_date": on_date},
+                {"$set": {
+                    "latest_weight_kg": latest_weight_kg,
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                }},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            print(f"Error refreshing rollup weight: {e}")
+            return False
+        finally:
+            # The latest weight is shown on every day's dashboard
+            self.invalidate_dashboard(user_id)
+
+    def get_daily_rollup(self, user_id: UUID, on_date: date) -> Optional[Type.DailyRollup]:
+        """Get a user's rollup for a single day.
+
+        Args:
+            user_id: UUID of the user
+            on_date: Date of the rollup
+
+        Returns:
+            DailyRollup instance if the user has any entries that day, None otherwise
+        """
+        query = {"user_id": str(user_id), "on_date": on_date.isoformat()}
+        return self.get_document("daily_rollups", query, Type.DailyRollup)
+
+    def get_daily_rollups(self, user_id: UUID, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """Get a user's stored rollups in a date range (inclusive), in chronological order.
+
+        Args:
+            user_id: UUID of the user
+            start_date: First day of the range
+            end_date: Last day of the range
+
+        Returns:
+            List of raw rollup dictionaries (days without entries are absent)
+        """
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return []
+
+            cursor = db["daily_rollups"].find(
+                {
+                    "user_id": str(user_id),
+                    "on_date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
+                },
+                {"_id": 0}
+            ).sort("on_date", 1)
+            return list(cursor)
+        except Exception as e:
+            print(f"Error getting daily rollups: {e}")
+            return []
+
+    def get_daily_rollup_series(self, user_id: UUID, days: int = 7,
+                                start_date: Optional[date] = None,
+                                end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Get a chronological, gap-filled series of daily rollups for a user.
+
+        Args:
+            user_id: UUID of the user
+            days: Number of days in the window (default: 7), ending at end_date
+            start_date: Optional explicit first day of the window (overrides days)
+            end_date: Optional last day of the window (default: today)
+
+        Returns:
+            One dictionary per day with a "date" key (ISO string) and the rollup
+            totals; days without entries have zero totals and no latest_weight_kg
+        """
+        start_date, end_date = self._date_window(days, start_date, end_date)
+
+        rows = []
+        for rollup in self.get_daily_rollups(user_id, start_date, end_date):
+            rollup["date"] = rollup.pop("on_date")
+            rows.append(rollup)
+
+        def empty_row() -> Dict[str, Any]:
+            row = {field: 0 for field in ROLLUP_NUTRIENT_FIELDS}
+            row.update({"water_ml": 0, "burned_calories": 0, "meal_count": 0, "latest_weight_kg": None})
+            return row
+
+        return self._fill_daily_series(rows, start_date, end_date, empty_row)
+
+    def rebuild_daily_rollups(self, user_id: Optional[UUID] = None) -> int:
+        """Recompute daily rollups from the raw meal, water, activity and weight entries.
+
+        Every rollup is replaced in place (upserted), then the rollups of days
+        that no longer have entries are deleted, so the rollups stay readable
+        during the rebuild.
+
+        Args:
+            user_id: Optional UUID to restrict the rebuild to a single user
+
+        Returns:
+            Number of rollup documents written
+        """
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return 0
+
+            now = datetime.now(timezone.utc).isoformat()
+            match = {"user_id": str(user_id)} if user_id else {}
+            rollups: Dict[tuple, Dict[str, Any]] = {}
+
+            def rollup_for(row_id: Dict[str, Any]) -> Dict[str, Any]:
+                key = (row_id["user_id"], row_id["on_date"])
+                if key not in rollups:
+                    rollup = {"user_id": key[0], "on_date": key[1]}
+                    rollup.update({field: 0 for field in ROLLUP_NUTRIENT_FIELDS})
+                    rollup.update({"water_ml": 0, "burned_calories": 0, "meal_count": 0, "latest_weight_kg": None})
+                    rollups[key] = rollup
+                return rollups[key]
+
+            # Meals: sum every nutrient of every food item per day
+            meal_group = {"_id": {"user_id": "$user_id", "on_date": "$on_date"}}
+            meal_group.update({field: {"$sum": {"$ifNull": [f"$food_items.{field}", 0]}}
+                               for field in ROLLUP_NUTRIENT_FIELDS})
+            meal_group["meal_count"] = {"$addToSet": "$_id"}
+            meal_pipeline = [
+                {"$match": {**match, "on_date": {"$exists": True}}},
+                # Keep meals without food items so meal_count matches apply_meal_to_rollup
+                {"$unwind": {"path": "$food_items", "preserveNullAndEmptyArrays": True}},
+                {"$group": meal_group}
+            ]
+            for row in db["meals"].aggregate(meal_pipeline):
+                rollup = rollup_for(row["_id"])
+                for field in ROLLUP_NUTRIENT_FIELDS:
+                    rollup[field] = row[field]
+                rollup["meal_count"] = len(row["meal_count"])
+
+            # Water: convert every entry to milliliters server-side
+            water_pipeline = [
+                {"$match": match},
+                {"$group": {
+                    "_id": {"user_id": "$user_id", "on_date": "$on_date"},
+                    "water_ml": {"$sum": self._water_ml_expression()}
+                }}
+            ]
+            for row in db["water_entries"].aggregate(water_pipeline):
+                rollup_for(row["_id"])["water_ml"] = row["water_ml"]
+
+            # Activities: total calories burned per day
+            activity_pipeline = [
+                {"$match": match},
+                {"$group": {
+                    "_id": {"user_id": "$user_id", "on_date": "$on_date"},
+                    "burned_calories": {"$sum": "$calories_burned"}
+                }}
+            ]
+            for row in db["activity_entries"].aggregate(activity_pipeline):
+                rollup_for(row["_id"])["burned_calories"] = row["burned_calories"]
+
+            # Weight: last entry recorded each day
+            weight_pipeline = [
+                {"$match": match},
+                {"$sort": {"created_at": 1}},
+                {"$group": {
+                    "_id": {"user_id": "$user_id", "on_date": "$on_date"},
+                    "weight": {"$last": "$weight"},
+                    "unit": {"$last": "$unit"}
+                }}
+            ]
+            for row in db["weight_entries"].aggregate(weight_pipeline):
+                rollup_for(row["_id"])["latest_weight_kg"] = self._weight_to_kg(row["weight"], row["unit"])
+
+            documents = []
+            for rollup in rollups.values():
+                rollup["updated_at"] = now
+                documents.append(rollup)
+
+            # Replace the rollups in place, so readers never see a user without them
+            self.bulk_write("daily_rollups", [
+                ReplaceOne({"user_id": rollup["user_id"], "on_date": rollup["on_date"]}, rollup, upsert=True)
+                for rollup in documents
+            ])
+
+            # Then drop the days left without entries (but not rollups upserted since the rebuild started)
+            stale = [DeleteOne({"_id": doc["_id"]})
+                     for doc in db["daily_rollups"].find({**match, "updated_at": {"$lt": now}},
+                                                         {"user_id": 1, "on_date": 1})
+                     if (doc.get("user_id"), doc.get("on_date")) not in rollups]
+            self.bulk_write("daily_rollups", stale)
+            return len(documents)
+        except Exception as e:
+            print(f"Error rebuilding daily rollups: {e}")
+            return 0
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List
+from uuid import UUID
+from datetime import date
+
+from pymongo.errors import OperationFailure
+
+from ... import types as Type
+
+# Set once the server rejects $unionWith (MongoDB < 4.4), so later snapshots skip straight to the fallback
+_union_with_unsupported = False
+
+
+class DashboardMixin:
+    """Mixin class that loads everything the dashboard needs in a single database round trip."""
+
+    # No __init__ needed as it will use the parent class's __init__
+
+    def get_dashboard_snapshot(self, user_id: UUID, snapshot_date: date) -> Dict[str, Any]:
+        """Fetch the user, daily rollup, latest weight and the day's meals in one pass.
+
+        The four sources are combined server-side with $unionWith into a single
+        aggregation, so the dashboard costs one round trip and every meal
+        document of the day is read exactly once. Servers without $unionWith
+        fall back to one indexed query per source, run concurrently.
+
+        Args:
+            user_id: UUID of the user
+            snapshot_date: Date of the dashboard
+
+        Returns:
+            Dictionary containing:
+            - user: User instance or None
+            - rollup: DailyRollup instance or None
+            - latest_weight: most recent WeightEntry instance or None
+            - meals: List of Meal instances for the date, in chronological order
+        """
+        global _union_with_unsupported
+
+        snapshot = {"user": None, "rollup": None, "latest_weight": None, "meals": []}
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return snapshot
+
+            if _union_with_unsupported:
+                return self._get_dashboard_snapshot_concurrent(user_id, snapshot_date)
+
+            user_key = str(user_id)  # Convert UUID to string for MongoDB query
+            day_key = snapshot_date.isoformat()
+
+            def tagged(source: str) -> List[Dict[str, Any]]:
+                return [{"$project": {"_id": 0}}, {"$addFields": {"_source": source}}]
+
+            pipeline = [
+                {"$match": {"user_id": user_key}},
+                *tagged("user"),
+                {"$unionWith": {"coll": "daily_rollups", "pipeline": [
+                    {"$match": {"user_id": user_key, "on_date": day_key}},
+                    *tagged("rollup")
+                ]}},
+                {"$unionWith": {"coll": "weight_entries", "pipeline": [
+                    {"$match": {"user_id": user_key}},
+                    {"$sort": {"on_date": -1, "created_at": -1, "_id": -1}},
+                    {"$limit": 1},
+                    *tagged("latest_weight")
+                ]}},
+                {"$unionWith": {"coll": "meals", "pipeline": [
+                    {"$match": {"user_id": user_key, "on_date": day_key}},
+                    {"$sort": {"timestamp": 1}},
+                    *tagged("meals")
+                ]}}
+            ]
+
+            try:
+                with self.trace_span("dashboard_snapshot"):
+                    docs = list(db["users"].aggregate(pipeline))
+            except Exception as e:
+                print(f"Dashboard aggregation failed, loading sources separately: {e}")
+                # Only a rejected stage means $unionWith is unsupported (40324: unrecognized
+                # pipeline stage name, MongoDB < 4.4); a transient failure must not latch it
+                if isinstance(e, NotImplementedError) or (isinstance(e, OperationFailure) and e.code == 40324):
+                    _union_with_unsupported = True
+                return self._get_dashboard_snapshot_concurrent(user_id, snapshot_date)
+
+            models = {
+                "user": Type.User,
+                "rollup": Type.DailyRollup,
+                "latest_weight": Type.WeightEntry,
+                "meals": Type.Meal
+            }
+            for doc in docs:
+                source = doc.pop("_source")
+                try:
+                    item = models[source].from_dict(doc)
+                except Exception as e:
+                    print(f"Error parsing dashboard {source}: {e}")
+                    continue
+                if source == "meals":
+                    snapshot["meals"].append(item)
+                else:
+                    snapshot[source] = item
+
+            return snapshot
+
+        except Exception as e:
+            print(f"Error getting dashboard snapshot: {e}")
+            return snapshot
+
+    def _get_dashboard_snapshot_concurrent(self, user_id: UUID, snapshot_date: date) -> Dict[str, Any]:
+        """Build the dashboard snapshot with one indexed query per source, fanned out in parallel."""
+        return self.fan_out({
+            "user": lambda: self.get_user_by_id(user_id),
+            "rollup": lambda: self.get_daily_rollup(user_id, snapshot_date),
+            "latest_weight": lambda: self.get_latest_weight_entry(user_id),
+            "meals": lambda: self.get_user_daily_meals(user_id, snapshot_date)
+        }, defaults={"meals": []})
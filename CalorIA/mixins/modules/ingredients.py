@@ -2,12 +2,41 @@ import re
 from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
 from uuid import UUID
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..mongo import Page, check_count_mode, encode_cursor_values, decode_cursor_values
+from ..search_index import IngredientSearchIndex, get_ingredient_search_index
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
 class IngredientMixin:
     """Mixin class that provides ingredient-related MongoDB operations."""
+
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "ingredients": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("slug", ASCENDING)], name="slug"),
+            IndexModel([("name", ASCENDING)], name="name"),
+            IndexModel([("category", ASCENDING)], name="category"),
+            IndexModel([("category", ASCENDING), ("_id", ASCENDING)], name="category_page"),
+            IndexModel([("name", ASCENDING), ("_id", ASCENDING)], name="name_page"),
+            IndexModel([("is_system", ASCENDING)], name="is_system"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "ingredients", "filter": {}, "sort": [("category", 1), ("_id", 1)],
+         "description": "ingredient listing sorted by category"},
+        {"collection": "ingredients", "filter": {"id": ""}, "description": "ingredient by id"},
+    ]
+
+    # Sorts of the keyset-paginated listings (see MongoMixin.find_page)
+    PAGE_SORTS = {
+        "ingredients": [("category", ASCENDING), ("_id", ASCENDING)],
+        "ingredient_search": [("name", ASCENDING), ("_id", ASCENDING)],
+    }
     
     # No __init__ needed as it will use the parent class's __init__
     
@@ -20,8 +49,31 @@ class IngredientMixin:
         Returns:
             The inserted_id if successful, None otherwise
         """
-        return self.create_document("ingredients", ingredient)
+        inserted_id = self.create_document("ingredients", ingredient)
+        if inserted_id is not None:
+            index = get_ingredient_search_index()
+            if index is not None and index.ready:
+                index.add({**ingredient.to_dict(), "_id": inserted_id})
+        return inserted_id
     
+    def create_ingredients(self, ingredients: List[Type.Ingredient], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Create many ingredients with unordered bulk inserts (see MongoMixin.create_documents).
+
+        Args:
+            ingredients: Ingredient model instances
+            batch_size: Ingredients per bulk write (default: CALORIA_BULK_BATCH_SIZE)
+
+        Returns:
+            create_documents' result: counts, per-ingredient "inserted_ids" and "errors"
+        """
+        result = self.create_documents("ingredients", ingredients, batch_size)
+        index = get_ingredient_search_index()
+        if index is not None and index.ready:
+            for ingredient, inserted_id in zip(ingredients, result["inserted_ids"]):
+                if inserted_id is not None:
+                    index.add({**ingredient.to_dict(), "_id": inserted_id})
+        return result
+
     def get_ingredient_by_id(self, ingredient_id: UUID) -> Optional[Type.Ingredient]:
         """Retrieve an ingredient by its ID.
         
@@ -34,16 +86,19 @@ class IngredientMixin:
         query = {"id": str(ingredient_id)}  # Convert UUID to string for MongoDB query
         return self.get_document("ingredients", query, Type.Ingredient)
     
-    def get_all_ingredients(self, skip: int = 0, limit: Optional[int] = None) -> List[Type.Ingredient]:
+    def get_all_ingredients(self, skip: int = 0, limit: Optional[int] = None, after: Optional[str] = None) -> List[Type.Ingredient]:
         """Get all ingredients with optional pagination.
         
         Args:
             skip: Number of ingredients to skip for pagination (default: 0)
             limit: Maximum number of ingredients to return (default: None for all ingredients)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
             
         Returns:
             List of Ingredient instances
         """
+        keyset = self.decode_page_cursor(after, "ingredients") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -51,16 +106,8 @@ class IngredientMixin:
                 
             collection = db["ingredients"]
             
-            # Get all ingredients with optional pagination
-            cursor = collection.find()
-            
-            # Sort ingredients by category first
-            cursor = cursor.sort("category", 1)
-            
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Get ingredients sorted by category, one page at a time
+            cursor = self.find_page(collection, {}, "ingredients", skip=skip, limit=limit, after=keyset)
             
             ingredients = []
             for doc in cursor:
@@ -73,7 +120,7 @@ class IngredientMixin:
                     print(f"Error parsing ingredient: {e}")
                     continue
                     
-            return ingredients
+            return Page(ingredients, cursor.next_cursor)
         except Exception as e:
             print(f"Error getting all ingredients: {e}")
             return []
@@ -89,7 +136,10 @@ class IngredientMixin:
             True if update was successful, False otherwise
         """
         query = {"id": str(ingredient_id)}  # Convert UUID to string for MongoDB query
-        return self.update_document("ingredients", query, ingredient_data)
+        updated = self.update_document("ingredients", query, ingredient_data)
+        if updated:
+            self._reindex_ingredient(query)
+        return updated
     
     def delete_ingredient(self, ingredient_id: UUID) -> bool:
         """Delete an ingredient by its ID.
@@ -101,7 +151,12 @@ class IngredientMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(ingredient_id)}  # Convert UUID to string for MongoDB query
-        return self.delete_document("ingredients", query)
+        deleted = self.delete_document("ingredients", query)
+        if deleted:
+            index = get_ingredient_search_index()
+            if index is not None:
+                index.remove(ingredient_id)
+        return deleted
     
     def get_ingredient_by_name(self, name: str) -> Optional[Type.Ingredient]:
         """Get an ingredient by its name (case-insensitive).
@@ -117,7 +172,92 @@ class IngredientMixin:
         query = {"name": {"$regex": f"^{escaped_name}$", "$options": "i"}}  # Case-insensitive exact match
         return self.get_document("ingredients", query, Type.Ingredient)
     
-    def search_ingredients(self, search_term: str, skip: int = 0, limit: Optional[int] = 20, is_system: Optional[bool] = None) -> List[Type.Ingredient]:
+    # In-memory search index (see CalorIA.mixins.search_index)
+    def build_ingredient_search_index(self) -> Optional[int]:
+        """(Re)build the process-wide ingredient search index from the database.
+
+        Returns:
+            Number of indexed ingredients, or None if the index is disabled or could not be built
+        """
+        index = get_ingredient_search_index()
+        if index is None:
+            return None
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return None
+            return index.load(db["ingredients"].find({}))
+        except Exception as e:
+            print(f"Error building ingredient search index: {e}")
+            return None
+
+    def get_ready_ingredient_search_index(self) -> Optional[IngredientSearchIndex]:
+        """Get the ingredient search index, starting a background (re)build if it is stale.
+
+        Returns:
+            The built index, or None if it is disabled or not built yet
+        """
+        index = get_ingredient_search_index()
+        if index is None or not index.refresh(self.build_ingredient_search_index):
+            return None
+        return index
+
+    def _reindex_ingredient(self, query: Dict[str, Any]) -> None:
+        """Refresh one ingredient in the search index after it was updated."""
+        index = get_ingredient_search_index()
+        if index is None or not index.ready:
+            return
+        try:
+            db = self.get_db_connection()
+            doc = db["ingredients"].find_one(query) if db is not None else None
+            if doc is not None:
+                index.add(doc)
+        except Exception as e:
+            print(f"Error re-indexing ingredient: {e}")
+
+    def _search_ingredient_index(self, index: IngredientSearchIndex, search_term: str, skip: int, limit: Optional[int],
+                                 is_system: Optional[bool], after: Optional[str]) -> Dict[str, Any]:
+        """Search the in-memory index; returns the same shape as search_ingredients_with_total."""
+        items, total, next_after = index.search(search_term, skip=skip, limit=limit, is_system=is_system,
+                                                after=decode_cursor_values(after) if after else None)
+        next_cursor = encode_cursor_values(next_after) if next_after is not None else None
+        return {"items": Page(items, next_cursor), "total": total, "total_exact": True}
+
+    def _ingredient_search_query(self, search_term: Optional[str] = None, is_system: Optional[bool] = None) -> Dict[str, Any]:
+        """Build the ingredient filter shared by searching and counting.
+
+        Args:
+            search_term: Term to search for in ingredient names and aliases
+            is_system: If provided, filter by system status
+
+        Returns:
+            MongoDB filter ({} when neither argument is given)
+        """
+        if not search_term:
+            return {} if is_system is None else {"is_system": is_system}
+
+        # Case-insensitive substring search; the term is text, not a pattern
+        search_pattern = {"$regex": re.escape(search_term), "$options": "i"}
+
+        # Build base query for search in name and aliases fields
+        search_query = {
+            "$or": [
+                {"name": search_pattern},
+                {"aliases": {"$elemMatch": search_pattern}}
+            ]
+        }
+
+        # Add is_system filter if provided
+        if is_system is not None:
+            return {
+                "$and": [
+                    search_query,
+                    {"is_system": is_system}
+                ]
+            }
+        return search_query
+
+    def search_ingredients(self, search_term: str, skip: int = 0, limit: Optional[int] = 20, is_system: Optional[bool] = None, after: Optional[str] = None) -> List[Type.Ingredient]:
         """Search ingredients by name or aliases with optional system filter and pagination.
         
         Args:
@@ -125,45 +265,28 @@ class IngredientMixin:
             skip: Number of ingredients to skip for pagination (default: 0)
             limit: Maximum number of ingredients to return (default: 20, None for no limit)
             is_system: If provided, filter by system status (True for system ingredients, False for user ingredients)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
             
         Returns:
-            List of matching Ingredient instances
+            List of matching Ingredient instances, best matches first when the
+            in-memory search index is enabled, otherwise sorted by name
         """
+        index = self.get_ready_ingredient_search_index()
+        if index is not None:
+            return self._search_ingredient_index(index, search_term, skip, limit, is_system, after)["items"]
+
+        keyset = self.decode_page_cursor(after, "ingredient_search") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
                 return []
                 
             collection = db["ingredients"]
+            query = self._ingredient_search_query(search_term, is_system)
             
-            # Create regex pattern for case-insensitive search
-            search_pattern = {"$regex": search_term, "$options": "i"}
-            
-            # Build base query for search in name and aliases fields
-            search_query = {
-                "$or": [
-                    {"name": search_pattern},
-                    {"aliases": {"$elemMatch": search_pattern}}
-                ]
-            }
-            
-            # Add is_system filter if provided
-            if is_system is not None:
-                query = {
-                    "$and": [
-                        search_query,
-                        {"is_system": is_system}
-                    ]
-                }
-            else:
-                query = search_query
-            
-            cursor = collection.find(query)
-            
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Matches sorted by name, one page at a time
+            cursor = self.find_page(collection, query, "ingredient_search", skip=skip, limit=limit, after=keyset)
             
             ingredients = []
             for doc in cursor:
@@ -176,10 +299,68 @@ class IngredientMixin:
                     print(f"Error parsing ingredient: {e}")
                     continue
                     
-            return ingredients
+            return Page(ingredients, cursor.next_cursor)
         except Exception as e:
             print(f"Error searching ingredients with term '{search_term}': {e}")
             return []
+
+    def search_ingredients_with_total(self, search_term: Optional[str] = None, skip: int = 0, limit: Optional[int] = 20,
+                                      is_system: Optional[bool] = None, after: Optional[str] = None,
+                                      count: str = "exact") -> Dict[str, Any]:
+        """Get a page of ingredients and the total number of matches in one query.
+
+        Replaces search_ingredients/get_all_ingredients followed by
+        count_ingredients, which evaluated the regex filter twice. Without a
+        search term the page is in listing order (by category); searches use
+        the in-memory search index when it is enabled (ranked, exact total),
+        otherwise MongoDB sorted by name.
+
+        Args:
+            search_term: Term to search for in ingredient names and aliases (None lists all ingredients)
+            skip: Number of ingredients to skip for pagination (default: 0)
+            limit: Maximum number of ingredients to return (default: 20, None for no limit)
+            is_system: If provided, filter by system status (True for system ingredients, False for user ingredients)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
+            count: How to count the matches: "exact", "estimated" or "capped" (see MongoMixin.find_page_with_total)
+
+        Returns:
+            Dictionary with "items" (Page of Ingredient instances), "total" and
+            "total_exact" (False when the total was estimated or capped)
+        """
+        check_count_mode(count)
+        index = self.get_ready_ingredient_search_index() if search_term else None
+        if index is not None:
+            return self._search_ingredient_index(index, search_term, skip, limit, is_system, after)
+
+        listing = "ingredient_search" if search_term else "ingredients"
+        keyset = self.decode_page_cursor(after, listing) if after else None
+
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return {"items": Page(), "total": 0, "total_exact": True}
+
+            collection = db["ingredients"]
+            query = self._ingredient_search_query(search_term, is_system)
+
+            cursor, total, exact = self.find_page_with_total(collection, query, listing, skip=skip, limit=limit,
+                                                             after=keyset, count=count)
+
+            ingredients = []
+            for doc in cursor:
+                if '_id' in doc:
+                    del doc['_id']
+                try:
+                    ingredient = Type.Ingredient.from_dict(doc)
+                    ingredients.append(ingredient)
+                except Exception as e:
+                    print(f"Error parsing ingredient: {e}")
+                    continue
+
+            return {"items": Page(ingredients, cursor.next_cursor), "total": total, "total_exact": exact}
+        except Exception as e:
+            print(f"Error searching ingredients with total for term '{search_term}': {e}")
+            return {"items": Page(), "total": 0, "total_exact": True}
             
     def count_ingredients(self, search_term: Optional[str] = None, is_system: Optional[bool] = None) -> int:
         """Count ingredients with optional search term and system filter.
@@ -197,40 +378,8 @@ class IngredientMixin:
                 return 0
                 
             collection = db["ingredients"]
-            
-            # If there's no search term and no is_system filter, just count all documents
-            if not search_term and is_system is None:
-                return collection.count_documents({})
-            
-            # Build query based on parameters
-            if search_term:
-                # Create regex pattern for case-insensitive search
-                search_pattern = {"$regex": search_term, "$options": "i"}
-                
-                # Build base query for search in name and aliases fields
-                search_query = {
-                    "$or": [
-                        {"name": search_pattern},
-                        {"aliases": {"$elemMatch": search_pattern}}
-                    ]
-                }
-                
-                # Add is_system filter if provided
-                if is_system is not None:
-                    query = {
-                        "$and": [
-                            search_query,
-                            {"is_system": is_system}
-                        ]
-                    }
-                else:
-                    query = search_query
-            else:
-                # Only is_system filter is applied
-                query = {"is_system": is_system}
-            
-            return collection.count_documents(query)
+            return collection.count_documents(self._ingredient_search_query(search_term, is_system))
             
         except Exception as e:
             print(f"Error counting ingredients: {e}")
-            return 0
\ No newline at end of file
+            return 0
@@ -3,12 +3,36 @@ from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime, timezone
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..mongo import Page, check_count_mode
 
 
 class InventoryMixin:
     """Mixin class that provides inventory-related MongoDB operations."""
 
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "inventory": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("ingredient_id", ASCENDING)], name="ingredient_id"),
+            IndexModel([("location", ASCENDING), ("ingredient.name", ASCENDING)], name="location_ingredient_name"),
+            IndexModel([("location", ASCENDING), ("ingredient.name", ASCENDING), ("_id", ASCENDING)],
+                       name="location_ingredient_name_page"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "inventory", "filter": {}, "sort": [("location", 1), ("ingredient.name", 1), ("_id", 1)],
+         "description": "inventory listing sorted by location"},
+    ]
+
+    # Sorts of the keyset-paginated listings (see MongoMixin.find_page)
+    PAGE_SORTS = {
+        "inventory": [("location", ASCENDING), ("ingredient.name", ASCENDING), ("_id", ASCENDING)],
+    }
+
     def create_inventory_item(self, item: Type.InventoryItem) -> Optional[Any]:
         """Create a new inventory item in the inventory collection.
         
@@ -32,31 +56,27 @@ class InventoryMixin:
         query = {"id": str(item_id)}
         return self.get_document("inventory", query, Type.InventoryItem)
 
-    def get_all_inventory_items(self, skip: int = 0, limit: Optional[int] = None) -> List[Type.InventoryItem]:
+    def get_all_inventory_items(self, skip: int = 0, limit: Optional[int] = None, after: Optional[str] = None) -> List[Type.InventoryItem]:
         """Get all inventory items with optional pagination.
         
         Args:
             skip: Number of items to skip for pagination (default: 0)
             limit: Maximum number of items to return (default: None for all items)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
             
         Returns:
             List of InventoryItem instances
         """
+        keyset = self.decode_page_cursor(after, "inventory") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
                 return []
 
             collection = db["inventory"]
-            cursor = collection.find()
-
-            # Sort by location first, then ingredient name
-            cursor = cursor.sort([("location", 1), ("ingredient.name", 1)])
-
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Sort by location first, then ingredient name, one page at a time
+            cursor = self.find_page(collection, {}, "inventory", skip=skip, limit=limit, after=keyset)
 
             items = []
             for doc in cursor:
@@ -69,7 +89,7 @@ class InventoryMixin:
                     print(f"Error parsing inventory item: {e}")
                     continue
 
-            return items
+            return Page(items, cursor.next_cursor)
         except Exception as e:
             print(f"Error getting all inventory items: {e}")
             return []
@@ -104,59 +124,50 @@ class InventoryMixin:
         query = {"id": str(item_id)}
         return self.delete_document("inventory", query)
 
-    def search_inventory_items(
-        self, 
-        search_term: str, 
+    def _inventory_search_query(
+        self,
+        search_term: Optional[str] = None,
         location: Optional[str] = None,
-        needs_restock: Optional[bool] = None,
-        skip: int = 0, 
-        limit: Optional[int] = 20
-    ) -> List[Type.InventoryItem]:
-        """Search inventory items by ingredient name with optional filters and pagination.
-        
+        needs_restock: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Build the inventory filter shared by searching and counting.
+
         Args:
-            search_term: Term to search for in ingredient names
+            search_term: Term to search for in ingredient names and locations
             location: Optional filter by storage location
             needs_restock: Optional filter for items needing restock
-            skip: Number of items to skip for pagination (default: 0)
-            limit: Maximum number of items to return (default: 20, None for no limit)
-            
+
         Returns:
-            List of matching InventoryItem instances
+            MongoDB filter ({} when no argument is given)
         """
-        try:
-            db = self.get_db_connection()
-            if db is None:
-                return []
-
-            collection = db["inventory"]
+        conditions = []
 
+        if search_term:
             # Create regex pattern for case-insensitive search
             search_pattern = {"$regex": search_term, "$options": "i"}
-
-            # Build base query for search in ingredient name
-            query = {
+            conditions.append({
                 "$or": [
                     {"ingredient.name": search_pattern},
                     {"location": search_pattern}
                 ]
-            }
+            })
 
-            # Add location filter if provided
-            if location:
-                query["location"] = location
+        if location:
+            conditions.append({"location": location})
 
-            # Add needs_restock filter if provided
-            if needs_restock is not None:
-                if needs_restock:
-                    query["$expr"] = {
+        if needs_restock is not None:
+            if needs_restock:
+                conditions.append({
+                    "$expr": {
                         "$and": [
                             {"$ne": ["$min_quantity", None]},
                             {"$lte": ["$quantity", "$min_quantity"]}
                         ]
                     }
-                else:
-                    query["$or"] = [
+                })
+            else:
+                conditions.append({
+                    "$or": [
                         {"min_quantity": None},
                         {
                             "$expr": {
@@ -164,16 +175,48 @@ class InventoryMixin:
                             }
                         }
                     ]
+                })
 
-            cursor = collection.find(query)
+        # Conditions are combined with $and so the restock $or cannot replace the search $or
+        if not conditions:
+            return {}
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
 
-            # Sort by location and ingredient name
-            cursor = cursor.sort([("location", 1), ("ingredient.name", 1)])
+    def search_inventory_items(
+        self, 
+        search_term: str, 
+        location: Optional[str] = None,
+        needs_restock: Optional[bool] = None,
+        skip: int = 0, 
+        limit: Optional[int] = 20,
+        after: Optional[str] = None
+    ) -> List[Type.InventoryItem]:
+        """Search inventory items by ingredient name with optional filters and pagination.
+        
+        Args:
+            search_term: Term to search for in ingredient names
+            location: Optional filter by storage location
+            needs_restock: Optional filter for items needing restock
+            skip: Number of items to skip for pagination (default: 0)
+            limit: Maximum number of items to return (default: 20, None for no limit)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
+            
+        Returns:
+            List of matching InventoryItem instances
+        """
+        keyset = self.decode_page_cursor(after, "inventory") if after else None
+
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return []
+
+            collection = db["inventory"]
 
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            query = self._inventory_search_query(search_term, location, needs_restock)
+
+            # Sort by location and ingredient name, one page at a time
+            cursor = self.find_page(collection, query, "inventory", skip=skip, limit=limit, after=keyset)
 
             items = []
             for doc in cursor:
@@ -186,11 +229,69 @@ class InventoryMixin:
                     print(f"Error parsing inventory item: {e}")
                     continue
 
-            return items
+            return Page(items, cursor.next_cursor)
         except Exception as e:
             print(f"Error searching inventory items with term '{search_term}': {e}")
             return []
 
+    def search_inventory_items_with_total(
+        self,
+        search_term: Optional[str] = None,
+        location: Optional[str] = None,
+        needs_restock: Optional[bool] = None,
+        skip: int = 0,
+        limit: Optional[int] = 20,
+        after: Optional[str] = None,
+        count: str = "exact"
+    ) -> Dict[str, Any]:
+        """Get a page of inventory items and the total number of matches in one query.
+
+        Replaces search_inventory_items/get_all_inventory_items followed by
+        count_inventory_items, which evaluated the regex filter twice.
+
+        Args:
+            search_term: Term to search for in ingredient names (None lists all items)
+            location: Optional filter by storage location
+            needs_restock: Optional filter for items needing restock
+            skip: Number of items to skip for pagination (default: 0)
+            limit: Maximum number of items to return (default: 20, None for no limit)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
+            count: How to count the matches: "exact", "estimated" or "capped" (see MongoMixin.find_page_with_total)
+
+        Returns:
+            Dictionary with "items" (Page of InventoryItem instances), "total"
+            and "total_exact" (False when the total was estimated or capped)
+        """
+        keyset = self.decode_page_cursor(after, "inventory") if after else None
+        check_count_mode(count)
+
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return {"items": Page(), "total": 0, "total_exact": True}
+
+            collection = db["inventory"]
+            query = self._inventory_search_query(search_term, location, needs_restock)
+
+            cursor, total, exact = self.find_page_with_total(collection, query, "inventory", skip=skip, limit=limit,
+                                                             after=keyset, count=count)
+
+            items = []
+            for doc in cursor:
+                if '_id' in doc:
+                    del doc['_id']
+                try:
+                    item = Type.InventoryItem.from_dict(doc)
+                    items.append(item)
+                except Exception as e:
+                    print(f"Error parsing inventory item: {e}")
+                    continue
+
+            return {"items": Page(items, cursor.next_cursor), "total": total, "total_exact": exact}
+        except Exception as e:
+            print(f"Error searching inventory items with total for term '{search_term}': {e}")
+            return {"items": Page(), "total": 0, "total_exact": True}
+
     def count_inventory_items(
         self, 
         search_term: Optional[str] = None,
@@ -214,38 +315,7 @@ class InventoryMixin:
 
             collection = db["inventory"]
 
-            # Build query based on parameters
-            query = {}
-
-            if search_term:
-                # Create regex pattern for case-insensitive search
-                search_pattern = {"$regex": search_term, "$options": "i"}
-                query["$or"] = [
-                    {"ingredient.name": search_pattern},
-                    {"location": search_pattern}
-                ]
-
-            if location:
-                query["location"] = location
-
-            if needs_restock is not None:
-                if needs_restock:
-                    query["$expr"] = {
-                        "$and": [
-                            {"$ne": ["$min_quantity", None]},
-                            {"$lte": ["$quantity", "$min_quantity"]}
-                        ]
-                    }
-                else:
-                    query["$or"] = [
-                        {"min_quantity": None},
-                        {
-                            "$expr": {
-                                "$gt": ["$quantity", "$min_quantity"]
-                            }
-                        }
-                    ]
-
+            query = self._inventory_search_query(search_term, location, needs_restock)
             return collection.count_documents(query)
 
         except Exception as e:
@@ -3,6 +3,8 @@ from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
 from uuid import UUID
 from datetime import date
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from ... import types as Type
 
 T = TypeVar('T', bound=Type.CalorIAModel)
@@ -10,6 +12,20 @@ T = TypeVar('T', bound=Type.CalorIAModel)
 class MealPrepMixin:
     """Mixin class that provides meal prep profile-related MongoDB operations."""
 
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "meal_prep_profiles": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("user_id", ASCENDING), ("is_active", ASCENDING), ("created_at", DESCENDING)],
+                       name="user_id_is_active_created_at"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "meal_prep_profiles", "filter": {"user_id": "", "is_active": True},
+         "sort": [("created_at", -1)], "description": "active meal prep profiles of a user"},
+    ]
+
     # No __init__ needed as it will use the parent class's __init__
 
     def add_meal_prep_profile(self, profile: Type.MealPrepProfile) -> Optional[Any]:
@@ -1,14 +1,41 @@
 import re
 from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
+
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 from ... import types as Type
+from ..mongo import Page
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
 class MealMixin:
     """Mixin class that provides meal-related MongoDB operations."""
+
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "meals": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING)], name="user_id_timestamp"),
+            IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="user_id_timestamp_page"),
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING), ("timestamp", DESCENDING)],
+                       name="user_id_on_date_timestamp"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "meals", "filter": {"user_id": "", "on_date": {"$gte": "", "$lte": ""}},
+         "sort": [("on_date", -1), ("timestamp", -1)], "description": "meals of a user in a date range"},
+        {"collection": "meals", "filter": {"user_id": "", "on_date": ""},
+         "sort": [("timestamp", 1)], "description": "meals of a user on a day"},
+        {"collection": "meals", "filter": {"id": ""}, "description": "meal by id"},
+    ]
+
+    # Sorts of the keyset-paginated listings (see MongoMixin.find_page)
+    PAGE_SORTS = {
+        "meals": [("timestamp", DESCENDING), ("_id", DESCENDING)],
+    }
     
     # No __init__ needed as it will use the parent class's __init__
     
@@ -21,8 +48,36 @@ class MealMixin:
         Returns:
             The inserted_id if successful, None otherwise
         """
-        return self.create_document("meals", meal_entry)
+        inserted_id = self.create_document("meals", meal_entry)
+        if inserted_id is not None:
+            self.apply_meal_to_rollup(meal_entry.to_dict())
+        return inserted_id
     
+    def add_meal_entries(self, meal_entries: List[Type.Meal]) -> List[Dict[str, Any]]:
+        """Add many meal entries with unordered bulk inserts (see MongoMixin.create_documents).
+
+        A meal that fails to insert does not stop the others. The daily
+        rollups (and cached dashboards) are updated once per user and day
+        for all inserted meals.
+
+        Args:
+            meal_entries: Meal model instances
+
+        Returns:
+            One result per meal, in input order: {"index", "id", "ok": True}
+            or {"index", "id", "ok": False, "error"}
+        """
+        meal_docs = [meal_entry.to_dict() for meal_entry in meal_entries]
+        results = [{"index": i, "id": doc.get("id"), "ok": True} for i, doc in enumerate(meal_docs)]
+        if not meal_docs:
+            return results
+
+        errors = {error["index"]: error["message"] for error in self.create_documents("meals", meal_docs)["errors"]}
+        for i, message in errors.items():
+            results[i].update(ok=False, error=message)
+        self.apply_meals_to_rollups([doc for i, doc in enumerate(meal_docs) if i not in errors])
+        return results
+
     def get_meal_by_id(self, meal_id: UUID) -> Optional[Type.Meal]:
         """Retrieve a meal by its ID.
         
@@ -46,7 +101,73 @@ class MealMixin:
             True if update was successful, False otherwise
         """
         query = {"id": str(meal_id)}  # Convert UUID to string for MongoDB query
-        return self.update_document("meals", query, meal_data)
+
+        # Keep the indexed on_date in sync with the meal's timestamp/date
+        on_date = self._meal_on_date(meal_data)
+        if on_date is not None:
+            meal_data["on_date"] = on_date
+
+        # Swap the totals this write replaced for the new ones in the daily rollups
+        images = self.find_and_update_document("meals", query, meal_data)
+        if images is None or images[0] == images[1]:
+            return False
+        old_doc, new_doc = images
+        self.apply_meal_to_rollup(old_doc, sign=-1)
+        self.apply_meal_to_rollup(new_doc)
+        return True
+
+    def _meal_on_date(self, meal_data: Dict[str, Any]) -> Optional[str]:
+        """Derive the ISO on_date string from meal update data, if it carries a date.
+
+        Args:
+            meal_data: Update data that may contain timestamp, meal_date or on_date
+
+        Returns:
+            ISO date string (YYYY-MM-DD) or None if the data has no date information
+        """
+        for field in ("on_date", "timestamp", "meal_date"):
+            value = meal_data.get(field)
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                return value.date().isoformat()
+            if isinstance(value, date):
+                return value.isoformat()
+            if isinstance(value, str) and len(value) >= 10:
+                return value[:10]
+        return None
+
+    def backfill_meal_dates(self) -> int:
+        """Set on_date on meals stored before the field existed.
+
+        The date is taken from the first 10 characters of the ISO timestamp,
+        which is what the old regex and $substr queries matched on. The update
+        runs server-side as a single pipeline update.
+
+        Returns:
+            Number of meals updated
+        """
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return 0
+
+            collection = db["meals"]
+            result = collection.update_many(
+                {"on_date": {"$exists": False}, "timestamp": {"$type": "string"}},
+                [{"$set": {"on_date": {"$substr": ["$timestamp", 0, 10]}}}]
+            )
+            updated = result.modified_count
+
+            # Timestamps stored as native BSON dates
+            result = collection.update_many(
+                {"on_date": {"$exists": False}, "timestamp": {"$type": "date"}},
+                [{"$set": {"on_date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}}}]
+            )
+            return updated + result.modified_count
+        except Exception as e:
+            print(f"Error backfilling meal dates: {e}")
+            return 0
     
     def delete_meal(self, meal_id: UUID) -> bool:
         """Delete a meal by its ID.
@@ -58,11 +179,16 @@ class MealMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(meal_id)}  # Convert UUID to string for MongoDB query
-        return self.delete_document("meals", query)
+        old_doc = self.find_and_delete_document("meals", query)
+        if old_doc is None:
+            return False
+        self.apply_meal_to_rollup(old_doc, sign=-1)
+        return True
     
     def get_user_meals(self, user_id: UUID, start_date: Optional[date] = None, 
                      end_date: Optional[date] = None, 
-                     skip: int = 0, limit: Optional[int] = None) -> List[Type.Meal]:
+                     skip: int = 0, limit: Optional[int] = None,
+                     after: Optional[str] = None) -> List[Type.Meal]:
         """Get meals for a user with optional date range and pagination.
         
         Args:
@@ -71,10 +197,13 @@ class MealMixin:
             end_date: Optional end date for filtering meals (inclusive)
             skip: Number of meals to skip for pagination (default: 0)
             limit: Maximum number of meals to return (default: None for all meals)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
             
         Returns:
             List of Meal instances
         """
+        keyset = self.decode_page_cursor(after, "meals") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -96,19 +225,11 @@ class MealMixin:
                     date_filter["$lte"] = end_date.isoformat()
                     
                 if date_filter:
-                    # The timestamp field contains the date information
-                    query["timestamp"] = date_filter
+                    # on_date is an indexed ISO date string, so this is an index range scan
+                    query["on_date"] = date_filter
             
-            # Find all matching meals
-            cursor = collection.find(query)
-            
-            # Sort by timestamp (descending)
-            cursor = cursor.sort("timestamp", -1)
-            
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Find matching meals by timestamp (descending), one page at a time
+            cursor = self.find_page(collection, query, "meals", skip=skip, limit=limit, after=keyset)
             
             meals = []
             for doc in cursor:
@@ -121,7 +242,7 @@ class MealMixin:
                     print(f"Error parsing meal: {e}")
                     continue
                     
-            return meals
+            return Page(meals, cursor.next_cursor)
             
         except Exception as e:
             print(f"Error getting user meals: {e}")
@@ -151,7 +272,7 @@ class MealMixin:
             # Query for meals matching user_id and date
             query = {
                 "user_id": str(user_id),  # Convert UUID to string for MongoDB query
-                "timestamp": {"$regex": f"^{meal_date.isoformat()}"}  # Match timestamp that starts with this date
+                "on_date": meal_date.isoformat()  # Indexed ISO date string
             }
             
             # Find all matching meals
@@ -231,15 +352,20 @@ class MealMixin:
             print(f"Error getting meal nutrition summary: {e}")
             return None
     
-    def get_user_meal_history(self, user_id: UUID, days: int = 7) -> List[Dict[str, Any]]:
-        """Get a summary of daily meals for a user over a number of days.
+    def get_user_meal_history(self, user_id: UUID, days: int = 7,
+                              start_date: Optional[date] = None, end_date: Optional[date] = None,
+                              fill_gaps: bool = True) -> List[Dict[str, Any]]:
+        """Get a summary of daily meals for a user over a window of days.
         
         Args:
             user_id: UUID of the user
-            days: Number of days of history to retrieve (default: 7)
+            days: Number of days of history to retrieve (default: 7), ending at end_date
+            start_date: Optional explicit first day of the window (overrides days)
+            end_date: Optional last day of the window (default: today)
+            fill_gaps: Whether to include days without meals as zero rows (default: True)
             
         Returns:
-            List of daily meal summary dictionaries, each containing:
+            List of daily meal summary dictionaries in chronological order, each containing:
             - date: The date (ISO format string)
             - meal_count: Number of meals logged
             - total_calories: Total calories for the day
@@ -252,34 +378,29 @@ class MealMixin:
                 return []
                 
             collection = db["meals"]
+
+            start_date, end_date = self._date_window(days, start_date, end_date)
             
             # Use MongoDB aggregation pipeline to group by date and summarize nutritional info
             pipeline = [
-                # Match entries for the specific user
-                {"$match": {"user_id": str(user_id)}},
-
-                # Add a date field by extracting the date part from timestamp string
-                {"$addFields": {
-                    "date_only": {"$substr": ["$timestamp", 0, 10]}  # Extract YYYY-MM-DD from ISO string
+                # Match entries for the specific user inside the date window (index range scan)
+                {"$match": {
+                    "user_id": str(user_id),
+                    "on_date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
                 }},
 
                 # Group by date and calculate nutritional totals
                 {"$group": {
-                    "_id": "$date_only",
+                    "_id": "$on_date",
                     "meal_count": {"$sum": 1},
-                    # We need to calculate calories on-the-fly since they're not stored directly
-                    # This is a simplified approach and may need to be adjusted based on actual data structure
                     "total_calories": {"$sum": {"$sum": "$food_items.calories"}},
                     "total_protein": {"$sum": {"$sum": "$food_items.protein_g"}},
                     "total_carbs": {"$sum": {"$sum": "$food_items.carbs_g"}},
                     "total_fat": {"$sum": {"$sum": "$food_items.fat_g"}}
                 }},
 
-                # Sort by date (descending)
-                {"$sort": {"_id": -1}},
-
-                # Limit to specified number of days
-                {"$limit": days},
+                # Sort by date (chronological)
+                {"$sort": {"_id": 1}},
 
                 # Project to format the output
                 {"$project": {
@@ -297,8 +418,15 @@ class MealMixin:
             
             # Execute the aggregation pipeline
             results = list(collection.aggregate(pipeline))
-            
-            return results
+
+            if not fill_gaps:
+                return results
+
+            return self._fill_daily_series(results, start_date, end_date, lambda: {
+                "meal_count": 0,
+                "total_calories": 0,
+                "macros": {"protein_g": 0, "carbs_g": 0, "fat_g": 0}
+            })
             
         except Exception as e:
             print(f"Error getting user meal history: {e}")
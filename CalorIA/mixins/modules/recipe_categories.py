@@ -1,14 +1,30 @@
 import re
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 from datetime import datetime
 
+from pymongo import IndexModel, UpdateOne, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..cache import TaxonomyLookup, get_taxonomy_cache
 
 
 class RecipeCategoryMixin:
     """Mixin class that provides recipe category-related MongoDB operations."""
 
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "recipe_categories": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("slug", ASCENDING)], name="slug"),
+            IndexModel([("name", ASCENDING)], name="name"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "recipe_categories", "filter": {"slug": ""}, "description": "category by slug"},
+    ]
+
     def create_category(self, category: Type.RecipeCategoryModel) -> Optional[str]:
         """Create a new recipe category in the recipe_categories collection.
 
@@ -22,7 +38,30 @@ class RecipeCategoryMixin:
         if not hasattr(category, 'slug') or not category.slug:
             category.slug = self.generate_slug(category.name)
 
-        return self.create_document("recipe_categories", category)
+        inserted_id = self.create_document("recipe_categories", category)
+        if inserted_id is not None:
+            self.invalidate_category_lookup()
+        return inserted_id
+
+    def create_categories(self, categories: List[Type.RecipeCategoryModel],
+                          batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Create many categories with unordered bulk inserts (see MongoMixin.create_documents).
+
+        Args:
+            categories: RecipeCategoryModel instances
+            batch_size: Categories per bulk write (default: CALORIA_BULK_BATCH_SIZE)
+
+        Returns:
+            create_documents' result: counts, per-category "inserted_ids" and "errors"
+        """
+        for category in categories:
+            if not category.slug:
+                category.slug = self.generate_slug(category.name)
+
+        result = self.create_documents("recipe_categories", categories, batch_size)
+        if result["inserted"]:
+            self.invalidate_category_lookup()
+        return result
 
     def get_category_by_id(self, category_id: UUID) -> Optional[Type.RecipeCategoryModel]:
         """Retrieve a category by its ID.
@@ -98,6 +137,61 @@ class RecipeCategoryMixin:
             print(f"Error getting categories: {e}")
             return []
 
+    def get_category_lookup(self) -> TaxonomyLookup:
+        """Get the cached id/slug/name tables of every category.
+
+        The snapshot is shared and reloaded after any category write (or after
+        CALORIA_TAXONOMY_CACHE_TTL seconds); its usage counts may lag behind the
+        collection, so use get_category_by_id when those matter.
+
+        Returns:
+            TaxonomyLookup over all categories (empty if the database is unreachable)
+        """
+        return get_taxonomy_cache("recipe_categories").get(self._load_category_lookup_items)
+
+    def _load_category_lookup_items(self) -> Optional[List[Type.RecipeCategoryModel]]:
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return None
+
+            categories = []
+            for doc in db["recipe_categories"].find({}, {"_id": 0}).sort("name", 1):
+                try:
+                    categories.append(Type.RecipeCategoryModel.from_dict(doc))
+                except Exception as e:
+                    print(f"Error parsing category: {e}")
+            return categories
+        except Exception as e:
+            print(f"Error loading category lookup: {e}")
+            return None
+
+    def resolve_category(self, value: str) -> Optional[Type.RecipeCategoryModel]:
+        """Find a category by slug or case-insensitive name through the category lookup.
+
+        A miss is checked against the collection by slug once, so categories
+        created by another process are found before the cached tables expire.
+
+        Args:
+            value: Category slug or name, as passed in recipe filters
+
+        Returns:
+            RecipeCategoryModel instance (shared, do not modify) if found, None otherwise
+        """
+        category = self.get_category_lookup().resolve(value, '_')
+        if category is None:
+            category = self.get_category_by_slug(value.lower().replace(' ', '_'))
+            if category is not None:
+                # Only the cached tables are behind; indexed recipe category names did not change
+                get_taxonomy_cache("recipe_categories").invalidate()
+        return category
+
+    def invalidate_category_lookup(self) -> None:
+        """Drop the cached category tables after a write to the categories collection."""
+        get_taxonomy_cache("recipe_categories").invalidate()
+        # Recipes are indexed with their category names
+        self.invalidate_recipe_search_index()
+
     def update_category(self, category_id: UUID, category_data: dict) -> bool:
         """Update a category by its ID.
 
@@ -113,7 +207,10 @@ class RecipeCategoryMixin:
         # Add updated_at timestamp
         category_data["updated_at"] = datetime.now()
 
-        return self.update_document("recipe_categories", query, category_data)
+        updated = self.update_document("recipe_categories", query, category_data)
+        if updated:
+            self.invalidate_category_lookup()
+        return updated
 
     def delete_category(self, category_id: UUID) -> bool:
         """Delete a category by its ID.
@@ -125,7 +222,10 @@ class RecipeCategoryMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(category_id)}
-        return self.delete_document("recipe_categories", query)
+        deleted = self.delete_document("recipe_categories", query)
+        if deleted:
+            self.invalidate_category_lookup()
+        return deleted
 
     def search_categories(self, search_term: str, skip: int = 0, limit: int = 20) -> List[Type.RecipeCategoryModel]:
         """Search categories by name or description.
@@ -226,6 +326,20 @@ class RecipeCategoryMixin:
             print(f"Error incrementing category usage: {e}")
             return False
 
+    def increment_category_usages(self, counts: Dict[Any, int]) -> int:
+        """Add to the usage counts of many categories with one bulk write (e.g. after a bulk recipe import).
+
+        Args:
+            counts: Category ID (UUID or string) -> number of new uses
+
+        Returns:
+            Number of categories updated
+        """
+        now = datetime.now()
+        operations = [UpdateOne({"id": str(category_id)}, {"$inc": {"usage_count": count}, "$set": {"updated_at": now}})
+                      for category_id, count in counts.items() if count]
+        return self.bulk_write("recipe_categories", operations)["modified"]
+
     def decrement_category_usage(self, category_id: UUID) -> bool:
         """Decrement the usage count for a category.
 
@@ -1,14 +1,31 @@
 import re
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 from datetime import datetime
 
+from pymongo import IndexModel, UpdateOne, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..cache import TaxonomyLookup, get_taxonomy_cache
 
 
 class RecipeTagMixin:
     """Mixin class that provides recipe tag-related MongoDB operations."""
 
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "recipe_tags": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("slug", ASCENDING)], name="slug"),
+            IndexModel([("name", ASCENDING)], name="name"),
+            IndexModel([("usage_count", DESCENDING)], name="usage_count"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "recipe_tags", "filter": {"slug": ""}, "description": "tag by slug"},
+    ]
+
     def create_tag(self, tag: Type.RecipeTagModel) -> Optional[str]:
         """Create a new recipe tag in the recipe_tags collection.
 
@@ -22,7 +39,29 @@ class RecipeTagMixin:
         if not hasattr(tag, 'slug') or not tag.slug:
             tag.slug = self.generate_slug(tag.name)
 
-        return self.create_document("recipe_tags", tag)
+        inserted_id = self.create_document("recipe_tags", tag)
+        if inserted_id is not None:
+            self.invalidate_tag_lookup()
+        return inserted_id
+
+    def create_tags(self, tags: List[Type.RecipeTagModel], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Create many tags with unordered bulk inserts (see MongoMixin.create_documents).
+
+        Args:
+            tags: RecipeTagModel instances
+            batch_size: Tags per bulk write (default: CALORIA_BULK_BATCH_SIZE)
+
+        Returns:
+            create_documents' result: counts, per-tag "inserted_ids" and "errors"
+        """
+        for tag in tags:
+            if not tag.slug:
+                tag.slug = self.generate_slug(tag.name)
+
+        result = self.create_documents("recipe_tags", tags, batch_size)
+        if result["inserted"]:
+            self.invalidate_tag_lookup()
+        return result
 
     def get_tag_by_id(self, tag_id: UUID) -> Optional[Type.RecipeTagModel]:
         """Retrieve a tag by its ID.
@@ -102,6 +141,61 @@ class RecipeTagMixin:
             print(f"Error getting tags: {e}")
             return []
 
+    def get_tag_lookup(self) -> TaxonomyLookup:
+        """Get the cached id/slug/name tables of every tag.
+
+        The snapshot is shared and reloaded after any tag write (or after
+        CALORIA_TAXONOMY_CACHE_TTL seconds); its usage counts may lag behind the
+        collection, so use get_tag_by_id when those matter.
+
+        Returns:
+            TaxonomyLookup over all tags (empty if the database is unreachable)
+        """
+        return get_taxonomy_cache("recipe_tags").get(self._load_tag_lookup_items)
+
+    def _load_tag_lookup_items(self) -> Optional[List[Type.RecipeTagModel]]:
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return None
+
+            tags = []
+            for doc in db["recipe_tags"].find({}, {"_id": 0}).sort("name", 1):
+                try:
+                    tags.append(Type.RecipeTagModel.from_dict(doc))
+                except Exception as e:
+                    print(f"Error parsing tag: {e}")
+            return tags
+        except Exception as e:
+            print(f"Error loading tag lookup: {e}")
+            return None
+
+    def resolve_tag(self, value: str) -> Optional[Type.RecipeTagModel]:
+        """Find a tag by slug or case-insensitive name through the tag lookup.
+
+        A miss is checked against the collection by slug once, so tags
+        created by another process are found before the cached tables expire.
+
+        Args:
+            value: Tag slug or name, as passed in recipe filters
+
+        Returns:
+            RecipeTagModel instance (shared, do not modify) if found, None otherwise
+        """
+        tag = self.get_tag_lookup().resolve(value, '-')
+        if tag is None:
+            tag = self.get_tag_by_slug(value.lower().replace(' ', '-'))
+            if tag is not None:
+                # Only the cached tables are behind; indexed recipe tag names did not change
+                get_taxonomy_cache("recipe_tags").invalidate()
+        return tag
+
+    def invalidate_tag_lookup(self) -> None:
+        """Drop the cached tag tables after a write to the tags collection."""
+        get_taxonomy_cache("recipe_tags").invalidate()
+        # Recipes are indexed with their tag names
+        self.invalidate_recipe_search_index()
+
     def update_tag(self, tag_id: UUID, tag_data: dict) -> bool:
         """Update a tag by its ID.
 
@@ -117,7 +211,10 @@ class RecipeTagMixin:
         # Add updated_at timestamp
         tag_data["updated_at"] = datetime.now()
 
-        return self.update_document("recipe_tags", query, tag_data)
+        updated = self.update_document("recipe_tags", query, tag_data)
+        if updated:
+            self.invalidate_tag_lookup()
+        return updated
 
     def delete_tag(self, tag_id: UUID) -> bool:
         """Delete a tag by its ID.
@@ -129,7 +226,10 @@ class RecipeTagMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(tag_id)}
-        return self.delete_document("recipe_tags", query)
+        deleted = self.delete_document("recipe_tags", query)
+        if deleted:
+            self.invalidate_tag_lookup()
+        return deleted
 
     def search_tags(self, search_term: str, skip: int = 0, limit: int = 20) -> List[Type.RecipeTagModel]:
         """Search tags by name or description.
@@ -205,6 +305,20 @@ class RecipeTagMixin:
             print(f"Error incrementing tag usage: {e}")
             return False
 
+    def increment_tag_usages(self, counts: Dict[Any, int]) -> int:
+        """Add to the usage counts of many tags with one bulk write (e.g. after a bulk recipe import).
+
+        Args:
+            counts: Tag ID (UUID or string) -> number of new uses
+
+        Returns:
+            Number of tags updated
+        """
+        now = datetime.now()
+        operations = [UpdateOne({"id": str(tag_id)}, {"$inc": {"usage_count": count}, "$set": {"updated_at": now}})
+                      for tag_id, count in counts.items() if count]
+        return self.bulk_write("recipe_tags", operations)["modified"]
+
     def decrement_tag_usage(self, tag_id: UUID) -> bool:
         """Decrement the usage count for a tag.
 
@@ -1,15 +1,65 @@
 import re
-from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
+from itertools import islice
+from typing import Optional, Type as TypingType, TypeVar, Any, Dict, Iterable, List, Set, Union
 from uuid import UUID
 from datetime import datetime
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..cache import TaxonomyLookup, get_taxonomy_cache
+from ..mongo import Page, decode_cursor_values, encode_cursor_values
+from ..nutrition import NUTRIENT_FIELDS, STORED_FIELDS, NutritionBatch, stored_nutrition
+from ..search_index import RecipeSearchIndex, analyze, get_recipe_search_index
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
 class RecipeMixin:
     """Mixin class that provides recipe-related MongoDB operations."""
 
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "recipes": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("name", ASCENDING)], name="name"),
+            IndexModel([("created_at", DESCENDING)], name="created_at"),
+            IndexModel([("category_id", ASCENDING), ("created_at", DESCENDING)], name="category_id_created_at"),
+            IndexModel([("tag_ids", ASCENDING), ("created_at", DESCENDING)], name="tag_ids_created_at"),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_page"),
+            IndexModel([("category_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                       name="category_id_created_at_page"),
+            IndexModel([("is_system", ASCENDING)], name="is_system"),
+            # Nutrition discovery: equality fields first, then the sort/range field (see find_recipes_by_nutrition)
+            IndexModel([("calories_per_serving_stored", ASCENDING), ("_id", ASCENDING)], name="calories_page"),
+            IndexModel([("protein_per_serving_stored", DESCENDING), ("_id", DESCENDING)], name="protein_page"),
+            IndexModel([("difficulty", ASCENDING), ("calories_per_serving_stored", ASCENDING), ("_id", ASCENDING)],
+                       name="difficulty_calories_page"),
+            IndexModel([("tag_ids", ASCENDING), ("calories_per_serving_stored", ASCENDING), ("_id", ASCENDING)],
+                       name="tag_ids_calories_page"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "recipes", "filter": {"category_id": ""},
+         "sort": [("created_at", -1), ("_id", -1)], "description": "recipes of a category, newest first"},
+        {"collection": "recipes", "filter": {"id": ""}, "description": "recipe by id"},
+        {"collection": "recipes", "filter": {"calories_per_serving_stored": {"$lte": 500}, "protein_per_serving_stored": {"$gte": 30}},
+         "sort": [("protein_per_serving_stored", -1), ("_id", -1)], "description": "high-protein recipes under a calorie cap"},
+    ]
+
+    # Sorts of the keyset-paginated listings (see MongoMixin.find_page)
+    PAGE_SORTS = {
+        "recipes": [("created_at", DESCENDING), ("_id", DESCENDING)],
+        "recipes_by_calories": [("calories_per_serving_stored", ASCENDING), ("_id", ASCENDING)],
+        "recipes_by_protein": [("protein_per_serving_stored", DESCENDING), ("_id", DESCENDING)],
+    }
+
+    # Orders of find_recipes_by_nutrition and the listing each one pages through
+    NUTRITION_SORTS = {"calories": "recipes_by_calories", "protein": "recipes_by_protein"}
+
+    # Related objects recipe reads can populate on request (see expand_recipes)
+    RECIPE_EXPANSIONS = ("category", "tags")
+
     # No __init__ needed as it will use the parent class's __init__
 
     def create_recipe(self, recipe: Type.Recipe) -> Optional[Any]:
@@ -21,22 +71,51 @@ class RecipeMixin:
         Returns:
             The inserted_id if successful, None otherwise
         """
-        return self.create_document("recipes", recipe)
+        inserted_id = self.create_document("recipes", recipe)
+        if inserted_id is not None:
+            index = get_recipe_search_index()
+            if index is not None and index.ready:
+                index.add(recipe.to_dict())
+        return inserted_id
+
+    def create_recipes(self, recipes: List[Type.Recipe], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Create many recipes with unordered bulk inserts (see MongoMixin.create_documents).
+
+        Args:
+            recipes: Recipe model instances
+            batch_size: Recipes per bulk write (default: CALORIA_BULK_BATCH_SIZE)
 
-    def get_recipe_by_id(self, recipe_id: UUID) -> Optional[Type.Recipe]:
+        Returns:
+            create_documents' result: counts, per-recipe "inserted_ids" and "errors"
+        """
+        result = self.create_documents("recipes", recipes, batch_size)
+        index = get_recipe_search_index()
+        if index is not None and index.ready:
+            for recipe, inserted_id in zip(recipes, result["inserted_ids"]):
+                if inserted_id is not None:
+                    index.add(recipe.to_dict())
+        return result
+
+    def get_recipe_by_id(self, recipe_id: UUID, expand: Optional[Union[str, Iterable[str]]] = None) -> Optional[Type.Recipe]:
         """Retrieve a recipe by its ID.
 
         Args:
             recipe_id: UUID of the recipe to retrieve
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
 
         Returns:
             Recipe instance if found, None otherwise
         """
+        expand = self.parse_recipe_expand(expand)
         query = {"id": str(recipe_id)}  # Convert UUID to string for MongoDB query
-        return self.get_document("recipes", query, Type.Recipe)
+        recipe = self.get_document("recipes", query, Type.Recipe)
+        if recipe is not None:
+            self.expand_recipes([recipe], expand)
+        return recipe
 
     def get_all_recipes(self, skip: int = 0, limit: Optional[int] = None,
-                       category: Optional[str] = None, difficulty: Optional[str] = None) -> List[Type.Recipe]:
+                       category: Optional[str] = None, difficulty: Optional[str] = None, after: Optional[str] = None,
+                       expand: Optional[Union[str, Iterable[str]]] = None) -> List[Type.Recipe]:
         """Get all recipes with optional filtering and pagination.
 
         Args:
@@ -44,10 +123,15 @@ class RecipeMixin:
             limit: Maximum number of recipes to return (default: None for all recipes)
             category: Filter by recipe category (name or slug)
             difficulty: Filter by difficulty level
+            after: Cursor token from a previous page; continues right after it (overrides skip)
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
 
         Returns:
             List of Recipe instances
         """
+        expand = self.parse_recipe_expand(expand)
+        keyset = self.decode_page_cursor(after, "recipes") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -55,39 +139,14 @@ class RecipeMixin:
 
             collection = db["recipes"]
 
-            # Build query based on filters
-            query = {}
-
-            # Handle category filtering - convert category name to category_id
-            if category:
-                # Try to find the category by slug first, then by name
-                category_obj = self.get_category_by_slug(category.lower().replace(' ', '_'))
-                if not category_obj:
-                    # Try to find by name (case-insensitive)
-                    categories = self.get_all_categories()
-                    for cat in categories:
-                        if cat.name.lower() == category.lower():
-                            category_obj = cat
-                            break
-
-                if category_obj:
-                    query["category_id"] = str(category_obj.id)
-                else:
-                    # If category not found, return empty list
-                    return []
-
-            if difficulty:
-                query["difficulty"] = difficulty
-
-            cursor = collection.find(query)
-
-            # Sort recipes by creation date (newest first)
-            cursor = cursor.sort("created_at", -1)
+            filters = self._resolve_recipe_filters(category, difficulty)
+            if filters is None:
+                # If category not found, return empty list
+                return []
+            query = self._recipe_search_query(None, filters)
 
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Newest first, one page at a time
+            cursor = self.find_page(collection, query, "recipes", skip=skip, limit=limit, after=keyset)
 
             recipes = []
             for doc in cursor:
@@ -100,7 +159,7 @@ class RecipeMixin:
                     print(f"Error parsing recipe: {e}")
                     continue
 
-            return recipes
+            return self.expand_recipes(Page(recipes, cursor.next_cursor), expand)
         except Exception as e:
             print(f"Error getting recipes: {e}")
             return []
@@ -120,7 +179,10 @@ class RecipeMixin:
         # Add updated_at timestamp
         recipe_data["updated_at"] = datetime.now()
 
-        return self.update_document("recipes", query, recipe_data)
+        updated = self.update_document("recipes", query, recipe_data)
+        if updated:
+            self._reindex_recipe(query)
+        return updated
 
     def delete_recipe(self, recipe_id: UUID) -> bool:
         """Delete a recipe by its ID.
@@ -132,12 +194,207 @@ class RecipeMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(recipe_id)}  # Convert UUID to string for MongoDB query
-        return self.delete_document("recipes", query)
+        deleted = self.delete_document("recipes", query)
+        if deleted:
+            index = get_recipe_search_index()
+            if index is not None:
+                index.remove(recipe_id)
+        return deleted
+
+    # In-memory full-text index (see CalorIA.mixins.search_index)
+    def build_recipe_search_index(self) -> Optional[int]:
+        """(Re)build the process-wide recipe search index from the database.
+
+        Returns:
+            Number of indexed recipes, or None if the index is disabled or could not be built
+        """
+        index = get_recipe_search_index()
+        if index is None:
+            return None
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return None
+            category_names = self.get_category_lookup().names()
+            tag_names = self.get_tag_lookup().names()
+            return index.load(db["recipes"].find({}, RecipeSearchIndex.PROJECTION), category_names, tag_names)
+        except Exception as e:
+            print(f"Error building recipe search index: {e}")
+            return None
+
+    def get_ready_recipe_search_index(self) -> Optional[RecipeSearchIndex]:
+        """Get the recipe search index, starting a background (re)build if it is stale.
+
+        Returns:
+            The built index, or None if it is disabled or not built yet
+        """
+        index = get_recipe_search_index()
+        if index is None or not index.refresh(self.build_recipe_search_index):
+            return None
+        return index
+
+    def invalidate_recipe_search_index(self) -> None:
+        """Have the recipe search index rebuilt on next use (e.g. after a category or tag was renamed)."""
+        index = get_recipe_search_index()
+        if index is not None:
+            index.invalidate()
+
+    def _reindex_recipe(self, query: Dict[str, Any]) -> None:
+        """Refresh one recipe in the search index after it was updated."""
+        index = get_recipe_search_index()
+        if index is None or not index.ready:
+            return
+        try:
+            db = self.get_db_connection()
+            doc = db["recipes"].find_one(query, RecipeSearchIndex.PROJECTION) if db is not None else None
+            if doc is not None:
+                index.add(doc)
+        except Exception as e:
+            print(f"Error re-indexing recipe: {e}")
+
+    def _resolve_recipe_filters(self, category: Optional[str] = None, difficulty: Optional[str] = None,
+                                tags: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Resolve the category and tag names (or slugs) of a recipe filter to ids.
+
+        Args:
+            category: Recipe category (name or slug)
+            difficulty: Difficulty level
+            tags: Tag names (or slugs); unknown tags are ignored
+
+        Returns:
+            Dictionary with category_id, difficulty and tag_ids (None when not
+            filtered), or None if the category does not exist
+        """
+        filters = {"category_id": None, "difficulty": difficulty or None, "tag_ids": None}
+
+        # Resolve names through the cached category/tag lookups (no collection scans)
+        if category:
+            category_obj = self.resolve_category(category)
+            if not category_obj:
+                return None
+            filters["category_id"] = str(category_obj.id)
+
+        if tags:
+            tag_ids = [str(tag_obj.id) for tag_obj in map(self.resolve_tag, tags) if tag_obj]
+            filters["tag_ids"] = tag_ids or None
+
+        return filters
+
+    def _recipe_search_query(self, search_term: Optional[str], filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the MongoDB filter of a recipe search (used when the search index is disabled)."""
+        query: Dict[str, Any] = {}
+
+        if search_term:
+            # Case-insensitive substring search; the term is text, not a pattern
+            search_pattern = {"$regex": re.escape(search_term), "$options": "i"}
+
+            # Search in name, description, tags, and ingredients
+            query["$or"] = [
+                {"name": search_pattern},
+                {"description": search_pattern},
+                {"legacy_tags": {"$elemMatch": search_pattern}},  # Search in legacy tags
+                {"ingredients.ingredient.name": search_pattern}
+            ]
+
+        if filters["category_id"]:
+            query["category_id"] = filters["category_id"]
+        if filters["difficulty"]:
+            query["difficulty"] = filters["difficulty"]
+        if filters["tag_ids"]:
+            query["tag_ids"] = {"$in": filters["tag_ids"]}
+        return query
+
+    def parse_recipe_expand(self, expand: Optional[Union[str, Iterable[str]]]) -> Set[str]:
+        """Validate the related objects requested with a recipe read.
+
+        Args:
+            expand: Field names as a list or a comma-separated string (None for none)
+
+        Returns:
+            Set of fields to populate
+
+        Raises:
+            ValueError: If a field cannot be expanded
+        """
+        if not expand:
+            return set()
+        if isinstance(expand, str):
+            expand = expand.split(',')
+        fields = {field.strip() for field in expand if field and field.strip()}
+        unknown = fields.difference(self.RECIPE_EXPANSIONS)
+        if unknown:
+            raise ValueError(f"Cannot expand {', '.join(sorted(unknown))} "
+                             f"(expected any of: {', '.join(self.RECIPE_EXPANSIONS)})")
+        return fields
+
+    def expand_recipes(self, recipes: List[Type.Recipe], expand: Optional[Union[str, Iterable[str]]]) -> List[Type.Recipe]:
+        """Populate the category and/or tags objects of a page of recipes in place.
+
+        Every referenced id is resolved from the cached category/tag lookups;
+        ids missing there (created by another process) are loaded with one
+        query per collection for the whole page. Dangling ids are left out.
+
+        Args:
+            recipes: Recipes to populate
+            expand: Related objects to populate (see parse_recipe_expand)
+
+        Returns:
+            The same recipes
+        """
+        fields = self.parse_recipe_expand(expand)
+        if not fields or not recipes:
+            return recipes
+
+        if "category" in fields:
+            categories = self._get_taxonomy_items(
+                self.get_category_lookup(), "recipe_categories", Type.RecipeCategoryModel,
+                {str(recipe.category_id) for recipe in recipes})
+            for recipe in recipes:
+                recipe.category = categories.get(str(recipe.category_id))
+
+        if "tags" in fields:
+            tags = self._get_taxonomy_items(
+                self.get_tag_lookup(), "recipe_tags", Type.RecipeTagModel,
+                {str(tag_id) for recipe in recipes for tag_id in recipe.tag_ids})
+            for recipe in recipes:
+                recipe.tags = [tags[tag_id] for tag_id in map(str, recipe.tag_ids) if tag_id in tags]
+
+        return recipes
+
+    def _get_taxonomy_items(self, lookup: TaxonomyLookup, collection_name: str,
+                            model_class: TypingType[T], ids: Set[str]) -> Dict[str, T]:
+        """Map category/tag ids to models: cached ones first, the rest in one batched query."""
+        found = {item_id: lookup.by_id[item_id] for item_id in ids if item_id in lookup.by_id}
+        missing = [item_id for item_id in ids if item_id not in found]
+        if not missing:
+            return found
+
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return found
+            for doc in db[collection_name].find({"id": {"$in": missing}}, {"_id": 0}):
+                try:
+                    found[str(doc["id"])] = model_class.from_dict(doc)
+                except Exception as e:
+                    print(f"Error parsing {collection_name} entry: {e}")
+            if len(found) > len(ids) - len(missing):
+                # Written by another process; reload the cached tables on next use
+                get_taxonomy_cache(collection_name).invalidate()
+        except Exception as e:
+            print(f"Error loading {collection_name} for recipes: {e}")
+        return found
 
     def search_recipes(self, search_term: str, skip: int = 0, limit: Optional[int] = 20,
                        category: Optional[str] = None, difficulty: Optional[str] = None,
-                       tags: Optional[List[str]] = None) -> List[Type.Recipe]:
-        """Search recipes by name, description, tags, or ingredients with optional filters.
+                       tags: Optional[List[str]] = None, after: Optional[str] = None,
+                       expand: Optional[Union[str, Iterable[str]]] = None) -> List[Type.Recipe]:
+        """Search recipes by name, description, tags, category, or ingredients with optional filters.
+
+        With the in-memory search index enabled, recipes containing any of the
+        search words are returned most relevant first (BM25 over name, tag
+        names, category name, ingredient names and description). Without it,
+        recipes containing the whole term are returned newest first.
 
         Args:
             search_term: Term to search for in recipe names, descriptions, tags, and ingredients
@@ -146,10 +403,20 @@ class RecipeMixin:
             category: Filter by recipe category (name or slug)
             difficulty: Filter by difficulty level
             tags: Filter by specific tag names
+            after: Cursor token from a previous page; continues right after it (overrides skip)
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
 
         Returns:
             List of matching Recipe instances
         """
+        expand = self.parse_recipe_expand(expand)
+        index = self.get_ready_recipe_search_index() if analyze(search_term) else None
+        if index is not None:
+            keyset = decode_cursor_values(after) if after else None
+            index.check_rank_key(keyset)
+        else:
+            keyset = self.decode_page_cursor(after, "recipes") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -157,70 +424,32 @@ class RecipeMixin:
 
             collection = db["recipes"]
 
-            # Create regex pattern for case-insensitive search
-            search_pattern = {"$regex": search_term, "$options": "i"}
-
-            # Build base query for search in name, description, tags, and ingredients
-            search_query = {
-                "$or": [
-                    {"name": search_pattern},
-                    {"description": search_pattern},
-                    {"legacy_tags": {"$elemMatch": search_pattern}},  # Search in legacy tags
-                    {"ingredients.ingredient.name": search_pattern}
-                ]
-            }
-
-            # Handle category filtering - convert category name to category_id
-            if category:
-                # Try to find the category by slug first, then by name
-                category_obj = self.get_category_by_slug(category.lower().replace(' ', '_'))
-                if not category_obj:
-                    # Try to find by name (case-insensitive)
-                    categories = self.get_all_categories()
-                    for cat in categories:
-                        if cat.name.lower() == category.lower():
-                            category_obj = cat
-                            break
-
-                if category_obj:
-                    search_query["category_id"] = str(category_obj.id)
-                else:
-                    # If category not found, return empty list
-                    return []
-
-            # Add difficulty filter if provided
-            if difficulty:
-                search_query["difficulty"] = difficulty
-
-            # Handle tags filtering - convert tag names to tag_ids
-            if tags:
-                tag_ids = []
-                for tag_name in tags:
-                    # Try to find the tag by slug first, then by name
-                    tag_obj = self.get_tag_by_slug(tag_name.lower().replace(' ', '-'))
-                    if not tag_obj:
-                        # Try to find by name (case-insensitive)
-                        all_tags = self.get_all_tags()
-                        for tag in all_tags:
-                            if tag.name.lower() == tag_name.lower():
-                                tag_obj = tag
-                                break
-
-                    if tag_obj:
-                        tag_ids.append(str(tag_obj.id))
-
-                if tag_ids:
-                    search_query["tag_ids"] = {"$in": tag_ids}
-
-            cursor = collection.find(search_query)
-
-            # Sort by relevance (creation date as proxy)
-            cursor = cursor.sort("created_at", -1)
-
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            filters = self._resolve_recipe_filters(category, difficulty, tags)
+            if filters is None:
+                # If category not found, return empty list
+                return []
+
+            if index is not None:
+                # Rank and paginate in the index, then load just this page
+                recipe_ids, _, next_after = index.search(search_term, skip=skip, limit=limit, after=keyset, **filters)
+                docs = {doc["id"]: doc for doc in collection.find({"id": {"$in": recipe_ids}}, {"_id": 0})}
+                recipes = []
+                for recipe_id in recipe_ids:
+                    doc = docs.get(recipe_id)
+                    if doc is None:
+                        continue  # deleted by another process since the index was built
+                    try:
+                        recipes.append(Type.Recipe.from_dict(doc))
+                    except Exception as e:
+                        print(f"Error parsing recipe: {e}")
+                        continue
+                next_cursor = encode_cursor_values(next_after) if next_after is not None else None
+                return self.expand_recipes(Page(recipes, next_cursor), expand)
+
+            search_query = self._recipe_search_query(search_term, filters)
+
+            # Newest first, one page at a time
+            cursor = self.find_page(collection, search_query, "recipes", skip=skip, limit=limit, after=keyset)
 
             recipes = []
             for doc in cursor:
@@ -233,48 +462,58 @@ class RecipeMixin:
                     print(f"Error parsing recipe: {e}")
                     continue
 
-            return recipes
+            return self.expand_recipes(Page(recipes, cursor.next_cursor), expand)
         except Exception as e:
             print(f"Error searching recipes with term '{search_term}': {e}")
             return []
 
-    def get_recipes_by_category(self, category: str, skip: int = 0, limit: Optional[int] = None) -> List[Type.Recipe]:
+    def get_recipes_by_category(self, category: str, skip: int = 0, limit: Optional[int] = None,
+                                expand: Optional[Union[str, Iterable[str]]] = None) -> List[Type.Recipe]:
         """Get recipes by category.
 
         Args:
             category: Recipe category to filter by
             skip: Number of recipes to skip for pagination
             limit: Maximum number of recipes to return
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
 
         Returns:
             List of Recipe instances in the specified category
         """
-        return self.get_all_recipes(skip=skip, limit=limit, category=category)
+        return self.get_all_recipes(skip=skip, limit=limit, category=category, expand=expand)
 
-    def get_recipes_by_difficulty(self, difficulty: str, skip: int = 0, limit: Optional[int] = None) -> List[Type.Recipe]:
+    def get_recipes_by_difficulty(self, difficulty: str, skip: int = 0, limit: Optional[int] = None,
+                                  expand: Optional[Union[str, Iterable[str]]] = None) -> List[Type.Recipe]:
         """Get recipes by difficulty level.
 
         Args:
             difficulty: Difficulty level to filter by
             skip: Number of recipes to skip for pagination
             limit: Maximum number of recipes to return
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
 
         Returns:
             List of Recipe instances with the specified difficulty
         """
-        return self.get_all_recipes(skip=skip, limit=limit, difficulty=difficulty)
+        return self.get_all_recipes(skip=skip, limit=limit, difficulty=difficulty, expand=expand)
 
-    def get_recipes_by_tags(self, tags: List[str], skip: int = 0, limit: Optional[int] = None) -> List[Type.Recipe]:
+    def get_recipes_by_tags(self, tags: List[str], skip: int = 0, limit: Optional[int] = None, after: Optional[str] = None,
+                            expand: Optional[Union[str, Iterable[str]]] = None) -> List[Type.Recipe]:
         """Get recipes that have any of the specified tags.
 
         Args:
             tags: List of tag names to search for
             skip: Number of recipes to skip for pagination
             limit: Maximum number of recipes to return
+            after: Cursor token from a previous page; continues right after it (overrides skip)
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
 
         Returns:
             List of Recipe instances that match any of the tags
         """
+        expand = self.parse_recipe_expand(expand)
+        keyset = self.decode_page_cursor(after, "recipes") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -283,21 +522,8 @@ class RecipeMixin:
             collection = db["recipes"]
 
             # Convert tag names to tag_ids
-            tag_ids = []
-            for tag_name in tags:
-                # Try to find the tag by slug first, then by name
-                tag_obj = self.get_tag_by_slug(tag_name.lower().replace(' ', '-'))
-                if not tag_obj:
-                    # Try to find by name (case-insensitive)
-                    all_tags = self.get_all_tags()
-                    for tag in all_tags:
-                        if tag.name.lower() == tag_name.lower():
-                            tag_obj = tag
-                            break
-
-                if tag_obj:
-                    tag_ids.append(str(tag_obj.id))
-
+            filters = self._resolve_recipe_filters(tags=tags)
+            tag_ids = filters["tag_ids"]
             if not tag_ids:
                 # If no valid tags found, return empty list
                 return []
@@ -305,15 +531,8 @@ class RecipeMixin:
             # Query for recipes that have any of the specified tag_ids
             query = {"tag_ids": {"$in": tag_ids}}
 
-            cursor = collection.find(query)
-
-            # Sort by creation date
-            cursor = cursor.sort("created_at", -1)
-
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Newest first, one page at a time
+            cursor = self.find_page(collection, query, "recipes", skip=skip, limit=limit, after=keyset)
 
             recipes = []
             for doc in cursor:
@@ -326,11 +545,157 @@ class RecipeMixin:
                     print(f"Error parsing recipe: {e}")
                     continue
 
-            return recipes
+            return self.expand_recipes(Page(recipes, cursor.next_cursor), expand)
         except Exception as e:
             print(f"Error getting recipes by tags: {e}")
             return []
 
+    def find_recipes_by_nutrition(self, min_calories: Optional[float] = None, max_calories: Optional[float] = None,
+                                  min_protein: Optional[float] = None, max_carbs: Optional[float] = None,
+                                  max_total_time: Optional[int] = None, difficulty: Optional[str] = None,
+                                  tags: Optional[List[str]] = None, sort: str = "calories", skip: int = 0,
+                                  limit: Optional[int] = 20, after: Optional[str] = None,
+                                  expand: Optional[Union[str, Iterable[str]]] = None) -> List[Type.Recipe]:
+        """Find recipes by per-serving nutrition ranges (e.g. high protein under 500 kcal).
+
+        Filters on the stored per-serving values, so recipes whose nutrition was
+        never computed are left out. The range and sort fields are covered by
+        the calories_page/protein_page indexes, and by the
+        difficulty/tag_ids-prefixed ones when those filters are set.
+
+        Args:
+            min_calories: Lowest calories per serving
+            max_calories: Highest calories per serving
+            min_protein: Lowest protein per serving (g)
+            max_carbs: Highest carbs per serving (g)
+            max_total_time: Longest prep + cook time in minutes
+            difficulty: Filter by difficulty level
+            tags: Filter by tag names (or slugs); unknown tags are ignored
+            sort: "calories" (lowest first) or "protein" (highest first)
+            skip: Number of recipes to skip for pagination (default: 0)
+            limit: Maximum number of recipes to return (default: 20, None for no limit)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
+
+        Returns:
+            List of matching Recipe instances
+
+        Raises:
+            ValueError: If sort is unknown, a range is empty or the cursor is invalid
+        """
+        listing = self.NUTRITION_SORTS.get(sort)
+        if listing is None:
+            raise ValueError(f"Invalid sort '{sort}' (expected one of: {', '.join(self.NUTRITION_SORTS)})")
+        if min_calories is not None and max_calories is not None and min_calories > max_calories:
+            raise ValueError("min_calories must not be greater than max_calories")
+        expand = self.parse_recipe_expand(expand)
+        keyset = self.decode_page_cursor(after, listing) if after else None
+
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return []
+
+            filters = self._resolve_recipe_filters(difficulty=difficulty, tags=tags)
+            query = self._recipe_search_query(None, filters)
+
+            calories: Dict[str, Any] = {"$ne": None}
+            if min_calories is not None:
+                calories["$gte"] = min_calories
+            if max_calories is not None:
+                calories["$lte"] = max_calories
+            query["calories_per_serving_stored"] = calories
+
+            if min_protein is not None:
+                query["protein_per_serving_stored"] = {"$gte": min_protein}
+            elif sort == "protein":
+                query["protein_per_serving_stored"] = {"$ne": None}
+            if max_carbs is not None:
+                query["carbs_per_serving_stored"] = {"$lte": max_carbs}
+
+            if max_total_time is not None:
+                # prep_time bounds the scan (cook time is never negative); the sum is checked per document
+                query["prep_time_minutes"] = {"$lte": max_total_time}
+                query["$expr"] = {"$lte": [{"$add": ["$prep_time_minutes", {"$ifNull": ["$cook_time_minutes", 0]}]},
+                                           max_total_time]}
+
+            cursor = self.find_page(db["recipes"], query, listing, skip=skip, limit=limit, after=keyset)
+
+            recipes = []
+            for doc in cursor:
+                if '_id' in doc:
+                    del doc['_id']
+                try:
+                    recipes.append(Type.Recipe.from_dict(doc))
+                except Exception as e:
+                    print(f"Error parsing recipe: {e}")
+                    continue
+
+            return self.expand_recipes(Page(recipes, cursor.next_cursor), expand)
+        except Exception as e:
+            print(f"Error finding recipes by nutrition: {e}")
+            return []
+
+    def recompute_recipe_nutrition(self, batch_size: int = 1000, only_missing: bool = False) -> Dict[str, int]:
+        """Recompute the stored nutrition fields of every recipe from its ingredients.
+
+        Ingredient lines use the current ingredient record (matched by
+        ingredient_id) and fall back to the copy embedded in the recipe.
+        Recipes are processed batch_size at a time: each batch is computed in
+        one NutritionBatch pass and written with one unordered bulk_write that
+        only touches recipes whose values changed.
+
+        Args:
+            batch_size: Recipes per computation and bulk write
+            only_missing: Only recompute recipes without stored calories
+
+        Returns:
+            Dictionary with the number of recipes processed, recipes updated,
+            recipe updates that failed and ingredient lines skipped for lack of
+            a gram conversion
+        """
+        stats = {"processed": 0, "updated": 0, "failed": 0, "unconverted_ingredients": 0}
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return stats
+
+            ingredient_projection = {"_id": 0, "id": 1, "grams_per_unit": 1, "density_g_per_ml": 1}
+            ingredient_projection.update({field: 1 for field in NUTRIENT_FIELDS})
+            ingredients_by_id = {str(doc["id"]): doc
+                                 for doc in db["ingredients"].find({"id": {"$ne": None}}, ingredient_projection)}
+
+            query = {"calories_per_serving_stored": None} if only_missing else {}
+            recipe_projection = {"_id": 1, "servings": 1, "ingredients": 1}
+            recipe_projection.update({field: 1 for field in STORED_FIELDS.values()})
+            cursor = db["recipes"].find(query, recipe_projection, batch_size=batch_size)
+
+            while True:
+                docs = list(islice(cursor, batch_size))
+                if not docs:
+                    break
+
+                batch = NutritionBatch()
+                for doc in docs:
+                    batch.add_recipe(doc.get("ingredients") or [], doc.get("servings") or 0, ingredients_by_id)
+
+                updates = []
+                for doc, result in zip(docs, batch.compute()):
+                    stats["unconverted_ingredients"] += result["unconverted_ingredients"]
+                    values = stored_nutrition(result)
+                    if any(doc.get(field) != value for field, value in values.items()):
+                        updates.append(({"_id": doc["_id"]}, values))
+                if updates:
+                    written = self.update_many_documents("recipes", updates, batch_size)
+                    stats["updated"] += written["modified"]
+                    stats["failed"] += len(written["errors"])
+                stats["processed"] += len(docs)
+
+            return stats
+        except Exception as e:
+            print(f"Error recomputing recipe nutrition: {e}")
+            return stats
+
     def count_recipes(self, search_term: Optional[str] = None, category: Optional[str] = None,
                      difficulty: Optional[str] = None, tags: Optional[List[str]] = None) -> int:
         """Count recipes with optional search and filter criteria.
@@ -349,79 +714,31 @@ class RecipeMixin:
             if db is None:
                 return 0
 
-            collection = db["recipes"]
+            filters = self._resolve_recipe_filters(category, difficulty, tags)
+            if filters is None:
+                # If category not found, return 0
+                return 0
+
+            index = self.get_ready_recipe_search_index() if analyze(search_term) else None
+            if index is not None:
+                return index.search(search_term, limit=0, **filters)[1]
 
-            # Build query based on parameters
-            query = {}
-
-            if search_term:
-                # Create regex pattern for case-insensitive search
-                search_pattern = {"$regex": search_term, "$options": "i"}
-
-                # Build search query
-                query["$or"] = [
-                    {"name": search_pattern},
-                    {"description": search_pattern},
-                    {"legacy_tags": {"$elemMatch": search_pattern}},  # Search in legacy tags
-                    {"ingredients.ingredient.name": search_pattern}
-                ]
-
-            # Handle category filtering - convert category name to category_id
-            if category:
-                # Try to find the category by slug first, then by name
-                category_obj = self.get_category_by_slug(category.lower().replace(' ', '_'))
-                if not category_obj:
-                    # Try to find by name (case-insensitive)
-                    categories = self.get_all_categories()
-                    for cat in categories:
-                        if cat.name.lower() == category.lower():
-                            category_obj = cat
-                            break
-
-                if category_obj:
-                    query["category_id"] = str(category_obj.id)
-                else:
-                    # If category not found, return 0
-                    return 0
-
-            if difficulty:
-                query["difficulty"] = difficulty
-
-            # Handle tags filtering - convert tag names to tag_ids
-            if tags:
-                tag_ids = []
-                for tag_name in tags:
-                    # Try to find the tag by slug first, then by name
-                    tag_obj = self.get_tag_by_slug(tag_name.lower().replace(' ', '-'))
-                    if not tag_obj:
-                        # Try to find by name (case-insensitive)
-                        all_tags = self.get_all_tags()
-                        for tag in all_tags:
-                            if tag.name.lower() == tag_name.lower():
-                                tag_obj = tag
-                                break
-
-                    if tag_obj:
-                        tag_ids.append(str(tag_obj.id))
-
-                if tag_ids:
-                    query["tag_ids"] = {"$in": tag_ids}
-
-            return collection.count_documents(query)
+            return db["recipes"].count_documents(self._recipe_search_query(search_term, filters))
 
         except Exception as e:
             print(f"Error counting recipes: {e}")
             return 0
 
-    def get_popular_recipes(self, limit: int = 10) -> List[Type.Recipe]:
+    def get_popular_recipes(self, limit: int = 10, expand: Optional[Union[str, Iterable[str]]] = None) -> List[Type.Recipe]:
         """Get popular recipes (could be based on usage, ratings, etc.).
 
         Args:
             limit: Maximum number of recipes to return
+            expand: Related objects to populate: "category", "tags" (list or comma-separated)
 
         Returns:
             List of popular Recipe instances
         """
         # For now, return most recently created recipes as a proxy for popularity
         # In the future, this could be based on actual usage statistics
-        return self.get_all_recipes(limit=limit)
\ No newline at end of file
+        return self.get_all_recipes(limit=limit, expand=expand)
\ No newline at end of file
@@ -2,12 +2,36 @@ from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
 from uuid import UUID
 from datetime import datetime, date
 
+from pymongo import IndexModel, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+
 from ... import types as Type
+from ..mongo import get_bulk_batch_size
+from .daily_rollups import ROLLUP_NUTRIENT_FIELDS, meal_nutrient_totals
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
 class UserMixin:
     """Mixin class that provides user-related MongoDB operations."""
+
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "users": [
+            IndexModel([("user_id", ASCENDING)], name="user_id"),
+            IndexModel([("email", ASCENDING)], name="email"),
+            IndexModel([("favorite_recipe_ids", ASCENDING)], name="favorite_recipe_ids"),
+        ],
+        "daily_logs": [
+            # Unique so concurrent upserts of the same day cannot create two logs
+            IndexModel([("user_id", ASCENDING), ("log_date", DESCENDING)], name="user_id_log_date", unique=True),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "users", "filter": {"email": ""}, "description": "user by email (login)"},
+        {"collection": "users", "filter": {"user_id": ""}, "description": "user by id"},
+        {"collection": "daily_logs", "filter": {"user_id": "", "log_date": ""}, "description": "daily log of a user"},
+    ]
     
     # No __init__ needed as it will use the parent class's __init__
     
@@ -34,7 +58,11 @@ class UserMixin:
         """
         try:
             query = {"user_id": str(user_id)}
-            return self.update_document("users", query, update_data)
+            updated = self.update_document("users", query, update_data)
+            if updated:
+                # Goals and preferences are shown on every day's dashboard
+                self.invalidate_dashboard(user_id)
+            return updated
         except Exception as e:
             print(f"Error updating user {user_id}: {e}")
             return False
@@ -52,8 +80,12 @@ class UserMixin:
         return self.get_document("users", query, Type.User)
     
     def add_meal_to_log(self, user_id: UUID, meal: Type.Meal) -> bool:
-        """Find the user's daily log (or create one) and append a new meal to it.
-        
+        """Append a meal to the user's daily log, creating the log if needed.
+
+        The append is one atomic upsert ($push the meal, $inc the log's
+        meal_count and nutrient totals), so concurrent requests for the same
+        user and day cannot overwrite each other's meals.
+
         Args:
             user_id: UUID of the user
             meal: Meal instance to add
@@ -62,47 +94,96 @@ class UserMixin:
             True if meal was added successfully, False otherwise
         """
         try:
-            # Get today's date
-            today = datetime.now().date()
-            
-            # First, try to find existing daily log for today
+            db = self.get_db_connection()
+            if db is None:
+                return False
+
             query = {
                 "user_id": str(user_id),
-                "log_date": today.isoformat()
+                "log_date": datetime.now().date().isoformat()
             }
-            
-            daily_log = self.get_document("daily_logs", query, Type.DailyLog)
-            
-            if daily_log:
-                # Add meal to existing log
-                daily_log.meals.append(meal)
-                update_data = daily_log.to_dict()
-                return self.update_document("daily_logs", query, update_data)
-            else:
-                # Create new daily log with the meal
-                new_log = Type.DailyLog(
-                    user_id=user_id,
-                    log_date=today,
-                    meals=[meal]
-                )
-                result = self.create_document("daily_logs", new_log)
-                return result is not None
-                
+            meal_doc = meal.to_dict()
+            increments = {f"totals.{field}": value for field, value in meal_nutrient_totals(meal_doc).items()}
+            increments["meal_count"] = 1
+            update = {"$push": {"meals": meal_doc}, "$inc": increments}
+
+            try:
+                db["daily_logs"].update_one(query, update, upsert=True)
+            except DuplicateKeyError:
+                # Another request created today's log between our match and insert; it exists now
+                db["daily_logs"].update_one(query, update, upsert=True)
+            return True
+
         except Exception as e:
             print(f"Error adding meal to log for user {user_id}: {e}")
             return False
     
-    def add_weight_entry(self, entry: Type.WeightEntry) -> Optional[Any]:
-        """Add a new weight entry for a user.
-        
-        Args:
-            entry: WeightEntry instance to add
-            
+    def migrate_daily_logs(self) -> Dict[str, int]:
+        """Migrate daily_logs written before add_meal_to_log became an atomic upsert.
+
+        Merges the meals of duplicate logs of the same user and day into the
+        oldest one and deletes the others, replaces a non-unique
+        user_id_log_date index with the declared unique one, and sets the
+        meal_count and totals of every log from its meals. Safe to re-run, but
+        run it while the backend is stopped: the backfill would overwrite
+        meals appended meanwhile.
+
         Returns:
-            The inserted_id if successful, None otherwise
+            Dictionary with the number of duplicate logs "merged" into another
+            one, of logs "backfilled" and "indexed": 1 once the unique index exists
         """
-        return self.create_document("weight_entries", entry)
-    
+        result = {"merged": 0, "backfilled": 0, "indexed": 0}
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return result
+            collection = db["daily_logs"]
+
+            # Duplicate logs of a day, oldest first
+            duplicates = collection.aggregate([
+                {"$sort": {"_id": ASCENDING}},
+                {"$group": {"_id": {"user_id": "$user_id", "log_date": "$log_date"},
+                            "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gt": 1}}},
+            ], allowDiskUse=True)
+            for group in duplicates:
+                keep, *others = group["ids"]
+                logs = {doc["_id"]: doc for doc in collection.find({"_id": {"$in": group["ids"]}}, {"meals": 1})}
+                meals, seen = [], set()
+                for log_id in group["ids"]:
+                    for meal in logs.get(log_id, {}).get("meals") or []:
+                        meal_id = meal.get("id")
+                        if meal_id is None or meal_id not in seen:
+                            seen.add(meal_id)
+                            meals.append(meal)
+                collection.update_one({"_id": keep}, {"$set": {"meals": meals}})
+                result["merged"] += collection.delete_many({"_id": {"$in": others}}).deleted_count
+
+            # An index of the same name with other options makes create_indexes fail
+            existing = collection.index_information().get("user_id_log_date")
+            if existing is not None and not existing.get("unique"):
+                collection.drop_index("user_id_log_date")
+            result["indexed"] = int("user_id_log_date" in self.ensure_indexes(["daily_logs"]).get("daily_logs", []))
+
+            # meal_count and totals, which add_meal_to_log $incs
+            batch_size = get_bulk_batch_size()
+            operations = []
+            for log in collection.find({}, {"meals": 1}):
+                totals = {field: 0 for field in ROLLUP_NUTRIENT_FIELDS}
+                for meal in log.get("meals") or []:
+                    for field, value in meal_nutrient_totals(meal).items():
+                        totals[field] += value
+                operations.append(UpdateOne({"_id": log["_id"]},
+                                            {"$set": {"meal_count": len(log.get("meals") or []), "totals": totals}}))
+                if len(operations) >= batch_size:
+                    result["backfilled"] += self.bulk_write("daily_logs", operations, batch_size)["matched"]
+                    operations = []
+            result["backfilled"] += self.bulk_write("daily_logs", operations, batch_size)["matched"]
+            return result
+        except Exception as e:
+            print(f"Error migrating daily logs: {e}")
+            return result
+
     def get_user_daily_log(self, user_id: UUID, log_date: date) -> Optional[Type.DailyLog]:
         """Get a user's daily log for a specific date.
         
@@ -156,17 +237,6 @@ class UserMixin:
             print(f"Error getting weight entries for user {user_id}: {e}")
             return []
     
-    def add_water_entry(self, entry: Type.WaterEntry) -> Optional[Any]:
-        """Add a new water entry for a user.
-        
-        Args:
-            entry: WaterEntry instance to add
-            
-        Returns:
-            The inserted_id if successful, None otherwise
-        """
-        return self.create_document("water_entries", entry)
-    
     def get_user_daily_water_log(self, user_id: UUID, log_date: date) -> Optional[Type.DailyWaterLog]:
         """Get a user's daily water log for a specific date.
         
@@ -333,7 +403,7 @@ class UserMixin:
             query = {"favorite_recipe_ids": {"$in": system_recipe_ids}}
             users_to_update = list(collection.find(query))
 
-            updated_count = 0
+            updates = []
             for user_doc in users_to_update:
                 # Get current favorite IDs
                 current_favorites = user_doc.get("favorite_recipe_ids", [])
@@ -345,11 +415,9 @@ class UserMixin:
                 if len(updated_favorites) != len(current_favorites):
                     update_query = {"user_id": user_doc["user_id"]}
                     update_data = {"favorite_recipe_ids": updated_favorites}
-                    result = collection.update_one(update_query, {"$set": update_data})
-                    if result.modified_count > 0:
-                        updated_count += 1
+                    updates.append((update_query, update_data))
 
-            return updated_count
+            return self.update_many_documents("users", updates)["modified"]
 
         except Exception as e:
             print(f"Error clearing system recipe favorites: {e}")
@@ -3,12 +3,34 @@ from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
 from uuid import UUID
 from datetime import date
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..mongo import Page
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
 class WaterMixin:
     """Mixin class that provides water-related MongoDB operations."""
+
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "water_entries": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING)], name="user_id_on_date"),
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING), ("_id", DESCENDING)], name="user_id_on_date_page"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "water_entries", "filter": {"user_id": "", "on_date": ""},
+         "description": "water entries of a user on a day"},
+    ]
+
+    # Sorts of the keyset-paginated listings (see MongoMixin.find_page)
+    PAGE_SORTS = {
+        "water_entries": [("on_date", DESCENDING), ("_id", DESCENDING)],
+    }
     
     # No __init__ needed as it will use the parent class's __init__
     
@@ -21,7 +43,10 @@ class WaterMixin:
         Returns:
             The inserted_id if successful, None otherwise
         """
-        return self.create_document("water_entries", water_entry)
+        inserted_id = self.create_document("water_entries", water_entry)
+        if inserted_id is not None:
+            self.apply_water_to_rollup(water_entry.to_dict())
+        return inserted_id
     
     def get_water_entry_by_id(self, entry_id: UUID) -> Optional[Type.WaterEntry]:
         """Retrieve a water entry by its ID.
@@ -103,7 +128,15 @@ class WaterMixin:
             True if update was successful, False otherwise
         """
         query = {"id": str(entry_id)}  # Convert UUID to string for MongoDB query
-        return self.update_document("water_entries", query, entry_data)
+
+        # Swap the amount this write replaced for the new one in the daily rollups
+        images = self.find_and_update_document("water_entries", query, entry_data)
+        if images is None or images[0] == images[1]:
+            return False
+        old_doc, new_doc = images
+        self.apply_water_to_rollup(old_doc, sign=-1)
+        self.apply_water_to_rollup(new_doc)
+        return True
     
     def delete_water_entry(self, entry_id: UUID) -> bool:
         """Delete a water entry by its ID.
@@ -115,11 +148,16 @@ class WaterMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(entry_id)}  # Convert UUID to string for MongoDB query
-        return self.delete_document("water_entries", query)
+        old_doc = self.find_and_delete_document("water_entries", query)
+        if old_doc is None:
+            return False
+        self.apply_water_to_rollup(old_doc, sign=-1)
+        return True
     
     def get_user_water_entries(self, user_id: UUID, start_date: Optional[date] = None, 
                              end_date: Optional[date] = None, 
-                             skip: int = 0, limit: Optional[int] = None) -> List[Type.WaterEntry]:
+                             skip: int = 0, limit: Optional[int] = None,
+                             after: Optional[str] = None) -> List[Type.WaterEntry]:
         """Get water entries for a user with optional date range and pagination.
         
         Args:
@@ -128,10 +166,13 @@ class WaterMixin:
             end_date: Optional end date for filtering entries (inclusive)
             skip: Number of entries to skip for pagination (default: 0)
             limit: Maximum number of entries to return (default: None for all entries)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
             
         Returns:
             List of WaterEntry instances
         """
+        keyset = self.decode_page_cursor(after, "water_entries") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -153,16 +194,8 @@ class WaterMixin:
                 if date_filter:
                     query["on_date"] = date_filter
             
-            # Find all matching entries
-            cursor = collection.find(query)
-            
-            # Sort by date (descending) and time
-            cursor = cursor.sort("on_date", -1)
-            
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Find matching entries by date (descending), one page at a time
+            cursor = self.find_page(collection, query, "water_entries", skip=skip, limit=limit, after=keyset)
             
             entries = []
             for doc in cursor:
@@ -175,21 +208,26 @@ class WaterMixin:
                     print(f"Error parsing water entry: {e}")
                     continue
                     
-            return entries
+            return Page(entries, cursor.next_cursor)
             
         except Exception as e:
             print(f"Error getting user water entries: {e}")
             return []
     
-    def get_user_water_history(self, user_id: UUID, days: int = 7) -> List[Dict[str, Any]]:
-        """Get a summary of daily water intake for a user over a number of days.
+    def get_user_water_history(self, user_id: UUID, days: int = 7,
+                               start_date: Optional[date] = None, end_date: Optional[date] = None,
+                               fill_gaps: bool = True) -> List[Dict[str, Any]]:
+        """Get a summary of daily water intake for a user over a window of days.
         
         Args:
             user_id: UUID of the user
-            days: Number of days of history to retrieve (default: 7)
+            days: Number of days of history to retrieve (default: 7), ending at end_date
+            start_date: Optional explicit first day of the window (overrides days)
+            end_date: Optional last day of the window (default: today)
+            fill_gaps: Whether to include days without entries as zero rows (default: True)
             
         Returns:
-            List of daily water intake summary dictionaries, each containing:
+            List of daily water intake summary dictionaries in chronological order, each containing:
             - date: The date (ISO format string)
             - total_ml: Total water intake in milliliters
         """
@@ -199,23 +237,25 @@ class WaterMixin:
                 return []
                 
             collection = db["water_entries"]
+
+            start_date, end_date = self._date_window(days, start_date, end_date)
             
             # Use MongoDB aggregation pipeline to group by date and sum amounts
             pipeline = [
-                # Match entries for the specific user
-                {"$match": {"user_id": str(user_id)}},
+                # Match entries for the specific user inside the date window (index range scan)
+                {"$match": {
+                    "user_id": str(user_id),
+                    "on_date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
+                }},
                 
-                # Group by date and sum the water amounts
+                # Group by date and sum the water amounts converted to milliliters
                 {"$group": {
                     "_id": "$on_date",
-                    "total_ml": {"$sum": "$amount_ml"}
+                    "total_ml": {"$sum": self._water_ml_expression()}
                 }},
                 
-                # Sort by date (descending)
-                {"$sort": {"_id": -1}},
-                
-                # Limit to specified number of days
-                {"$limit": days},
+                # Sort by date (chronological)
+                {"$sort": {"_id": 1}},
                 
                 # Project to format the output
                 {"$project": {
@@ -227,9 +267,23 @@ class WaterMixin:
             
             # Execute the aggregation pipeline
             results = list(collection.aggregate(pipeline))
-            
-            return results
+
+            if not fill_gaps:
+                return results
+
+            return self._fill_daily_series(results, start_date, end_date, lambda: {"total_ml": 0})
             
         except Exception as e:
             print(f"Error getting user water history: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def _water_ml_expression(self) -> Dict[str, Any]:
+        """Aggregation expression converting a water entry's amount/unit to milliliters."""
+        return {"$multiply": ["$amount", {"$switch": {
+            "branches": [
+                {"case": {"$eq": ["$unit", Type.WaterUnit.LITER.value]}, "then": Type._LITER_TO_ML},
+                {"case": {"$eq": ["$unit", Type.WaterUnit.OUNCE.value]}, "then": Type._OUNCE_TO_ML},
+                {"case": {"$eq": ["$unit", Type.WaterUnit.CUP.value]}, "then": Type._CUP_TO_ML}
+            ],
+            "default": 1
+        }}]}
@@ -3,12 +3,36 @@ from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List
 from uuid import UUID
 from datetime import date
 
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
 from ... import types as Type
+from ..mongo import Page
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
 class WeightMixin:
     """Mixin class that provides weight-related MongoDB operations."""
+
+    # Indexes backing the hot queries of this mixin (see MongoMixin.ensure_indexes)
+    INDEXES = {
+        "weight_entries": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING), ("created_at", DESCENDING)],
+                       name="user_id_on_date_created_at"),
+            IndexModel([("user_id", ASCENDING), ("on_date", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                       name="user_id_on_date_created_at_page"),
+        ]
+    }
+
+    HOT_QUERIES = [
+        {"collection": "weight_entries", "filter": {"user_id": ""},
+         "sort": [("on_date", -1), ("created_at", -1)], "description": "latest weight entry of a user"},
+    ]
+
+    # Sorts of the keyset-paginated listings (see MongoMixin.find_page)
+    PAGE_SORTS = {
+        "weight_entries": [("on_date", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+    }
     
     # No __init__ needed as it will use the parent class's __init__
     
@@ -21,7 +45,10 @@ class WeightMixin:
         Returns:
             The inserted_id if successful, None otherwise
         """
-        return self.create_document("weight_entries", weight_entry)
+        inserted_id = self.create_document("weight_entries", weight_entry)
+        if inserted_id is not None:
+            self.refresh_rollup_weight(weight_entry.user_id, weight_entry.on_date.isoformat())
+        return inserted_id
     
     def get_weight_entry_by_id(self, entry_id: UUID) -> Optional[Type.WeightEntry]:
         """Retrieve a weight entry by its ID.
@@ -46,7 +73,14 @@ class WeightMixin:
             True if update was successful, False otherwise
         """
         query = {"id": str(entry_id)}  # Convert UUID to string for MongoDB query
-        return self.update_document("weight_entries", query, entry_data)
+
+        # The entry may move to another day, so refresh both the old and new day
+        images = self.find_and_update_document("weight_entries", query, entry_data)
+        if images is None or images[0] == images[1]:
+            return False
+        for doc in images:
+            self.refresh_rollup_weight(doc.get("user_id"), self._rollup_date(doc))
+        return True
     
     def delete_weight_entry(self, entry_id: UUID) -> bool:
         """Delete a weight entry by its ID.
@@ -58,11 +92,16 @@ class WeightMixin:
             True if deletion was successful, False otherwise
         """
         query = {"id": str(entry_id)}  # Convert UUID to string for MongoDB query
-        return self.delete_document("weight_entries", query)
+        old_doc = self.find_and_delete_document("weight_entries", query)
+        if old_doc is None:
+            return False
+        self.refresh_rollup_weight(old_doc.get("user_id"), self._rollup_date(old_doc))
+        return True
     
     def get_user_weight_entries(self, user_id: UUID, start_date: Optional[date] = None, 
                               end_date: Optional[date] = None, 
-                              skip: int = 0, limit: Optional[int] = None) -> List[Type.WeightEntry]:
+                              skip: int = 0, limit: Optional[int] = None,
+                              after: Optional[str] = None) -> List[Type.WeightEntry]:
         """Get weight entries for a user with optional date range and pagination.
         
         Args:
@@ -71,10 +110,13 @@ class WeightMixin:
             end_date: Optional end date for filtering entries (inclusive)
             skip: Number of entries to skip for pagination (default: 0)
             limit: Maximum number of entries to return (default: None for all entries)
+            after: Cursor token from a previous page; continues right after it (overrides skip)
             
         Returns:
             List of WeightEntry instances
         """
+        keyset = self.decode_page_cursor(after, "weight_entries") if after else None
+
         try:
             db = self.get_db_connection()
             if db is None:
@@ -96,17 +138,8 @@ class WeightMixin:
                 if date_filter:
                     query["on_date"] = date_filter
             
-            # Find all matching entries
-            cursor = collection.find(query)
-
-            # Sort by date (descending), then by created_at (descending) for chronological order within same date
-            # For entries without created_at, use _id timestamp as fallback
-            cursor = cursor.sort([("on_date", -1), ("created_at", -1), ("_id", -1)])
-            
-            # Apply pagination
-            cursor = cursor.skip(skip)
-            if limit is not None:
-                cursor = cursor.limit(limit)
+            # Find matching entries by date, then created_at (both descending), one page at a time
+            cursor = self.find_page(collection, query, "weight_entries", skip=skip, limit=limit, after=keyset)
             
             entries = []
             for doc in cursor:
@@ -119,21 +152,25 @@ class WeightMixin:
                     print(f"Error parsing weight entry: {e}")
                     continue
                     
-            return entries
+            return Page(entries, cursor.next_cursor)
             
         except Exception as e:
             print(f"Error getting user weight entries: {e}")
             return []
     
-    def get_user_weight_history(self, user_id: UUID, days: int = 30) -> List[Dict[str, Any]]:
-        """Get a summary of weight entries for a user over a number of days.
+    def get_user_weight_history(self, user_id: UUID, days: int = 30,
+                                start_date: Optional[date] = None,
+                                end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Get weight entries for a user over a window of days.
         
         Args:
             user_id: UUID of the user
-            days: Number of days of history to retrieve (default: 30)
+            days: Number of days of history to retrieve (default: 30), ending at end_date
+            start_date: Optional explicit first day of the window (overrides days)
+            end_date: Optional last day of the window (default: today)
             
         Returns:
-            List of weight entry summary dictionaries, each containing:
+            List of weight entry summary dictionaries (newest first), each containing:
             - date: The date (ISO format string)
             - weight_kg: Weight value in kilograms
             - notes: Any notes attached to the entry
@@ -144,19 +181,21 @@ class WeightMixin:
                 return []
                 
             collection = db["weight_entries"]
+
+            start_date, end_date = self._date_window(days, start_date, end_date)
             
             # Use MongoDB aggregation pipeline to sort by date and get most recent entries
             pipeline = [
-                # Match entries for the specific user
-                {"$match": {"user_id": str(user_id)}},
+                # Match entries for the specific user inside the date window (index range scan)
+                {"$match": {
+                    "user_id": str(user_id),
+                    "on_date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
+                }},
 
                 # Sort by date (descending), then by created_at (descending) for chronological order within same date
                 # For entries without created_at, _id timestamp serves as fallback
                 {"$sort": {"on_date": -1, "created_at": -1, "_id": -1}},
                 
-                # Limit to specified number of days
-                {"$limit": days},
-                
                 # Project to format the output
                 {"$project": {
                     "_id": 0,
@@ -171,28 +210,21 @@ class WeightMixin:
             results = list(collection.aggregate(pipeline))
 
             # Convert weight to kg and format the results
-            formatted_results = []
-            for entry in results:
-                # Convert weight to kg based on unit
-                weight_value = entry.get('weight', 0)
-                unit = entry.get('unit', 'kg')
-
-                if unit == 'lbs':
-                    weight_kg = weight_value * _LB_TO_KG
-                else:  # kg
-                    weight_kg = weight_value
-
-                formatted_results.append({
-                    'date': entry.get('date'),
-                    'weight_kg': round(weight_kg, 2),
-                    'notes': entry.get('notes')
-                })
-
-            return formatted_results
+            return [{
+                'date': entry.get('date'),
+                'weight_kg': self._weight_to_kg(entry.get('weight', 0), entry.get('unit', 'kg')),
+                'notes': entry.get('notes')
+            } for entry in results]
             
         except Exception as e:
             print(f"Error getting user weight history: {e}")
             return []
+
+    def _weight_to_kg(self, weight_value: float, unit: str) -> float:
+        """Convert a stored weight value to kilograms, rounded to 2 decimals."""
+        if unit == Type.WeightUnit.LBS.value:
+            return round(weight_value * Type._LB_TO_KG, 2)
+        return round(weight_value, 2)
     
     def get_latest_weight_entry(self, user_id: UUID) -> Optional[Type.WeightEntry]:
         """Get the most recent weight entry for a user.
@@ -236,15 +268,24 @@ class WeightMixin:
             print(f"Error getting latest weight entry: {e}")
             return None
     
-    def get_user_weight_trend(self, user_id: UUID, period: str = "month") -> List[Dict[str, Any]]:
-        """Get weight trend data for a user over a specified period.
+    def get_user_weight_trend(self, user_id: UUID, period: str = "month", days: Optional[int] = None,
+                              start_date: Optional[date] = None, end_date: Optional[date] = None,
+                              fill_gaps: bool = True) -> List[Dict[str, Any]]:
+        """Get a daily weight series for a user over a specified period.
         
         Args:
             user_id: UUID of the user
             period: Time period for the trend ("week", "month", "year")
+            days: Optional number of days (overrides period)
+            start_date: Optional explicit first day of the window (overrides days/period)
+            end_date: Optional last day of the window (default: today)
+            fill_gaps: Whether to include days without entries with weight_kg None (default: True)
             
         Returns:
-            List of weight entries organized by the specified period for trend analysis
+            List of daily weight points in chronological order (oldest to newest), each containing:
+            - date: The date (ISO format string)
+            - weight_kg: Latest weight of that day in kilograms (None for days without entries)
+            - notes: Notes of that entry
         """
         try:
             db = self.get_db_connection()
@@ -253,63 +294,50 @@ class WeightMixin:
                 
             collection = db["weight_entries"]
             
-            # Determine the limit based on the period
-            if period == "week":
-                limit = 7
-            elif period == "month":
-                limit = 30
-            elif period == "year":
-                limit = 365
-            else:
-                limit = 30  # Default to month
+            # Determine the window based on days or the period
+            if days is None:
+                days = self._period_to_days(period)
+            start_date, end_date = self._date_window(days, start_date, end_date)
             
             # Use MongoDB aggregation pipeline
             pipeline = [
-                # Match entries for the specific user
-                {"$match": {"user_id": str(user_id)}},
+                # Match entries for the specific user inside the date window (index range scan)
+                {"$match": {
+                    "user_id": str(user_id),
+                    "on_date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
+                }},
 
-                # Sort by date (descending), then by created_at (descending) for chronological order within same date
+                # Sort chronologically so $last picks the latest entry of each day
                 # For entries without created_at, _id timestamp serves as fallback
-                {"$sort": {"on_date": -1, "created_at": -1, "_id": -1}},
+                {"$sort": {"on_date": 1, "created_at": 1, "_id": 1}},
 
-                # Limit to specified number of days
-                {"$limit": limit},
+                # Keep one point per day
+                {"$group": {
+                    "_id": "$on_date",
+                    "weight": {"$last": "$weight"},
+                    "unit": {"$last": "$unit"},
+                    "notes": {"$last": "$notes"}
+                }},
 
-                # Project to format the output
-                {"$project": {
-                    "_id": 0,
-                    "date": "$on_date",
-                    "weight": "$weight",
-                    "unit": "$unit",
-                    "notes": "$notes"
-                }}
+                # Sort by date (chronological)
+                {"$sort": {"_id": 1}}
             ]
             
             # Execute the aggregation pipeline
             results = list(collection.aggregate(pipeline))
 
             # Convert weight to kg and format the results
-            formatted_results = []
-            for entry in results:
-                # Convert weight to kg based on unit
-                weight_value = entry.get('weight', 0)
-                unit = entry.get('unit', 'kg')
-
-                if unit == 'lbs':
-                    weight_kg = weight_value * _LB_TO_KG
-                else:  # kg
-                    weight_kg = weight_value
-
-                formatted_results.append({
-                    'date': entry.get('date'),
-                    'weight_kg': round(weight_kg, 2),
-                    'notes': entry.get('notes')
-                })
+            formatted_results = [{
+                'date': entry['_id'],
+                'weight_kg': self._weight_to_kg(entry.get('weight', 0), entry.get('unit', 'kg')),
+                'notes': entry.get('notes')
+            } for entry in results]
 
-            # Reverse the results to get chronological order (oldest to newest)
-            formatted_results.reverse()
+            if not fill_gaps:
+                return formatted_results
 
-            return formatted_results
+            return self._fill_daily_series(formatted_results, start_date, end_date,
+                                           lambda: {"weight_kg": None, "notes": None})
             
         except Exception as e:
             print(f"Error getting user weight trend: {e}")
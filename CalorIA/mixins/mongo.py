@@ -1,14 +1,207 @@
 import pymongo
+import pymongo.errors
 import os
 import re
-from typing import Optional, Type as TypingType, TypeVar, Any, Dict
+import base64
+import binascii
+import copy
+import threading
+from typing import Optional, Type as TypingType, TypeVar, Any, Dict, List, Tuple
 from uuid import UUID
 from datetime import datetime, date
 
+from bson import json_util
+
 from .. import types as Type
 
 T = TypeVar('T', bound=Type.CalorIAModel)
 
+# Process-wide registry of MongoClient instances keyed by URI.
+# pymongo clients are thread-safe and maintain their own connection pool,
+# so every Client (one per Flask app context) shares the same pooled client
+# instead of paying for a new handshake and topology discovery per request.
+_mongo_clients: Dict[str, pymongo.MongoClient] = {}
+_mongo_clients_lock = threading.Lock()
+
+
+def get_mongo_client_options() -> Dict[str, Any]:
+    """Build MongoClient pool/timeout options from environment variables.
+
+    Supported variables (all optional):
+        MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE, MONGODB_MAX_IDLE_TIME_MS,
+        MONGODB_CONNECT_TIMEOUT_MS, MONGODB_SOCKET_TIMEOUT_MS,
+        MONGODB_SERVER_SELECTION_TIMEOUT_MS, MONGODB_WAIT_QUEUE_TIMEOUT_MS
+
+    Returns:
+        Dictionary of keyword arguments for pymongo.MongoClient
+    """
+    env_options = {
+        'maxPoolSize': ('MONGODB_MAX_POOL_SIZE', 100),
+        'minPoolSize': ('MONGODB_MIN_POOL_SIZE', 0),
+        'maxIdleTimeMS': ('MONGODB_MAX_IDLE_TIME_MS', 300000),
+        'connectTimeoutMS': ('MONGODB_CONNECT_TIMEOUT_MS', 10000),
+        'socketTimeoutMS': ('MONGODB_SOCKET_TIMEOUT_MS', None),
+        'serverSelectionTimeoutMS': ('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 10000),
+        'waitQueueTimeoutMS': ('MONGODB_WAIT_QUEUE_TIMEOUT_MS', None),
+    }
+
+    options = {}
+    for option_name, (env_name, default) in env_options.items():
+        value = os.getenv(env_name)
+        if value is not None and value.strip() != '':
+            try:
+                options[option_name] = int(value)
+            except ValueError:
+                print(f"Ignoring invalid value for {env_name}: {value}")
+                if default is not None:
+                    options[option_name] = default
+        elif default is not None:
+            options[option_name] = default
+    return options
+
+
+def get_mongo_client(mongo_uri: Optional[str] = None) -> pymongo.MongoClient:
+    """Return the shared MongoClient for a URI, creating it on first use.
+
+    Args:
+        mongo_uri: MongoDB connection string (defaults to MONGODB_URI)
+
+    Returns:
+        Pooled pymongo.MongoClient shared across requests and threads
+    """
+    if mongo_uri is None:
+        mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/caloria')
+
+    client = _mongo_clients.get(mongo_uri)
+    if client is not None:
+        return client
+
+    with _mongo_clients_lock:
+        # Another thread may have created the client while we waited for the lock
+        client = _mongo_clients.get(mongo_uri)
+        if client is None:
+            client = pymongo.MongoClient(mongo_uri, **get_mongo_client_options())
+            _mongo_clients[mongo_uri] = client
+    return client
+
+
+def close_mongo_clients() -> None:
+    """Close every pooled MongoClient. Safe to call more than once (e.g. at shutdown)."""
+    with _mongo_clients_lock:
+        clients = list(_mongo_clients.values())
+        _mongo_clients.clear()
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"Error closing MongoDB client: {e}")
+
+
+def _forget_mongo_clients_after_fork() -> None:
+    """Drop the clients inherited from the parent process (MongoClient is not fork-safe)."""
+    global _mongo_clients_lock
+    _mongo_clients.clear()
+    _mongo_clients_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    # Forked server workers (e.g. gunicorn with preload) open their own pools on first use
+    os.register_at_fork(after_in_child=_forget_mongo_clients_after_fork)
+
+
+# Operations sent to MongoDB per bulk_write/insert_many call by the bulk helpers
+DEFAULT_BULK_BATCH_SIZE = 1000
+
+
+def get_bulk_batch_size() -> int:
+    """Chunk size of the bulk write helpers (env CALORIA_BULK_BATCH_SIZE, default 1000)."""
+    value = os.getenv('CALORIA_BULK_BATCH_SIZE')
+    if value is not None and value.strip() != '':
+        try:
+            if int(value) > 0:
+                return int(value)
+        except ValueError:
+            pass
+        print(f"Ignoring invalid value for CALORIA_BULK_BATCH_SIZE: {value}")
+    return DEFAULT_BULK_BATCH_SIZE
+
+
+# How find_page_with_total counts the matches of a paginated listing
+COUNT_MODES = ("exact", "estimated", "capped")
+DEFAULT_COUNT_CAP = 10000
+
+
+def check_count_mode(count: str) -> None:
+    """Raise ValueError if `count` is not one of COUNT_MODES."""
+    if count not in COUNT_MODES:
+        raise ValueError(f"Invalid count mode '{count}' (expected one of: {', '.join(COUNT_MODES)})")
+
+
+def encode_cursor_values(values: List[Any]) -> str:
+    """Encode the position of a page's last item as an opaque, URL-safe cursor token."""
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor_values(token: str) -> List[Any]:
+    """Decode a token made by encode_cursor_values.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+class Page(list):
+    """A page of models from a paginated read, carrying the cursor of the following page."""
+
+    def __init__(self, items: Any = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+class PageCursor:
+    """Iterates a paginated find and remembers where the page ended.
+
+    The cursor token is built from the stored document, not from the parsed
+    model, so fields missing in old documents (filled with defaults by the
+    model) still point at the right position.
+    """
+
+    def __init__(self, cursor: Any, sort: List[Tuple[str, int]], limit: Optional[int]):
+        self._cursor = cursor
+        self._sort = sort
+        self._limit = limit
+        self._count = 0
+        self._last_values: Optional[List[Any]] = None
+
+    def __iter__(self):
+        for doc in self._cursor:
+            self._count += 1
+            self._last_values = [self._get_path(doc, field) for field, _ in self._sort]
+            yield doc
+
+    @staticmethod
+    def _get_path(doc: Dict[str, Any], field: str) -> Any:
+        value: Any = doc
+        for part in field.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        """Opaque token for the following page, or None when this page was the last one."""
+        if self._limit is None or self._count < self._limit or self._last_values is None:
+            return None
+        return encode_cursor_values(self._last_values)
+
+
 class MongoMixin:
     """Mixin class that provides MongoDB operations and connection management."""
     
@@ -17,11 +210,10 @@ class MongoMixin:
         super().__init__(**kwargs)
     
     def get_db_connection(self):
-        """Get MongoDB connection using environment variable"""
+        """Get MongoDB connection from the shared, pooled client"""
         if self._db is None:
             try:
-                mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/caloria')
-                client = pymongo.MongoClient(mongo_uri)
+                client = get_mongo_client()
                 self._db = client.caloria
             except Exception as e:
                 print(f"Database connection error: {e}")
@@ -80,6 +272,65 @@ class MongoMixin:
             print(f"Error getting document from {collection_name}: {e}")
             return None
     
+    def find_and_update_document(self, collection_name: str, query: Dict[str, Any],
+                                 update_data: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Update a document and return it as it was before and after this write.
+
+        The before image comes from the write itself (find_one_and_update), so
+        concurrent updates of the same document each get the state their own
+        update replaced; the after image is that state with update_data applied.
+
+        Args:
+            collection_name: Name of the MongoDB collection
+            query: MongoDB query dict to find document
+            update_data: Data to update (will be wrapped in $set)
+
+        Returns:
+            (before, after) raw document dicts without _id, or None if no document
+            matched or the update failed
+        """
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return None
+
+            before = db[collection_name].find_one_and_update(query, {"$set": update_data}, projection={"_id": 0},
+                                                             return_document=pymongo.ReturnDocument.BEFORE)
+            if before is None:
+                return None
+            after = copy.deepcopy(before)
+            for path, value in update_data.items():
+                *parents, field = path.split(".")
+                target = after
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[field] = value
+            return before, after
+        except Exception as e:
+            print(f"Error updating document in {collection_name}: {e}")
+            return None
+
+    def find_and_delete_document(self, collection_name: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Delete a document and return it as it was deleted (find_one_and_delete).
+
+        Args:
+            collection_name: Name of the MongoDB collection
+            query: MongoDB query dict to find document to delete
+
+        Returns:
+            The deleted raw document dict without _id, or None if no document
+            matched or the deletion failed
+        """
+        try:
+            db = self.get_db_connection()
+            if db is None:
+                return None
+
+            return db[collection_name].find_one_and_delete(query, projection={"_id": 0})
+        except Exception as e:
+            print(f"Error deleting document from {collection_name}: {e}")
+            return None
+    
     def update_document(self, collection_name: str, query: Dict[str, Any], update_data: Dict[str, Any]) -> bool:
         """Update a document in the specified collection.
         
@@ -123,4 +374,429 @@ class MongoMixin:
             return result.deleted_count > 0
         except Exception as e:
             print(f"Error deleting document from {collection_name}: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    # Bulk writes
+    def bulk_write(self, collection_name: str, operations: List[Any],
+                   batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Run write operations as unordered bulk writes, in chunks.
+
+        A failing operation does not stop the others, in its chunk or later
+        ones. Errors are reported per operation instead of raised.
+
+        Args:
+            collection_name: Name of the MongoDB collection
+            operations: pymongo write operations (InsertOne, UpdateOne, ReplaceOne, DeleteOne, ...)
+            batch_size: Operations per bulk_write call (default: get_bulk_batch_size())
+
+        Returns:
+            Dictionary with the "inserted", "matched", "modified", "upserted" and
+            "deleted" counts, and "errors": one {"index", "code", "message"} per
+            failed operation, index being its position in `operations`
+        """
+        result: Dict[str, Any] = {"inserted": 0, "matched": 0, "modified": 0, "upserted": 0, "deleted": 0,
+                                  "errors": []}
+        if not operations:
+            return result
+        batch_size = batch_size or get_bulk_batch_size()
+
+        db = self.get_db_connection()
+        if db is None:
+            result["errors"] = [{"index": i, "code": None, "message": "Database connection unavailable"}
+                                for i in range(len(operations))]
+            return result
+
+        collection = db[collection_name]
+        for start in range(0, len(operations), batch_size):
+            chunk = operations[start:start + batch_size]
+            try:
+                written = collection.bulk_write(chunk, ordered=False)
+                counts = (written.inserted_count, written.matched_count, written.modified_count,
+                          written.upserted_count, written.deleted_count)
+            except pymongo.errors.BulkWriteError as e:
+                details = e.details
+                counts = (details.get("nInserted", 0), details.get("nMatched", 0), details.get("nModified", 0),
+                          details.get("nUpserted", 0), details.get("nRemoved", 0))
+                result["errors"].extend({"index": start + error["index"], "code": error.get("code"),
+                                         "message": error.get("errmsg", "Write failed")}
+                                        for error in details.get("writeErrors", []))
+            except Exception as e:
+                # The whole chunk is unaccounted for (e.g. connection lost)
+                print(f"Error bulk writing to {collection_name}: {e}")
+                counts = (0, 0, 0, 0, 0)
+                result["errors"].extend({"index": start + i, "code": None, "message": str(e)}
+                                        for i in range(len(chunk)))
+            for key, count in zip(("inserted", "matched", "modified", "upserted", "deleted"), counts):
+                result[key] += count
+        return result
+
+    @staticmethod
+    def _bulk_doc(doc: Any) -> Dict[str, Any]:
+        return doc.to_dict() if isinstance(doc, Type.CalorIAModel) else doc
+
+    def create_documents(self, collection_name: str, docs: List[Any],
+                         batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert many documents with unordered, chunked bulk writes (bulk create_document).
+
+        Args:
+            collection_name: Name of the MongoDB collection
+            docs: Pydantic model instances (or already serialized documents)
+            batch_size: Documents per bulk_write call (default: get_bulk_batch_size())
+
+        Returns:
+            bulk_write's result plus "inserted_ids": the _id of every document in
+            input order, None for the ones that failed
+        """
+        doc_dicts = [self._bulk_doc(doc) for doc in docs]
+        result = self.bulk_write(collection_name, [pymongo.InsertOne(doc) for doc in doc_dicts], batch_size)
+        failed = {error["index"] for error in result["errors"]}
+        result["inserted_ids"] = [None if i in failed else doc.get("_id") for i, doc in enumerate(doc_dicts)]
+        return result
+
+    def upsert_documents(self, collection_name: str, docs: List[Any], key: Any = "id",
+                         batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert or update many documents, matched on their key field(s).
+
+        Existing documents get the model's fields $set, so fields stored
+        outside the model are kept (same semantics as update_document).
+
+        Args:
+            collection_name: Name of the MongoDB collection
+            docs: Pydantic model instances (or already serialized documents)
+            key: Field name, or tuple of field names, identifying a document
+            batch_size: Documents per bulk_write call (default: get_bulk_batch_size())
+
+        Returns:
+            bulk_write's result
+        """
+        key_fields = (key,) if isinstance(key, str) else tuple(key)
+        operations = []
+        for doc in docs:
+            doc_dict = self._bulk_doc(doc)
+            query = {field: doc_dict.get(field) for field in key_fields}
+            operations.append(pymongo.UpdateOne(query, {"$set": doc_dict}, upsert=True))
+        return self.bulk_write(collection_name, operations, batch_size)
+
+    def update_many_documents(self, collection_name: str, updates: List[Tuple[Dict[str, Any], Any]],
+                              batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Update many documents, each with its own query (bulk update_document).
+
+        Args:
+            collection_name: Name of the MongoDB collection
+            updates: (query, update data) pairs; the data (dict or model) is wrapped in $set
+            batch_size: Updates per bulk_write call (default: get_bulk_batch_size())
+
+        Returns:
+            bulk_write's result
+        """
+        operations = [pymongo.UpdateOne(query, {"$set": self._bulk_doc(update_data)}) for query, update_data in updates]
+        return self.bulk_write(collection_name, operations, batch_size)
+
+    # Index management
+    def get_index_registry(self) -> Dict[str, List[pymongo.IndexModel]]:
+        """Collect the INDEXES declared by every mixin of this client.
+
+        Each mixin may declare a class attribute ``INDEXES`` mapping a collection
+        name to a list of pymongo.IndexModel instances backing its hot queries.
+
+        Returns:
+            Dictionary mapping collection name to its declared IndexModels
+        """
+        registry: Dict[str, List[pymongo.IndexModel]] = {}
+        seen = set()
+        for cls in type(self).__mro__:
+            for collection_name, indexes in vars(cls).get('INDEXES', {}).items():
+                for index in indexes:
+                    key = (collection_name, index.document['name'])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    registry.setdefault(collection_name, []).append(index)
+        return registry
+
+    def get_hot_queries(self) -> List[Dict[str, Any]]:
+        """Collect the HOT_QUERIES declared by every mixin of this client.
+
+        Each entry is a dict with ``collection``, ``filter``, optional ``sort``
+        and a human readable ``description``.
+
+        Returns:
+            List of hot query descriptions
+        """
+        queries = []
+        for cls in type(self).__mro__:
+            queries.extend(vars(cls).get('HOT_QUERIES', []))
+        return queries
+
+    def ensure_indexes(self, collections: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Create every declared index that does not exist yet.
+
+        Args:
+            collections: Optional list of collection names to restrict to
+
+        Returns:
+            Dictionary mapping collection name to the index names ensured
+        """
+        results: Dict[str, List[str]] = {}
+        db = self.get_db_connection()
+        if db is None:
+            return results
+
+        for collection_name, indexes in self.get_index_registry().items():
+            if collections and collection_name not in collections:
+                continue
+            try:
+                results[collection_name] = db[collection_name].create_indexes(indexes)
+            except Exception as e:
+                print(f"Error creating indexes on {collection_name}: {e}")
+                results[collection_name] = []
+        return results
+
+    def find_missing_indexes(self) -> Dict[str, List[str]]:
+        """Compare the declared indexes with the ones present in the database.
+
+        Indexes are matched by key specification, so an equivalent index created
+        under a different name is not reported as missing.
+
+        Returns:
+            Dictionary mapping collection name to the missing index names
+        """
+        missing: Dict[str, List[str]] = {}
+        db = self.get_db_connection()
+        if db is None:
+            return missing
+
+        for collection_name, indexes in self.get_index_registry().items():
+            try:
+                existing = db[collection_name].index_information()
+            except Exception as e:
+                print(f"Error reading indexes of {collection_name}: {e}")
+                existing = {}
+            existing_keys = {tuple(tuple(k) for k in info['key']) for info in existing.values()}
+
+            for index in indexes:
+                index_key = tuple((field, direction) for field, direction in index.document['key'].items())
+                if index_key not in existing_keys:
+                    missing.setdefault(collection_name, []).append(index.document['name'])
+        return missing
+
+    def explain_hot_queries(self) -> List[Dict[str, Any]]:
+        """Run explain() on every declared hot query and summarize the winning plan.
+
+        Returns:
+            List of dicts with collection, description, stage (IXSCAN/COLLSCAN/...)
+            and index_name (None when no index is used)
+        """
+        report = []
+        db = self.get_db_connection()
+        if db is None:
+            return report
+
+        for hot_query in self.get_hot_queries():
+            entry = {
+                "collection": hot_query["collection"],
+                "description": hot_query.get("description", ""),
+                "stage": None,
+                "index_name": None
+            }
+            try:
+                cursor = db[hot_query["collection"]].find(hot_query["filter"])
+                if hot_query.get("sort"):
+                    cursor = cursor.sort(hot_query["sort"])
+                plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+                # Slot-based engine wraps the classic plan in "queryPlan"
+                plan = plan.get("queryPlan", plan)
+                stages = []
+                while plan:
+                    stages.append(plan)
+                    plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+                scan = next((s for s in stages if s.get("stage") in ("IXSCAN", "COLLSCAN", "IDHACK", "COUNT_SCAN")), None)
+                if scan is not None:
+                    entry["stage"] = scan.get("stage")
+                    entry["index_name"] = scan.get("indexName")
+                elif stages:
+                    entry["stage"] = stages[-1].get("stage")
+            except Exception as e:
+                entry["stage"] = f"error: {e}"
+            report.append(entry)
+        return report
+
+    def check_indexes(self, explain: bool = False) -> bool:
+        """Print a report of missing indexes (and optionally hot query plans).
+
+        Args:
+            explain: Whether to also explain the declared hot queries
+
+        Returns:
+            True if every declared index exists, False otherwise
+        """
+        missing = self.find_missing_indexes()
+        if missing:
+            for collection_name, index_names in missing.items():
+                print(f"⚠️  Missing indexes on {collection_name}: {', '.join(index_names)}")
+            print("💡 Run 'caloria db ensure-indexes' to create them.")
+        else:
+            print("✅ All declared indexes are present")
+
+        if explain:
+            for entry in self.explain_hot_queries():
+                index_info = f" ({entry['index_name']})" if entry["index_name"] else ""
+                print(f"   • {entry['collection']}: {entry['description']} -> {entry['stage']}{index_info}")
+
+        return not missing
+
+    # Keyset (cursor) pagination
+    def get_page_sort(self, listing: str) -> List[Tuple[str, int]]:
+        """Get the sort of a paginated listing declared in a mixin's PAGE_SORTS.
+
+        Each mixin may declare a class attribute ``PAGE_SORTS`` mapping a listing
+        name to its sort. The sort must end with a unique field ("_id") so every
+        document has a distinct position, which is what a cursor points at.
+
+        Args:
+            listing: Name of the listing (e.g. "recipes")
+
+        Returns:
+            List of (field, direction) pairs
+        """
+        for cls in type(self).__mro__:
+            sort = vars(cls).get('PAGE_SORTS', {}).get(listing)
+            if sort is not None:
+                return list(sort)
+        raise KeyError(f"No page sort declared for listing '{listing}'")
+
+    def decode_page_cursor(self, token: str, listing: str) -> List[Any]:
+        """Decode a cursor token (a page's next_cursor) of a listing.
+
+        Raises:
+            ValueError: If the token is malformed or was not issued for the listing's sort
+        """
+        values = decode_cursor_values(token)
+        if len(values) != len(self.get_page_sort(listing)):
+            raise ValueError("Invalid pagination cursor")
+        return values
+
+    def get_next_page_cursor(self, items: List[Any]) -> Optional[str]:
+        """Get the cursor of the page following `items` (None on the last page or for plain lists)."""
+        return getattr(items, 'next_cursor', None)
+
+    def find_page(self, collection: Any, query: Dict[str, Any], listing: str, skip: int = 0,
+                  limit: Optional[int] = None, after: Optional[List[Any]] = None) -> "PageCursor":
+        """Run a paginated find in the listing's sort order.
+
+        With `after` (decoded cursor values) the page starts right after that
+        position through an index range on the sort fields, so deep pages cost
+        the same as the first one. Without it `skip` is applied, for clients
+        still paging by offset.
+
+        Args:
+            collection: pymongo collection to query
+            query: Filter of the listing
+            listing: Name of the listing (see get_page_sort)
+            skip: Number of documents to skip (ignored when `after` is given)
+            limit: Maximum number of documents to return
+            after: Values decoded from a cursor token
+
+        Returns:
+            PageCursor over the raw documents; wrap the parsed models in
+            Page(models, cursor.next_cursor)
+        """
+        sort = self.get_page_sort(listing)
+        if after is not None:
+            keyset = self._keyset_filter(sort, after)
+            query = {"$and": [query, keyset]} if query else keyset
+
+        cursor = collection.find(query).sort(sort)
+        if skip and after is None:
+            cursor = cursor.skip(skip)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return PageCursor(cursor, sort, limit)
+
+    def find_page_with_total(self, collection: Any, query: Dict[str, Any], listing: str, skip: int = 0,
+                             limit: Optional[int] = None, after: Optional[List[Any]] = None,
+                             count: str = "exact", count_cap: int = DEFAULT_COUNT_CAP) -> Tuple["PageCursor", int, bool]:
+        """Run a paginated find together with the total count of its filter.
+
+        A filter with a $regex cannot use an index, so on a first or offset
+        page it is matched once, in a single $match -> $facet {items, total}
+        aggregation, instead of scanning once for the page and once more for
+        the count. Unfiltered (or otherwise indexable) listings and keyset
+        pages come from find_page, served by the listing's sort index, plus a
+        separate count. The count modes are:
+
+        - "exact": count every match
+        - "estimated": without a filter, read the collection size from its
+          metadata; with an indexable filter, count like "capped"; with a
+          regex filter, count every match (the $facet visits them anyway)
+        - "capped": stop counting at `count_cap` matches
+
+        Args:
+            collection: pymongo collection to query
+            query: Filter of the listing
+            listing: Name of the listing (see get_page_sort)
+            skip: Number of documents to skip (ignored when `after` is given)
+            limit: Maximum number of documents to return
+            after: Values decoded from a cursor token
+            count: One of COUNT_MODES
+            count_cap: Highest total counted in "capped" mode (and "estimated" with an indexable filter)
+
+        Returns:
+            Tuple of the PageCursor over the raw documents, the total and
+            whether the total is exact
+        """
+        check_count_mode(count)
+
+        if after is None and self._has_regex(query):
+            sort = self.get_page_sort(listing)
+            items_pipeline: List[Dict[str, Any]] = [{"$sort": dict(sort)}]
+            if skip:
+                items_pipeline.append({"$skip": skip})
+            if limit is not None:
+                items_pipeline.append({"$limit": limit})
+
+            total_pipeline: List[Dict[str, Any]] = [{"$count": "total"}]
+            if count == "capped":
+                total_pipeline.insert(0, {"$limit": count_cap})
+
+            pipeline = [{"$match": query}, {"$facet": {"items": items_pipeline, "total": total_pipeline}}]
+            result = next(collection.aggregate(pipeline, allowDiskUse=True), {"items": [], "total": []})
+            total = result["total"][0]["total"] if result["total"] else 0
+            return PageCursor(result["items"], sort, limit), total, count != "capped" or total < count_cap
+
+        cursor = self.find_page(collection, query, listing, skip=skip, limit=limit, after=after)
+        if count == "exact":
+            return cursor, collection.count_documents(query), True
+        if count == "estimated" and not query:
+            return cursor, collection.estimated_document_count(), False
+        total = collection.count_documents(query, limit=count_cap)
+        return cursor, total, total < count_cap
+
+    @classmethod
+    def _has_regex(cls, value: Any) -> bool:
+        """Whether a filter contains a $regex (or compiled pattern) condition."""
+        if isinstance(value, dict):
+            return "$regex" in value or any(cls._has_regex(item) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return any(cls._has_regex(item) for item in value)
+        return isinstance(value, re.Pattern)
+
+    def _keyset_filter(self, sort: List[Tuple[str, int]], values: List[Any]) -> Dict[str, Any]:
+        """Filter matching the documents positioned after `values` in `sort` order.
+
+        MongoDB sorts null/missing values first, so in descending order the
+        documents after a value include the null ones, and nothing comes after
+        a null.
+        """
+        clauses = []
+        for i, (field, direction) in enumerate(sort):
+            clause = {prefix_field: prefix_value for (prefix_field, _), prefix_value in zip(sort[:i], values[:i])}
+            value = values[i]
+            if direction == pymongo.ASCENDING:
+                clause[field] = {"$ne": None} if value is None else {"$gt": value}
+            elif value is None:
+                continue
+            else:
+                clause["$or"] = [{field: {"$lt": value}}, {field: None}]
+            clauses.append(clause)
+        return {"$or": clauses} if clauses else {"_id": {"$in": []}}
@@ -0,0 +1,194 @@
+import math
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .. import types as Type
+
+# Per-100g ingredient fields, in the column order of the density matrix
+NUTRIENT_FIELDS = ("kcal_per_100g", "protein_per_100g", "fat_per_100g", "carbs_per_100g")
+
+# Result keys (same as DatabaseSeeder.calculate_recipe_nutrition) and the Recipe fields they are stored in
+PER_SERVING_KEYS = ("calories_per_serving", "protein_per_serving", "fat_per_serving", "carbs_per_serving")
+TOTAL_KEYS = ("total_calories", "total_protein", "total_fat", "total_carbs")
+STORED_FIELDS = {key: f"{key}_stored" for key in PER_SERVING_KEYS + TOTAL_KEYS}
+
+# Gram factor rows follow Type.UNIT_INDEX; the extra last column (NaN) takes unknown units
+_UNIT_COLUMNS = len(Type.IngredientUnit) + 1
+_UNKNOWN_UNIT = _UNIT_COLUMNS - 1
+
+
+def _field(ingredient: Any, name: str) -> Any:
+    if isinstance(ingredient, dict):
+        return ingredient.get(name)
+    return getattr(ingredient, name, None)
+
+
+def unit_gram_factors(ingredient: Any) -> Tuple[float, ...]:
+    """Gram factor row of an ingredient: Type.gram_factors plus the unknown-unit column.
+
+    Args:
+        ingredient: Ingredient model or stored ingredient document
+
+    Returns:
+        Tuple of gram factors, NaN where the ingredient cannot be converted
+        (e.g. "unit" without grams_per_unit)
+    """
+    return Type.gram_factors(_field(ingredient, "density_g_per_ml"), _field(ingredient, "grams_per_unit")) + (math.nan,)
+
+
+class NutritionBatch:
+    """Calories and macros of many recipes, computed together.
+
+    Every distinct ingredient becomes one row of a gram factor matrix (per
+    unit) and a nutrient density matrix (per 100g); every recipe line is a
+    (recipe, row, unit, amount) entry. compute() then needs a handful of
+    vectorized NumPy operations for the whole batch (a flat loop when NumPy is
+    not installed). Lines whose amount cannot be converted to grams contribute
+    nothing and are counted per recipe.
+    """
+
+    def __init__(self):
+        self._rows: Dict[Any, int] = {}
+        self._objects: List[Any] = []
+        self._factors: List[Tuple[float, ...]] = []
+        self._densities: List[Tuple[float, ...]] = []
+        self._line_recipes: List[int] = []
+        self._line_rows: List[int] = []
+        self._line_units: List[int] = []
+        self._line_amounts: List[float] = []
+        self._servings: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._servings)
+
+    def add_ingredient(self, ingredient: Any, key: Any = None) -> int:
+        """Register an ingredient and get its row (ingredients added with the same key share one row).
+
+        Args:
+            ingredient: Ingredient model or stored ingredient document
+            key: Identity of the ingredient, e.g. its id (default: the object itself, so
+                lines sharing one Ingredient instance share its row)
+
+        Returns:
+            Row of the ingredient
+        """
+        if key is None:
+            key = ("object", id(ingredient))
+        row = self._rows.get(key)
+        if row is None:
+            if key[0] == "object":
+                # Keep the object alive so its id() cannot be reused by another ingredient
+                self._objects.append(ingredient)
+            row = self._rows[key] = len(self._factors)
+            self._factors.append(unit_gram_factors(ingredient))
+            self._densities.append(tuple(float(_field(ingredient, field) or 0) for field in NUTRIENT_FIELDS))
+        return row
+
+    def add_recipe(self, recipe_ingredients: Iterable[Any], servings: float,
+                   ingredients_by_id: Optional[Mapping[str, Any]] = None) -> int:
+        """Add a recipe to the batch.
+
+        Args:
+            recipe_ingredients: RecipeIngredient models or their stored documents
+            servings: Number of servings (per-serving values equal the totals when not positive)
+            ingredients_by_id: Current ingredient records (model or document) by id; lines
+                whose ingredient_id is found there use it instead of their embedded copy
+
+        Returns:
+            Position of the recipe in compute()'s results
+        """
+        recipe = len(self._servings)
+        self._servings.append(float(servings or 0))
+
+        rows = self._rows
+        for line in recipe_ingredients:
+            if isinstance(line, dict):
+                amount, ingredient_id, unit = line.get("amount"), line.get("ingredient_id"), line.get("unit")
+                embedded = line.get("ingredient")
+            else:
+                amount, ingredient_id, unit, embedded = line.amount, line.ingredient_id, line.unit, line.ingredient
+
+            ingredient = None
+            if ingredients_by_id is not None and ingredient_id is not None:
+                key = str(ingredient_id)
+                ingredient = ingredients_by_id.get(key)
+            if ingredient is None:
+                if embedded is None:
+                    continue
+                ingredient, key = embedded, ("object", id(embedded))
+            row = rows.get(key)
+            if row is None:
+                row = self.add_ingredient(ingredient, key=key)
+            if not amount:
+                continue
+
+            self._line_recipes.append(recipe)
+            self._line_rows.append(row)
+            self._line_units.append(Type.UNIT_INDEX.get(unit or "g", _UNKNOWN_UNIT))
+            self._line_amounts.append(float(amount))
+        return recipe
+
+    def compute(self) -> List[Dict[str, float]]:
+        """Compute every recipe of the batch.
+
+        Returns:
+            One dict per recipe, in the order they were added, with the
+            PER_SERVING_KEYS and TOTAL_KEYS values rounded to 0.1 and
+            "unconverted_ingredients" (lines skipped for lack of a gram conversion)
+        """
+        values, unconverted = self._compute_numpy() if NUMPY_AVAILABLE else self._compute_python()
+        keys = PER_SERVING_KEYS + TOTAL_KEYS
+        results = []
+        for recipe_values, skipped in zip(values, unconverted):
+            result = dict(zip(keys, recipe_values))
+            result["unconverted_ingredients"] = skipped
+            results.append(result)
+        return results
+
+    def _compute_numpy(self) -> Tuple[List[List[float]], List[int]]:
+        count = len(self._servings)
+        recipes = np.array(self._line_recipes, dtype=np.intp)
+        rows = np.array(self._line_rows, dtype=np.intp)
+        factors = np.array(self._factors, dtype=np.float64).reshape(-1, _UNIT_COLUMNS)
+        densities = np.array(self._densities, dtype=np.float64).reshape(-1, len(NUTRIENT_FIELDS))
+
+        grams = np.array(self._line_amounts, dtype=np.float64) * factors[rows, np.array(self._line_units, dtype=np.intp)]
+        unknown = np.isnan(grams)
+        grams[unknown] = 0.0
+        contributions = densities[rows] * (grams / 100.0)[:, None]
+
+        totals = np.column_stack([np.bincount(recipes, weights=contributions[:, column], minlength=count)
+                                  for column in range(len(NUTRIENT_FIELDS))])
+        servings = np.array(self._servings, dtype=np.float64)
+        per_serving = totals / np.where(servings > 0, servings, 1.0)[:, None]
+        unconverted = np.bincount(recipes[unknown], minlength=count)
+        return np.round(np.hstack([per_serving, totals]), 1).tolist(), unconverted.tolist()
+
+    def _compute_python(self) -> Tuple[List[List[float]], List[int]]:
+        count = len(self._servings)
+        totals = [[0.0] * len(NUTRIENT_FIELDS) for _ in range(count)]
+        unconverted = [0] * count
+        for recipe, row, unit, amount in zip(self._line_recipes, self._line_rows, self._line_units, self._line_amounts):
+            grams = amount * self._factors[row][unit]
+            if math.isnan(grams):
+                unconverted[recipe] += 1
+                continue
+            recipe_totals = totals[recipe]
+            for column, density in enumerate(self._densities[row]):
+                recipe_totals[column] += density * grams / 100.0
+
+        values = []
+        for recipe_totals, servings in zip(totals, self._servings):
+            per_serving = [value / servings for value in recipe_totals] if servings > 0 else recipe_totals
+            values.append([round(value, 1) for value in per_serving + recipe_totals])
+        return values, unconverted
+
+
+def stored_nutrition(result: Dict[str, float]) -> Dict[str, float]:
+    """Map a compute() result to the Recipe *_stored fields it is persisted in."""
+    return {field: result[key] for key, field in STORED_FIELDS.items()}
@@ -31,8 +31,9 @@ def get_ingredients():
         if limit < 1:
             return jsonify({"error": "Limit must be a positive integer"}), 400
         
-        # Convert page to skip
+        # Convert page to skip (a cursor from a previous page's next_cursor takes precedence)
         skip = (page - 1) * limit
+        cursor = request.args.get('cursor')
         
         # Check for search query parameter
         search_query = request.args.get('search')
@@ -42,36 +43,27 @@ def get_ingredients():
         if is_system is not None:
             is_system = is_system.lower() in ('true', '1', 'yes')
         
-        if search_query:
-            # Use search_ingredients if search parameter is provided
-            ingredients = client.search_ingredients(search_query, skip=skip, limit=limit, is_system=is_system)
-        else:
-            # Use get_all_ingredients if no search parameter
-            ingredients = client.get_all_ingredients(skip=skip, limit=limit)
-        
-        if ingredients is None:
-            ingredients = []
+        # A search is matched once for both the page and its total; without one
+        # the page uses the sort index and the total the collection metadata (?count=exact to count)
+        count_mode = request.args.get('count', 'estimated')
+        result = client.search_ingredients_with_total(search_query or None, skip=skip, limit=limit,
+                                                      is_system=is_system, after=cursor, count=count_mode)
+        ingredients = result["items"]
             
-        # Convert ingredients to dictionary format for JSON response
-        ingredients_list = [ingredient.to_dict() for ingredient in ingredients]
-        
         # Determine if there are more results
-        has_more = len(ingredients_list) == limit
-        
-        # Get total count of ingredients regardless of pagination
-        if search_query:
-            total_count = client.count_ingredients(search_term=search_query, is_system=is_system)
-        else:
-            total_count = client.count_ingredients()
+        has_more = len(ingredients) == limit
             
         # Return response with pagination metadata including total count
+        # Models are encoded by the app's JSON provider, no to_dict() pass needed
         return jsonify({
-            "ingredients": ingredients_list,
+            "ingredients": ingredients,
             "pagination": {
                 "page": page,
                 "limit": limit,
                 "has_more": has_more,
-                "total": total_count
+                "total": result["total"],
+                "total_exact": result["total_exact"],
+                "next_cursor": client.get_next_page_cursor(ingredients)
             }
         })
         
@@ -31,32 +31,25 @@ def get_inventory_items():
         if limit < 1:
             return jsonify({"error": "Limit must be a positive integer"}), 400
         
-        # Convert page to skip
+        # Convert page to skip (a cursor from a previous page's next_cursor takes precedence)
         skip = (page - 1) * limit
+        cursor = request.args.get('cursor')
         
         # Check for search query parameter
         search_query = request.args.get('search')
         
-        # Get inventory items with search if provided
-        if search_query:
-            inventory_items = client.search_inventory_items(search_query, skip=skip, limit=limit)
-        else:
-            inventory_items = client.get_all_inventory_items(skip=skip, limit=limit)
-        
-        if inventory_items is None:
-            inventory_items = []
+        # A search is matched once for both the page and its total; without one
+        # the page uses the sort index and the total the collection metadata (?count=exact to count)
+        count_mode = request.args.get('count', 'estimated')
+        result = client.search_inventory_items_with_total(search_query or None, skip=skip, limit=limit,
+                                                          after=cursor, count=count_mode)
+        inventory_items = result["items"]
             
         # Convert items to dictionary format for JSON response
         items_list = [item.to_dict() for item in inventory_items]
         
         # Determine if there are more results
         has_more = len(items_list) == limit
-        
-        # Get total count of inventory items
-        if search_query:
-            total_count = client.count_inventory_items(search_term=search_query)
-        else:
-            total_count = client.count_inventory_items()
             
         return jsonify({
             "inventory_items": items_list,
@@ -64,7 +57,9 @@ def get_inventory_items():
                 "page": page,
                 "limit": limit,
                 "has_more": has_more,
-                "total": total_count
+                "total": result["total"],
+                "total_exact": result["total_exact"],
+                "next_cursor": client.get_next_page_cursor(inventory_items)
             }
         })
         
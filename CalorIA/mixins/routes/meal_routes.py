@@ -1,6 +1,6 @@
 from flask import Blueprint, jsonify, request
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 from werkzeug.local import LocalProxy
 import sys
 import os
@@ -18,71 +18,90 @@ meal_bp = Blueprint('meal', __name__)
 # Use LocalProxy to defer client resolution until request context
 client = LocalProxy(get_client)
 
+# Most meals accepted by one POST /api/meals/batch request
+MAX_MEAL_BATCH = 500
+
+
+class MealEntryError(ValueError):
+    """A meal entry in a request body is missing or has an invalid field."""
+
+
+def parse_meal_entry(data):
+    """Build a Meal from a meal entry request body (see POST /api/meals).
+
+    Raises:
+        MealEntryError: If a required field is missing or malformed
+        ValueError: If the model rejects a value (e.g. an unknown meal_type)
+    """
+    if not isinstance(data, dict) or not data:
+        raise MealEntryError("Request body must be valid JSON")
+
+    # Validate required fields
+    if 'user_id' not in data:
+        raise MealEntryError("Missing required field: user_id")
+
+    if 'meal_type' not in data:
+        raise MealEntryError("Missing required field: meal_type")
+
+    if 'food_items' not in data or not isinstance(data['food_items'], list):
+        raise MealEntryError("Missing or invalid required field: food_items (must be an array)")
+
+    # Parse UUID from string
+    try:
+        user_id = UUID(data['user_id'])
+    except (ValueError, TypeError, AttributeError):
+        raise MealEntryError("Invalid user ID format")
+
+    # Get date from request or use today
+    meal_date = data.get('meal_date')
+    if meal_date:
+        try:
+            meal_date = date.fromisoformat(meal_date)
+        except (ValueError, TypeError):
+            raise MealEntryError("Invalid date format. Use YYYY-MM-DD")
+    else:
+        meal_date = date.today()
+
+    # Process meal items
+    food_items = []
+    for item_data in data['food_items']:
+        if not isinstance(item_data, dict):
+            raise MealEntryError("Invalid meal item: must be an object")
+        try:
+            food_item = Type.FoodItem(
+                name=item_data['name'],
+                calories=item_data.get('calories', 100),  # FoodItem requires calories > 0
+                protein_g=item_data.get('protein_g', 0),
+                carbs_g=item_data.get('carbs_g', 0),
+                fat_g=item_data.get('fat_g', 0),
+                portion_size=f"{item_data.get('quantity', 1.0)} {item_data.get('unit', 'serving')}"
+            )
+            food_items.append(food_item)
+        except KeyError as e:
+            raise MealEntryError(f"Missing required field in meal item: {str(e)}")
+
+    # Create a datetime object for the meal using the provided date and current time
+    # We'll use the server's time but with the user's date
+    meal_datetime = datetime.combine(meal_date, datetime.now().time())
+
+    return Type.Meal(
+        user_id=user_id,
+        meal_type=data['meal_type'],
+        food_items=food_items,
+        notes=data.get('notes', ''),
+        timestamp=meal_datetime
+    )
+
+
 @meal_bp.route('/api/meals', methods=['POST'])
 def add_meal_entry():
     """Add a new meal entry for a user"""
     try:
         # Parse JSON request body
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "Request body must be valid JSON"}), 400
-        
-        # Validate required fields
-        if 'user_id' not in data:
-            return jsonify({"error": "Missing required field: user_id"}), 400
-            
-        if 'meal_type' not in data:
-            return jsonify({"error": "Missing required field: meal_type"}), 400
-            
-        if 'food_items' not in data or not isinstance(data['food_items'], list):
-            return jsonify({"error": "Missing or invalid required field: food_items (must be an array)"}), 400
-        
-        # Parse UUID from string
         try:
-            user_id = UUID(data['user_id'])
-        except ValueError:
-            return jsonify({"error": "Invalid user ID format"}), 400
-            
-        # Get date from request or use today
-        meal_date = data.get('meal_date')
-        if meal_date:
-            try:
-                meal_date = date.fromisoformat(meal_date)
-            except ValueError:
-                return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
-        else:
-            meal_date = date.today()
-        
-        # Process meal items
-        food_items = []
-        for item_data in data['food_items']:
-            try:
-                food_item = Type.FoodItem(
-                    name=item_data['name'],
-                    calories=item_data.get('calories', 100),  # FoodItem requires calories > 0
-                    protein_g=item_data.get('protein_g', 0),
-                    carbs_g=item_data.get('carbs_g', 0),
-                    fat_g=item_data.get('fat_g', 0),
-                    portion_size=f"{item_data.get('quantity', 1.0)} {item_data.get('unit', 'serving')}"
-                )
-                food_items.append(food_item)
-            except KeyError as e:
-                return jsonify({"error": f"Missing required field in meal item: {str(e)}"}), 400
-        
-        # Create meal entry with the provided date
-        from datetime import datetime, time, timezone
-        
-        # Create a datetime object for the meal using the provided date and current time
-        # We'll use the server's time but with the user's date
-        meal_datetime = datetime.combine(meal_date, datetime.now().time())
-        
-        meal_entry = Type.Meal(
-            user_id=user_id,
-            meal_type=data['meal_type'],
-            food_items=food_items,
-            notes=data.get('notes', ''),
-            timestamp=meal_datetime
-        )
+            meal_entry = parse_meal_entry(request.get_json())
+        except MealEntryError as e:
+            return jsonify({"error": str(e)}), 400
         
         # Add to database
         result = client.add_meal_entry(meal_entry)
@@ -100,6 +119,57 @@ def add_meal_entry():
     except Exception as e:
         return jsonify({"error": f"Failed to add meal entry: {str(e)}"}), 500
 
+@meal_bp.route('/api/meals/batch', methods=['POST'])
+def add_meal_entries():
+    """Add many meal entries at once (offline sync, imports from other trackers)
+
+    Body: {"meals": [<meal entry as for POST /api/meals>, ...]} or a bare array.
+    Every entry is validated; the valid ones are written with one unordered
+    insert, so one bad entry does not reject the others. Responds with one
+    result per entry, in request order.
+    """
+    try:
+        data = request.get_json()
+        meals = data.get('meals') if isinstance(data, dict) else data
+        if not isinstance(meals, list) or not meals:
+            return jsonify({"error": "Request body must be a non-empty array of meals (or {\"meals\": [...]})"}), 400
+        if len(meals) > MAX_MEAL_BATCH:
+            return jsonify({"error": f"Too many meals in one batch (max {MAX_MEAL_BATCH})"}), 400
+
+        results = [None] * len(meals)
+        meal_entries, positions = [], []
+        for i, meal_data in enumerate(meals):
+            try:
+                meal_entries.append(parse_meal_entry(meal_data))
+                positions.append(i)
+            except MealEntryError as e:
+                results[i] = {"index": i, "ok": False, "error": str(e)}
+            except ValueError as e:
+                results[i] = {"index": i, "ok": False, "error": f"Invalid value: {str(e)}"}
+
+        for position, result in zip(positions, client.add_meal_entries(meal_entries)):
+            result["index"] = position
+            if not result["ok"]:
+                result["error"] = f"Failed to save meal entry: {result['error']}"
+            results[position] = result
+
+        created = sum(1 for result in results if result["ok"])
+        if created == len(results):
+            status = 201
+        elif created:
+            status = 207
+        else:
+            status = 400 if not meal_entries else 500
+        return jsonify({
+            "message": f"Added {created} of {len(results)} meal entries",
+            "created": created,
+            "failed": len(results) - created,
+            "results": results
+        }), status
+
+    except Exception as e:
+        return jsonify({"error": f"Failed to add meal entries: {str(e)}"}), 500
+
 @meal_bp.route('/api/meals/<meal_id>', methods=['PUT'])
 def update_meal_entry(meal_id):
     """Update an existing meal entry"""
@@ -28,6 +28,8 @@ def get_recipes():
         difficulty = request.args.get('difficulty')
         tags = request.args.getlist('tags')  # Multiple tags possible
         skip = int(request.args.get('skip', 0))
+        cursor = request.args.get('cursor')  # from a previous page's next_cursor (preferred over skip)
+        expand = request.args.get('expand')  # e.g. "category,tags" to embed the related objects
         limit = request.args.get('limit')
         if limit:
             limit = int(limit)
@@ -40,7 +42,9 @@ def get_recipes():
                 limit=limit,
                 category=category,
                 difficulty=difficulty,
-                tags=tags if tags else None
+                tags=tags if tags else None,
+                after=cursor,
+                expand=expand
             )
         else:
             # Use regular filtering
@@ -48,17 +52,20 @@ def get_recipes():
                 skip=skip,
                 limit=limit,
                 category=category,
-                difficulty=difficulty
+                difficulty=difficulty,
+                after=cursor,
+                expand=expand
             )
 
-        # Convert recipes to dictionaries
-        recipe_dicts = [recipe.to_dict() for recipe in recipes]
-
+        # Models are encoded by the app's JSON provider, no to_dict() pass needed
         return jsonify({
-            "recipes": recipe_dicts,
-            "count": len(recipe_dicts)
+            "recipes": recipes,
+            "count": len(recipes),
+            "next_cursor": client.get_next_page_cursor(recipes)
         }), 200
 
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter value: {str(e)}"}), 400
     except Exception as e:
         return jsonify({"error": f"Failed to get recipes: {str(e)}"}), 500
 
@@ -72,13 +79,15 @@ def get_recipe(recipe_id):
         except ValueError:
             return jsonify({"error": "Invalid recipe ID format"}), 400
 
-        recipe = client.get_recipe_by_id(recipe_id)
+        recipe = client.get_recipe_by_id(recipe_id, expand=request.args.get('expand'))
 
         if recipe is None:
             return jsonify({"error": "Recipe not found"}), 404
 
         return jsonify({"recipe": recipe.to_dict()}), 200
 
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter value: {str(e)}"}), 400
     except Exception as e:
         return jsonify({"error": f"Failed to get recipe: {str(e)}"}), 500
 
@@ -428,6 +437,8 @@ def search_recipes():
         min_servings = request.args.get('min_servings')
         max_servings = request.args.get('max_servings')
         skip = int(request.args.get('skip', 0))
+        cursor = request.args.get('cursor')
+        expand = request.args.get('expand')
         limit = request.args.get('limit')
         if limit:
             limit = int(limit)
@@ -439,7 +450,9 @@ def search_recipes():
             limit=limit,
             category=category,
             difficulty=difficulty,
-            tags=tags if tags else None
+            tags=tags if tags else None,
+            after=cursor,
+            expand=expand
         )
 
         # Apply additional filters
@@ -463,12 +476,51 @@ def search_recipes():
         return jsonify({
             "recipes": recipe_dicts,
             "count": len(recipe_dicts),
-            "query": query
+            "query": query,
+            # The cursor follows the search page, before the prep time/servings filters
+            "next_cursor": client.get_next_page_cursor(recipes)
         }), 200
 
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter value: {str(e)}"}), 400
     except Exception as e:
         return jsonify({"error": f"Failed to search recipes: {str(e)}"}), 500
 
+@recipe_bp.route('/api/recipes/by-nutrition', methods=['GET'])
+def get_recipes_by_nutrition():
+    """Find recipes by per-serving nutrition ranges (e.g. ?min_protein=30&max_calories=500)."""
+    try:
+        ranges = {name: float(request.args[name])
+                  for name in ('min_calories', 'max_calories', 'min_protein', 'max_carbs')
+                  if request.args.get(name)}
+        max_total_time = request.args.get('max_total_time')
+        tags = request.args.getlist('tags')
+        skip = int(request.args.get('skip', 0))
+        limit = int(request.args.get('limit', 20))
+
+        recipes = client.find_recipes_by_nutrition(
+            **ranges,
+            max_total_time=int(max_total_time) if max_total_time else None,
+            difficulty=request.args.get('difficulty'),
+            tags=tags if tags else None,
+            sort=request.args.get('sort', 'calories'),
+            skip=skip,
+            limit=limit,
+            after=request.args.get('cursor'),
+            expand=request.args.get('expand')
+        )
+
+        return jsonify({
+            "recipes": recipes,
+            "count": len(recipes),
+            "next_cursor": client.get_next_page_cursor(recipes)
+        }), 200
+
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter value: {str(e)}"}), 400
+    except Exception as e:
+        return jsonify({"error": f"Failed to find recipes by nutrition: {str(e)}"}), 500
+
 @recipe_bp.route('/api/recipes/popular', methods=['GET'])
 def get_popular_recipes():
     """Get popular recipes."""
@@ -476,7 +528,7 @@ def get_popular_recipes():
         limit = request.args.get('limit', 10)
         limit = int(limit)
 
-        recipes = client.get_popular_recipes(limit=limit)
+        recipes = client.get_popular_recipes(limit=limit, expand=request.args.get('expand'))
         recipe_dicts = [recipe.to_dict() for recipe in recipes]
 
         return jsonify({
@@ -484,5 +536,7 @@ def get_popular_recipes():
             "count": len(recipe_dicts)
         }), 200
 
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter value: {str(e)}"}), 400
     except Exception as e:
         return jsonify({"error": f"Failed to get popular recipes: {str(e)}"}), 500
\ No newline at end of file
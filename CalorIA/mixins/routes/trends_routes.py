@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from uuid import UUID
 from datetime import date, timedelta
+from functools import partial
 from werkzeug.local import LocalProxy
 import sys
 import os
@@ -54,8 +55,12 @@ def get_weight_trends(user_id):
             }
             days = period_days.get(period, 30)
 
-        # Get weight trend data
-        weight_trends = client.get_user_weight_trend(user_id, period)
+        # Get the daily rollups (one indexed lookup per day, chronological) and the user in parallel
+        results = client.fan_out({
+            "rollups": partial(client.get_daily_rollup_series, user_id, days=days),
+            "user": partial(client.get_user_by_id, user_id)
+        }, defaults={"rollups": []})
+        rollups, user = results["rollups"], results["user"]
 
         # Format the data for frontend charts
         chart_data = {
@@ -81,18 +86,17 @@ def get_weight_trends(user_id):
             ]
         }
 
-        # Get user data for goal weight
-        user = client.get_user_by_id(user_id)
+        # Get goal weight from the user data
         goal_weight = user.target_weight if user and hasattr(user, 'target_weight') else None
 
-        # Process trend data
-        for entry in weight_trends:
+        # Process trend data (one point per day, chronological)
+        for entry in rollups:
             # Format date for display
             entry_date = date.fromisoformat(entry['date'])
             chart_data["labels"].append(entry_date.strftime('%b %d'))
 
             # Add weight data
-            chart_data["datasets"][0]["data"].append(entry['weight_kg'])
+            chart_data["datasets"][0]["data"].append(entry.get('latest_weight_kg'))
 
             # Add goal weight if available
             if goal_weight:
@@ -147,11 +151,14 @@ def get_calorie_trends(user_id):
             }
             days = period_days.get(period, 7)
 
-        # Get meal history data
-        meal_history = client.get_user_meal_history(user_id, days)
+        # Get the daily rollups (one indexed lookup per day, chronological) and the user in parallel
+        results = client.fan_out({
+            "rollups": partial(client.get_daily_rollup_series, user_id, days=days),
+            "user": partial(client.get_user_by_id, user_id)
+        }, defaults={"rollups": []})
+        rollups, user = results["rollups"], results["user"]
 
-        # Get user data for daily goal
-        user = client.get_user_by_id(user_id)
+        # Get daily goal from the user data
         daily_goal = user.daily_calorie_goal if user and hasattr(user, 'daily_calorie_goal') else 2000
 
         # Format the data for frontend charts
@@ -178,14 +185,14 @@ def get_calorie_trends(user_id):
             ]
         }
 
-        # Process meal history data
-        for entry in meal_history:
+        # Process rollup data (one row per day, chronological)
+        for entry in rollups:
             # Format date for display
             entry_date = date.fromisoformat(entry['date'])
             chart_data["labels"].append(entry_date.strftime('%b %d'))
 
             # Add consumed calories
-            consumed = entry.get('total_calories', 0)
+            consumed = round(entry.get('calories', 0))
             chart_data["datasets"][0]["data"].append(consumed)
 
             # Add goal calories
@@ -238,12 +245,14 @@ def get_combined_trends(user_id):
             }
             days = period_days.get(period, 30)
 
-        # Get both weight and calorie data
-        weight_trends = client.get_user_weight_trend(user_id, period)
-        meal_history = client.get_user_meal_history(user_id, days)
+        # Get both weight and calorie data from the daily rollups, and the user, in parallel
+        results = client.fan_out({
+            "rollups": partial(client.get_daily_rollup_series, user_id, days=days),
+            "user": partial(client.get_user_by_id, user_id)
+        }, defaults={"rollups": []})
+        rollups, user = results["rollups"], results["user"]
 
-        # Get user data
-        user = client.get_user_by_id(user_id)
+        # Get goals from the user data
         daily_goal = user.daily_calorie_goal if user and hasattr(user, 'daily_calorie_goal') else 2000
         goal_weight = user.target_weight if user and hasattr(user, 'target_weight') else None
 
@@ -261,17 +270,13 @@ def get_combined_trends(user_id):
             }
         }
 
-        # Process weight data
-        for entry in weight_trends:
-            entry_date = date.fromisoformat(entry['date'])
-            combined_data["weight"]["labels"].append(entry_date.strftime('%b %d'))
-            combined_data["weight"]["data"].append(entry['weight_kg'])
-
-        # Process calorie data
-        for entry in meal_history:
-            entry_date = date.fromisoformat(entry['date'])
-            combined_data["calories"]["labels"].append(entry_date.strftime('%b %d'))
-            combined_data["calories"]["data"].append(entry.get('total_calories', 0))
+        # Process weight and calorie data
+        for entry in rollups:
+            label = date.fromisoformat(entry['date']).strftime('%b %d')
+            combined_data["weight"]["labels"].append(label)
+            combined_data["weight"]["data"].append(entry.get('latest_weight_kg'))
+            combined_data["calories"]["labels"].append(label)
+            combined_data["calories"]["data"].append(round(entry.get('calories', 0)))
 
         return jsonify({
             "success": True,
@@ -36,6 +36,7 @@ def get_water_entries(user_id):
         end_date_str = request.args.get('end_date')
         skip = request.args.get('skip', 0, type=int)
         limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')  # from a previous page's next_cursor (preferred over skip)
         
         # Parse date parameters if provided
         start_date = None
@@ -54,7 +55,10 @@ def get_water_entries(user_id):
                 return jsonify({"error": "Invalid end_date format. Use YYYY-MM-DD"}), 400
         
         # Get water entries
-        entries = client.get_user_water_entries(user_id, start_date, end_date, skip, limit)
+        try:
+            entries = client.get_user_water_entries(user_id, start_date, end_date, skip, limit, after=cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         # Convert entries to dictionaries for JSON response
         entries_dict = [entry.to_dict() for entry in entries]
@@ -62,7 +66,8 @@ def get_water_entries(user_id):
         return jsonify({
             "user_id": str(user_id),
             "entries": entries_dict,
-            "count": len(entries_dict)
+            "count": len(entries_dict),
+            "next_cursor": client.get_next_page_cursor(entries)
         })
         
     except Exception as e:
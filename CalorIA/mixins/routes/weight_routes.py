@@ -38,6 +38,7 @@ def get_weight_history(user_id):
         days = request.args.get('days')
         skip = request.args.get('skip', 0, type=int)
         limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')  # from a previous page's next_cursor (preferred over skip)
         
         # If days parameter is provided, get weight history summary
         if days is not None:
@@ -68,7 +69,10 @@ def get_weight_history(user_id):
                 return jsonify({"error": "Invalid end_date format. Use YYYY-MM-DD"}), 400
         
         # Get weight entries
-        entries = client.get_user_weight_entries(user_id, start_date, end_date, skip, limit)
+        try:
+            entries = client.get_user_weight_entries(user_id, start_date, end_date, skip, limit, after=cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         # Convert entries to dictionaries for JSON response
         entries_dict = [entry.to_dict() for entry in entries]
@@ -76,7 +80,8 @@ def get_weight_history(user_id):
         return jsonify({
             "user_id": str(user_id),
             "entries": entries_dict,
-            "count": len(entries_dict)
+            "count": len(entries_dict),
+            "next_cursor": client.get_next_page_cursor(entries)
         })
         
     except Exception as e:
@@ -0,0 +1,704 @@
+import os
+import re
+import math
+import time
+import bisect
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Any, Callable, Dict, List, Set, Tuple
+
+from .. import types as Type
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase `text`, strip accents and reduce it to words separated by single spaces."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(_WORD_RE.findall(stripped.casefold()))
+
+
+def trigrams(token: str) -> Set[str]:
+    """Trigrams of a token, padded so that short tokens and word starts still match."""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+_STOPWORDS = frozenset("a an and at for from in of on or the to with".split())
+
+
+def stem(word: str) -> str:
+    """Reduce common English plurals to their singular (tomatoes -> tomato, berries -> berry)."""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith(('oes', 'shes', 'ches', 'xes', 'sses')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def analyze(text: Optional[str]) -> List[str]:
+    """Terms of a text for full-text search: normalized words without stopwords, singularized."""
+    return [stem(word) for word in normalize_text(text).split() if word not in _STOPWORDS]
+
+
+class SearchIndex:
+    """Build state shared by the process-local search indexes.
+
+    An index is stale when it was never built, is older than max_age seconds
+    or was invalidated after it started building; refresh() rebuilds it then.
+    Incremental add()/remove() calls made while load() reads its snapshot are
+    recorded and replayed once the snapshot is swapped in, so they are not
+    lost. Pages continue after the rank key of the previous page's last result.
+    """
+
+    # Types of the values of a rank key, checked when a cursor comes back
+    RANK_KEY_TYPES: Tuple[type, ...] = ()
+
+    def __init__(self, max_age: Optional[float] = None):
+        self.max_age = max_age
+        self.built_at: Optional[float] = None
+        self.build_lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._built_generation = 0
+        # (method, args) of the add/remove calls made during a load, None when not loading
+        self._pending: Optional[List[Tuple[Callable[..., None], Tuple[Any, ...]]]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def is_stale(self) -> bool:
+        """Whether the index needs a (re)build."""
+        if self.built_at is None or self._built_generation != self._generation:
+            return True
+        return self.max_age is not None and time.monotonic() - self.built_at > self.max_age
+
+    def invalidate(self) -> None:
+        """Mark the content outdated; it is still searched until the rebuild completes."""
+        self._generation += 1
+
+    def refresh(self, build: Callable[[], Any], wait: bool = False) -> bool:
+        """Start `build` if the index is stale and report whether it can be searched.
+
+        The build runs on a background thread, so requests never wait for it:
+        until the first build completes callers fall back to the database, and
+        while a built index is rebuilt they keep searching the previous content.
+        With wait=True the build runs on the calling thread instead.
+        """
+        if self.is_stale() and self.build_lock.acquire(blocking=wait):
+            if wait:
+                self._build(build)
+            else:
+                threading.Thread(target=self._build, args=(build,), name=f"{type(self).__name__}-build",
+                                 daemon=True).start()
+        return self.ready
+
+    def _build(self, build: Callable[[], Any]) -> None:
+        """Run `build` if the index is still stale, then release the build lock acquired by refresh()."""
+        try:
+            if self.is_stale():
+                build()
+        finally:
+            self.build_lock.release()
+
+    def check_rank_key(self, after: Optional[List[Any]]) -> None:
+        """Raise ValueError if `after` (decoded from a cursor) is not a rank key of this index."""
+        if after is not None and tuple(type(value) for value in after) != self.RANK_KEY_TYPES:
+            raise ValueError("Invalid pagination cursor")
+
+    def _start_load(self) -> int:
+        """Start recording incremental changes for a load and return the generation it builds."""
+        with self._lock:
+            self._pending = []
+            return self._generation
+
+    def _record(self, method: Callable[..., None], *args: Any) -> None:
+        """Remember an incremental change (call holding _lock) if a load is reading its snapshot."""
+        if self._pending is not None:
+            self._pending.append((method, args))
+
+    def _finish_load(self, generation: Optional[int]) -> None:
+        """Replay the changes recorded since _start_load (call holding _lock, after the swap).
+
+        With generation None the load failed and the recorded changes are dropped.
+        """
+        pending, self._pending = self._pending or [], None
+        if generation is None:
+            return
+        for method, args in pending:
+            method(*args)
+        self._mark_built(generation)
+
+    def _mark_built(self, generation: int) -> None:
+        self._built_generation = generation
+        self.built_at = time.monotonic()
+
+    @staticmethod
+    def _page(ranked: List[Tuple[Tuple[Any, ...], Any]], skip: int, limit: Optional[int],
+              after: Optional[List[Any]]) -> Tuple[List[Any], Optional[List[Any]]]:
+        """Order (rank key, item) pairs and cut a page, returning its items and the key to continue after."""
+        start = skip
+        if after is not None:
+            after_key = tuple(after)
+            ranked = [pair for pair in ranked if pair[0] > after_key]
+            start = 0
+        if limit is None:
+            page = sorted(ranked)[start:]
+        else:
+            # Only the requested page needs ordering, not every match of a short query
+            page = heapq.nsmallest(start + limit, ranked)[start:]
+
+        has_more = limit is not None and len(ranked) > start + limit
+        next_after = list(page[-1][0]) if has_more and page else None
+        return [item for _, item in page], next_after
+
+
+class _IndexEntry:
+    """One indexed ingredient with its normalized searchable text."""
+
+    __slots__ = ('key', 'ingredient', 'name', 'phrases', 'tokens', 'popularity', 'is_system')
+
+    def __init__(self, key: str, ingredient: Type.Ingredient):
+        self.key = key
+        self.ingredient = ingredient
+        self.name = normalize_text(ingredient.name)
+        others = [normalize_text(text) for text in (ingredient.aliases or []) + (ingredient.tags or [])]
+        self.phrases = tuple(phrase for phrase in others if phrase)
+        self.tokens = frozenset(' '.join((self.name,) + self.phrases).split())
+        self.popularity = float(ingredient.popularity_score or 0.0)
+        self.is_system = bool(ingredient.is_system)
+
+
+class IngredientSearchIndex(SearchIndex):
+    """Process-local autocomplete index over ingredient names, aliases and tags.
+
+    Every query token must match a word of the ingredient by prefix; a token
+    matching no word by prefix falls back to trigram similarity, so typos
+    still find results. Unlike the MongoDB search, a token does not match
+    inside a word ("apple" does not find "Pineapple"). Matches rank by how
+    they matched (exact name, exact alias/tag, name prefix, alias/tag prefix,
+    word prefixes, fuzzy), then by popularity_score. The index lives in one
+    process: writes made through another backend worker only show up after
+    that worker's next rebuild (see CALORIA_INGREDIENT_SEARCH_INDEX_MAX_AGE).
+    """
+
+    # Minimum trigram (Jaccard) similarity for a fuzzy token match
+    FUZZY_THRESHOLD = 0.3
+
+    RANK_KEY_TYPES = (int, float, float, str, str)
+
+    def __init__(self, max_age: Optional[float] = None):
+        super().__init__(max_age)
+        self._entries: Dict[str, _IndexEntry] = {}
+        self._keys_by_id: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = {}     # word -> entry keys
+        self._vocabulary: List[str] = []             # sorted words, for prefix ranges
+        self._trigrams: Dict[str, Set[str]] = {}     # trigram -> words
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Building and incremental maintenance
+    def load(self, docs: Any) -> int:
+        """Replace the index content with the given raw ingredient documents.
+
+        Returns:
+            Number of indexed ingredients
+        """
+        generation = self._start_load()
+        entries = {}
+        try:
+            for doc in docs:
+                entry = self._make_entry(doc)
+                if entry is not None:
+                    entries[entry.key] = entry
+        except BaseException:
+            with self._lock:
+                self._finish_load(None)
+            raise
+
+        postings: Dict[str, Set[str]] = {}
+        for entry in entries.values():
+            for token in entry.tokens:
+                postings.setdefault(token, set()).add(entry.key)
+        grams: Dict[str, Set[str]] = {}
+        for token in postings:
+            for gram in trigrams(token):
+                grams.setdefault(gram, set()).add(token)
+
+        with self._lock:
+            self._entries = entries
+            self._keys_by_id = {str(entry.ingredient.id): key for key, entry in entries.items()
+                                if entry.ingredient.id is not None}
+            self._postings = postings
+            self._vocabulary = sorted(postings)
+            self._trigrams = grams
+            self._finish_load(generation)
+        return len(self._entries)
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        """Index (or re-index) one raw ingredient document; it must carry its _id."""
+        entry = self._make_entry(doc)
+        if entry is None:
+            return
+        with self._lock:
+            self._record(self.add, doc)
+            self._remove_key(entry.key)
+            self._entries[entry.key] = entry
+            if entry.ingredient.id is not None:
+                self._keys_by_id[str(entry.ingredient.id)] = entry.key
+            for token in entry.tokens:
+                keys = self._postings.get(token)
+                if keys is None:
+                    keys = self._postings[token] = set()
+                    bisect.insort(self._vocabulary, token)
+                    for gram in trigrams(token):
+                        self._trigrams.setdefault(gram, set()).add(token)
+                keys.add(entry.key)
+
+    def remove(self, ingredient_id: Any) -> None:
+        """Drop the ingredient with this id from the index (no-op if it is not indexed)."""
+        with self._lock:
+            self._record(self.remove, ingredient_id)
+            key = self._keys_by_id.get(str(ingredient_id))
+            if key is not None:
+                self._remove_key(key)
+
+    def _remove_key(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.ingredient.id is not None:
+            self._keys_by_id.pop(str(entry.ingredient.id), None)
+        for token in entry.tokens:
+            keys = self._postings.get(token)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                for gram in trigrams(token):
+                    words = self._trigrams.get(gram)
+                    if words is not None:
+                        words.discard(token)
+                        if not words:
+                            del self._trigrams[gram]
+
+    @staticmethod
+    def _make_entry(doc: Dict[str, Any]) -> Optional[_IndexEntry]:
+        key = str(doc.get('_id'))
+        try:
+            ingredient = Type.Ingredient.from_dict({k: v for k, v in doc.items() if k != '_id'})
+        except Exception as e:
+            print(f"Error indexing ingredient {key}: {e}")
+            return None
+        return _IndexEntry(key, ingredient)
+
+    # Querying
+    def search(self, query: str, skip: int = 0, limit: Optional[int] = None, is_system: Optional[bool] = None,
+               after: Optional[List[Any]] = None) -> Tuple[List[Type.Ingredient], int, Optional[List[Any]]]:
+        """Find ingredients matching `query`, best matches first.
+
+        Args:
+            query: Text typed by the user (not a pattern)
+            skip: Number of matches to skip (ignored when `after` is given)
+            limit: Maximum number of ingredients to return
+            is_system: If provided, only return system (True) or user (False) ingredients
+            after: Rank key of the last ingredient of the previous page
+
+        Raises:
+            ValueError: If `after` is not a rank key
+
+        Returns:
+            Tuple of the page of Ingredient copies, the total number of matches
+            and the rank key to continue after (None on the last page)
+        """
+        self.check_rank_key(after)
+
+        words = normalize_text(query).split()
+        if not words:
+            return [], 0, None
+
+        phrase = ' '.join(words)
+        with self._lock:
+            # Rank keys end with the unique entry key, so entries themselves are never compared
+            ranked = [((-self._rank(entry, phrase, quality), -quality, -entry.popularity, entry.name, entry.key),
+                       entry)
+                      for entry, quality in self._match(words).items()
+                      if is_system is None or entry.is_system == is_system]
+
+        page, next_after = self._page(ranked, skip, limit, after)
+        # Copies, so callers cannot change the shared indexed models
+        return [entry.ingredient.model_copy() for entry in page], len(ranked), next_after
+
+    def _match(self, words: List[str]) -> Dict[_IndexEntry, float]:
+        """Entries matching every query word, with the weakest word match quality (1.0 = prefix match)."""
+        matched: Optional[Dict[str, float]] = None
+        for word in words:
+            word_matches: Dict[str, float] = {}
+            start = bisect.bisect_left(self._vocabulary, word)
+            for token in self._vocabulary[start:]:
+                if not token.startswith(word):
+                    break
+                for key in self._postings[token]:
+                    word_matches[key] = 1.0
+            if not word_matches:
+                for token, similarity in self._similar_tokens(word):
+                    for key in self._postings[token]:
+                        if similarity > word_matches.get(key, 0.0):
+                            word_matches[key] = similarity
+
+            if matched is None:
+                matched = word_matches
+            else:
+                matched = {key: min(quality, word_matches[key]) for key, quality in matched.items() if key in word_matches}
+            if not matched:
+                return {}
+        return {self._entries[key]: quality for key, quality in matched.items()}
+
+    def _similar_tokens(self, word: str) -> List[Tuple[str, float]]:
+        grams = trigrams(word)
+        shared = Counter(token for gram in grams for token in self._trigrams.get(gram, ()))
+        similar = []
+        for token, common in shared.items():
+            # Rounded so that rank keys survive the JSON round trip of cursor tokens
+            similarity = round(common / (len(grams) + len(trigrams(token)) - common), 6)
+            if similarity >= self.FUZZY_THRESHOLD:
+                similar.append((token, similarity))
+        return similar
+
+    @staticmethod
+    def _rank(entry: _IndexEntry, phrase: str, quality: float) -> int:
+        if quality < 1.0:
+            return 0  # fuzzy
+        if entry.name == phrase:
+            return 5
+        if phrase in entry.phrases:
+            return 4
+        if entry.name.startswith(phrase):
+            return 3
+        for other in entry.phrases:
+            if other.startswith(phrase):
+                return 2
+        return 1  # every word matched a word prefix
+
+
+class _RecipeEntry:
+    """Filter fields and length of one indexed recipe (its terms live in the postings)."""
+
+    __slots__ = ('key', 'terms', 'length', 'category_id', 'difficulty', 'tag_ids', 'created_at')
+
+    def __init__(self, key: str, terms: Dict[str, float], length: float, category_id: Optional[str],
+                 difficulty: Optional[str], tag_ids: frozenset, created_at: float):
+        self.key = key
+        self.terms = terms
+        self.length = length
+        self.category_id = category_id
+        self.difficulty = difficulty
+        self.tag_ids = tag_ids
+        self.created_at = created_at
+
+
+class RecipeSearchIndex(SearchIndex):
+    """Process-local full-text index over recipes, ranked with BM25F.
+
+    Indexes the name, description, tag names, category name and ingredient
+    names of every recipe, each field weighted by FIELD_WEIGHTS. A recipe
+    matches when it contains any query term; recipes containing more (and
+    rarer) terms, in heavier fields, rank first, newest first on ties. The
+    last query term may still be being typed, so it also matches the terms
+    it is a prefix of ("chick" finds "chicken"), weighted by PREFIX_WEIGHT. The
+    category/difficulty/tag filters are applied on the index entries, and
+    search() returns recipe ids: the caller loads just the page. Category and
+    tag names are resolved when a recipe is indexed, so renaming one must
+    invalidate() the index.
+    """
+
+    FIELD_WEIGHTS = {"name": 5.0, "tags": 3.0, "category": 2.0, "ingredients": 2.0, "description": 1.0}
+    # BM25 term frequency saturation and length normalization
+    K1 = 1.2
+    B = 0.75
+    # Score factor of a term matched through the last query term's prefix, and how
+    # many of those terms (the most frequent ones) a query considers at most
+    PREFIX_WEIGHT = 0.5
+    MAX_PREFIX_TERMS = 50
+    RANK_KEY_TYPES = (float, float, str)
+
+    # Recipe fields read when indexing (projection for the build query)
+    PROJECTION = {"_id": 0, "id": 1, "name": 1, "description": 1, "category_id": 1, "category.name": 1,
+                  "tag_ids": 1, "tags.name": 1, "legacy_tags": 1, "ingredients.ingredient.name": 1,
+                  "difficulty": 1, "created_at": 1}
+
+    def __init__(self, max_age: Optional[float] = None):
+        super().__init__(max_age)
+        self._entries: Dict[str, _RecipeEntry] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}    # term -> {recipe id: weighted frequency}
+        self._vocabulary: List[str] = []                     # sorted terms, for prefix ranges
+        self._total_length = 0.0
+        self._category_names: Dict[str, str] = {}
+        self._tag_names: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Building and incremental maintenance
+    def load(self, docs: Any, category_names: Dict[str, str], tag_names: Dict[str, str]) -> int:
+        """Replace the index content with the given recipe documents.
+
+        Args:
+            docs: Recipe documents (at least the PROJECTION fields)
+            category_names: Category id -> name
+            tag_names: Tag id -> name
+
+        Returns:
+            Number of indexed recipes
+        """
+        generation = self._start_load()
+        entries: Dict[str, _RecipeEntry] = {}
+        try:
+            for doc in docs:
+                entry = self._make_entry(doc, category_names, tag_names)
+                if entry is not None:
+                    entries[entry.key] = entry
+        except BaseException:
+            with self._lock:
+                self._finish_load(None)
+            raise
+
+        postings: Dict[str, Dict[str, float]] = {}
+        for entry in entries.values():
+            for term, frequency in entry.terms.items():
+                postings.setdefault(term, {})[entry.key] = frequency
+
+        with self._lock:
+            self._entries = entries
+            self._postings = postings
+            self._vocabulary = sorted(postings)
+            self._total_length = sum(entry.length for entry in entries.values())
+            self._category_names = dict(category_names)
+            self._tag_names = dict(tag_names)
+            self._finish_load(generation)
+        return len(self._entries)
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        """Index (or re-index) one recipe document."""
+        with self._lock:
+            self._record(self.add, doc)
+            entry = self._make_entry(doc, self._category_names, self._tag_names)
+            if entry is None:
+                return
+            self._remove_key(entry.key)
+            self._entries[entry.key] = entry
+            self._total_length += entry.length
+            for term, frequency in entry.terms.items():
+                recipes = self._postings.get(term)
+                if recipes is None:
+                    recipes = self._postings[term] = {}
+                    bisect.insort(self._vocabulary, term)
+                recipes[entry.key] = frequency
+
+    def remove(self, recipe_id: Any) -> None:
+        """Drop the recipe with this id from the index (no-op if it is not indexed)."""
+        with self._lock:
+            self._record(self.remove, recipe_id)
+            self._remove_key(str(recipe_id))
+
+    def _remove_key(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_length -= entry.length
+        for term in entry.terms:
+            recipes = self._postings.get(term)
+            if recipes is not None:
+                recipes.pop(key, None)
+                if not recipes:
+                    del self._postings[term]
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+    def _make_entry(self, doc: Dict[str, Any], category_names: Dict[str, str],
+                    tag_names: Dict[str, str]) -> Optional[_RecipeEntry]:
+        key = doc.get('id')
+        if not key:
+            return None
+        key = str(key)
+
+        category_id = str(doc['category_id']) if doc.get('category_id') else None
+        tag_ids = frozenset(str(tag_id) for tag_id in doc.get('tag_ids') or [])
+        category = category_names.get(category_id) or (doc.get('category') or {}).get('name')
+        tags = {tag_names[tag_id] for tag_id in tag_ids if tag_id in tag_names}
+        tags.update(tag.get('name') for tag in doc.get('tags') or [] if isinstance(tag, dict) and tag.get('name'))
+        tags.update(tag for tag in doc.get('legacy_tags') or [] if isinstance(tag, str))
+        ingredients = [(item.get('ingredient') or {}).get('name') for item in doc.get('ingredients') or []
+                       if isinstance(item, dict)]
+        fields = {
+            "name": [doc.get('name')],
+            "description": [doc.get('description')],
+            "tags": list(tags),
+            "category": [category],
+            "ingredients": ingredients,
+        }
+
+        terms: Dict[str, float] = {}
+        length = 0.0
+        for field, texts in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for text in texts:
+                for term in analyze(text):
+                    terms[term] = terms.get(term, 0.0) + weight
+                    length += weight
+
+        difficulty = doc.get('difficulty')
+        difficulty = getattr(difficulty, 'value', difficulty)
+        created_at = doc.get('created_at')
+        if isinstance(created_at, str):
+            # to_dict() stores datetimes as ISO strings
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except ValueError:
+                created_at = None
+        created_at = created_at.timestamp() if isinstance(created_at, datetime) else 0.0
+        return _RecipeEntry(key, terms, length, category_id, difficulty, tag_ids, created_at)
+
+    # Querying
+    def search(self, query: str, skip: int = 0, limit: Optional[int] = None, category_id: Optional[str] = None,
+               difficulty: Optional[str] = None, tag_ids: Optional[List[str]] = None,
+               after: Optional[List[Any]] = None) -> Tuple[List[str], int, Optional[List[Any]]]:
+        """Find recipes matching `query`, most relevant first.
+
+        Args:
+            query: Text typed by the user (not a pattern)
+            skip: Number of matches to skip (ignored when `after` is given)
+            limit: Maximum number of recipe ids to return
+            category_id: If provided, only recipes of this category
+            difficulty: If provided, only recipes of this difficulty
+            tag_ids: If provided, only recipes having any of these tags
+            after: Rank key of the last recipe of the previous page
+
+        Raises:
+            ValueError: If `after` is not a rank key
+
+        Returns:
+            Tuple of the page of recipe ids, the total number of matches and
+            the rank key to continue after (None on the last page)
+        """
+        self.check_rank_key(after)
+        terms = analyze(query)
+        words = normalize_text(query).split()
+        # The last word typed (unless it is a stopword) also matches by prefix
+        prefix = terms[-1] if terms and words[-1] not in _STOPWORDS else None
+        wanted_tags = frozenset(str(tag_id) for tag_id in tag_ids) if tag_ids else None
+
+        def accepts(entry: _RecipeEntry) -> bool:
+            if category_id is not None and entry.category_id != str(category_id):
+                return False
+            if difficulty is not None and entry.difficulty != difficulty:
+                return False
+            return wanted_tags is None or not wanted_tags.isdisjoint(entry.tag_ids)
+
+        filtered = category_id is not None or difficulty is not None or wanted_tags is not None
+        with self._lock:
+            entries = self._entries
+            if not terms or not entries:
+                return [], 0, None
+            average_length = self._total_length / len(entries) or 1.0
+            k1, b = self.K1, self.B
+
+            # Each query term scores a recipe once, with the best of its alternatives
+            alternatives = {term: [(term, 1.0)] for term in terms}
+            if prefix is not None:
+                alternatives[prefix] += [(other, self.PREFIX_WEIGHT) for other in self._prefix_terms(prefix)]
+
+            scores: Dict[str, float] = {}
+            rejected: Set[str] = set()
+            for matches in alternatives.values():
+                best: Dict[str, float] = {}
+                for term, factor in matches:
+                    recipes = self._postings.get(term)
+                    if not recipes:
+                        continue
+                    idf = math.log(1.0 + (len(entries) - len(recipes) + 0.5) / (len(recipes) + 0.5))
+                    weight = idf * (k1 + 1.0) * factor
+                    for key, frequency in recipes.items():
+                        if filtered and key not in scores and key not in best:
+                            if key in rejected:
+                                continue
+                            if not accepts(entries[key]):
+                                rejected.add(key)
+                                continue
+                        norm = k1 * (1.0 - b + b * entries[key].length / average_length)
+                        score = weight * frequency / (frequency + norm)
+                        if score > best.get(key, 0.0):
+                            best[key] = score
+                for key, score in best.items():
+                    scores[key] = scores.get(key, 0.0) + score
+
+            # Rounded so that rank keys survive the JSON round trip of cursor tokens
+            ranked = [((-round(score, 6), -entries[key].created_at, key), key) for key, score in scores.items()]
+
+        page, next_after = self._page(ranked, skip, limit, after)
+        return page, len(ranked), next_after
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        """Indexed terms longer than `prefix` that start with it, the MAX_PREFIX_TERMS most frequent ones."""
+        start = bisect.bisect_right(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\U0010ffff', start)
+        terms = self._vocabulary[start:end]
+        if len(terms) > self.MAX_PREFIX_TERMS:
+            terms = heapq.nlargest(self.MAX_PREFIX_TERMS, terms, key=lambda term: len(self._postings[term]))
+        return terms
+
+
+# Process-wide indexes shared by every Client, by name (False when disabled)
+_indexes: Dict[str, Any] = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_shared_index(name: str, factory: Callable[..., SearchIndex]) -> Optional[SearchIndex]:
+    index = _indexes.get(name)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(name)
+            if index is None:
+                setting = f"CALORIA_{name.upper()}_SEARCH_INDEX"
+                if os.getenv(setting, '1').lower() in ('0', 'false', 'no'):
+                    index = False
+                else:
+                    max_age = float(os.getenv(f"{setting}_MAX_AGE", '300'))
+                    index = factory(max_age=max_age or None)
+                _indexes[name] = index
+    # An empty index is falsy (__len__), so compare with False explicitly
+    return None if index is False else index
+
+
+def get_ingredient_search_index() -> Optional[IngredientSearchIndex]:
+    """Return the shared ingredient search index (None when disabled).
+
+    Environment variables:
+        CALORIA_INGREDIENT_SEARCH_INDEX: '1' (default) or '0' to search MongoDB directly
+        CALORIA_INGREDIENT_SEARCH_INDEX_MAX_AGE: Seconds after which the index is rebuilt
+            from the database (default 300, 0 never rebuilds); picks up writes made by
+            other processes
+
+    The returned index may still be empty; see IngredientMixin.get_ready_ingredient_search_index.
+    """
+    return _get_shared_index('ingredient', IngredientSearchIndex)
+
+
+def get_recipe_search_index() -> Optional["RecipeSearchIndex"]:
+    """Return the shared recipe search index (None when disabled).
+
+    Configured like the ingredient index, with CALORIA_RECIPE_SEARCH_INDEX and
+    CALORIA_RECIPE_SEARCH_INDEX_MAX_AGE.
+    """
+    return _get_shared_index('recipe', RecipeSearchIndex)
@@ -1,5 +1,6 @@
 
-from typing import Optional
+from typing import Optional, Tuple, List, Dict, Any, Callable
+from datetime import date, timedelta
 from slugify import slugify
 from .. import types as Type
 
@@ -73,4 +74,56 @@ class ToolsMixin:
         Returns:
             A URL-friendly slug string
         """
-        return slugify(text)
\ No newline at end of file
+        return slugify(text)
+
+    def _period_to_days(self, period: str, default: int = 30) -> int:
+        """Map a trend period name ("week", "month", "year") to a number of days."""
+        period_days = {
+            'week': 7,
+            'month': 30,
+            'year': 365
+        }
+        return period_days.get(period, default)
+
+    def _date_window(self, days: int, start_date: Optional[date] = None,
+                     end_date: Optional[date] = None) -> Tuple[date, date]:
+        """Resolve an inclusive [start_date, end_date] window.
+
+        Args:
+            days: Number of days in the window when start_date is not given
+            start_date: Optional explicit first day of the window
+            end_date: Optional explicit last day of the window (default: today)
+
+        Returns:
+            Tuple of (start_date, end_date)
+        """
+        if end_date is None:
+            end_date = date.today()
+        if start_date is None:
+            start_date = end_date - timedelta(days=max(days, 1) - 1)
+        return start_date, end_date
+
+    def _fill_daily_series(self, rows: List[Dict[str, Any]], start_date: date, end_date: date,
+                           empty_row: Callable[[], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return one row per day of the window in chronological order.
+
+        Args:
+            rows: Rows keyed by an ISO "date" field (any order, gaps allowed)
+            start_date: First day of the window
+            end_date: Last day of the window
+            empty_row: Factory for the values of a day without data
+
+        Returns:
+            List with exactly one row per day from start_date to end_date
+        """
+        rows_by_date = {row["date"]: row for row in rows}
+        series = []
+        current = start_date
+        while current <= end_date:
+            day = current.isoformat()
+            row = rows_by_date.get(day)
+            if row is None:
+                row = {"date": day, **empty_row()}
+            series.append(row)
+            current += timedelta(days=1)
+        return series
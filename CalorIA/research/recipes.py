@@ -246,6 +246,8 @@ After your thinking, end with the JSON array:"""
 
         # Process each recipe
         added_count = 0
+        new_recipes = []
+        new_names = set()
         for i, recipe_data in enumerate(recipes_data):
             if added_count >= max_recipes:
                 break
@@ -258,26 +260,30 @@ After your thinking, end with the JSON array:"""
                 results.errors += 1
                 continue
 
-            # Check for duplicates
-            if self.is_duplicate_recipe(recipe):
+            # Check for duplicates (in the database and earlier in this batch)
+            if recipe.name.casefold() in new_names or self.is_duplicate_recipe(recipe):
                 click.echo(f"    ⚠️  Duplicate found: {recipe.name}")
                 results.duplicates += 1
                 continue
 
-            # Add recipe
-            if not dry_run:
-                result = self.client.create_recipe(recipe)
-                if result:
+            new_names.add(recipe.name.casefold())
+            added_count += 1
+            if dry_run:
+                click.echo(f"    🔍 Would add: {recipe.name} (dry run)")
+                results.added += 1
+            else:
+                new_recipes.append(recipe)
+
+        # Add the new recipes with bulk writes
+        if new_recipes:
+            result = self.client.create_recipes(new_recipes)
+            for recipe, inserted_id in zip(new_recipes, result["inserted_ids"]):
+                if inserted_id is not None:
                     click.echo(f"    ✅ Added: {recipe.name}")
                     results.added += 1
-                    added_count += 1
                 else:
                     click.echo(f"    ❌ Failed to add: {recipe.name}")
                     results.errors += 1
-            else:
-                click.echo(f"    🔍 Would add: {recipe.name} (dry run)")
-                results.added += 1
-                added_count += 1
 
         return results
 
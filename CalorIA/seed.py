@@ -9,11 +9,12 @@ import os
 import click
 from datetime import datetime, timezone
 from uuid import uuid4, UUID
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from pathlib import Path
 
 from .types import Ingredient, FoodItem, Meal, MealType, IngredientUnit, Recipe, DifficultyLevel, RecipeIngredient, RecipeCategoryModel, RecipeTagModel
 from . import Client
+from .mixins.nutrition import NutritionBatch, stored_nutrition
 
 
 class DatabaseSeeder:
@@ -124,10 +125,14 @@ class DatabaseSeeder:
         
         count = 0
         categories = {}
+        new_ingredients = []
+        
+        # Existing ingredients by case-insensitive name, loaded in one query
+        existing_by_name = self.load_existing_ingredients()
         
         for data in ingredients_data:
             # Check if ingredient already exists (case-insensitive)
-            existing = self.client.get_ingredient_by_name(data['name'])
+            existing = existing_by_name.get(data['name'].casefold())
             if existing:
                 # Cache the existing ingredient
                 self.seeded_ingredients[data['name']] = existing
@@ -152,17 +157,23 @@ class DatabaseSeeder:
                 created_at=datetime.now(timezone.utc),
                 is_system=True  # Mark as system-created
             )
-            
-            result = self.client.create_ingredient(ingredient)
-            if result:
+            new_ingredients.append(ingredient)
+            existing_by_name[ingredient.name.casefold()] = ingredient
+        
+        # Insert the new ingredients with bulk writes
+        result = self.client.create_ingredients(new_ingredients)
+        for ingredient, inserted_id in zip(new_ingredients, result["inserted_ids"]):
+            if inserted_id is not None:
                 count += 1
-                self.seeded_ingredients[data['name']] = ingredient
+                self.seeded_ingredients[ingredient.name] = ingredient
                 
                 # Track by category for progress display
-                category = data['category']
+                category = ingredient.category
                 if category not in categories:
                     categories[category] = 0
                 categories[category] += 1
+        for error in result["errors"]:
+            click.echo(f"   ❌ Failed to create ingredient {new_ingredients[error['index']].name}: {error['message']}")
         
         # Display results by category
         for category, cat_count in categories.items():
@@ -170,6 +181,18 @@ class DatabaseSeeder:
         
         return count
 
+    def load_existing_ingredients(self) -> Dict[str, Ingredient]:
+        """Load every stored ingredient, keyed by case-insensitive name (first one wins)."""
+        ingredients: Dict[str, Ingredient] = {}
+        try:
+            db = self.client.get_db_connection()
+            if db is not None:
+                for doc in db["ingredients"].find({}, {"_id": 0}):
+                    ingredients.setdefault(doc['name'].casefold(), Ingredient.from_dict(doc))
+        except Exception as e:
+            click.echo(f"   ⚠️ Error loading existing ingredients: {e}")
+        return ingredients
+
     def load_categories_from_csv(self) -> List[Dict]:
         """Load category data from CSV file."""
         csv_path = self.seed_data_dir / "recipe_categories.csv"
@@ -206,39 +229,35 @@ class DatabaseSeeder:
 
         click.echo(f" ✓ ({len(categories_data)} found)")
 
-        count = 0
+        new_categories = []
+        existing_slugs = set(self.client.get_category_lookup().by_slug)
         for category_data in categories_data:
             # Check if category already exists
-            try:
-                existing = self.client.get_category_by_slug(category_data['slug'])
-                if existing:
-                    click.echo(f"   • {category_data['name']} (already exists)")
-                    continue
-            except Exception as e:
-                click.echo(f"   ⚠️ Error checking if category exists {category_data['name']}: {e}")
-                # Continue with creation attempt
+            if category_data['slug'] in existing_slugs:
+                click.echo(f"   • {category_data['name']} (already exists)")
+                continue
+            existing_slugs.add(category_data['slug'])
 
             # Create new category
-            category = RecipeCategoryModel(
+            new_categories.append(RecipeCategoryModel(
                 name=category_data['name'],
                 slug=category_data['slug'],
                 description=category_data['description'],
                 color=category_data['color'],
                 icon=category_data['icon'],
                 is_system=True  # Mark as system-created
-            )
+            ))
 
-            try:
-                result = self.client.create_category(category)
-                if result:
-                    count += 1
-                    click.echo(f"   • {category_data['name']}")
-                else:
-                    click.echo(f"   ❌ Failed to create category: {category_data['name']} (result: {result})")
-            except Exception as e:
-                click.echo(f"   ❌ Error creating category {category_data['name']}: {e}")
+        # Insert the new categories with bulk writes
+        result = self.client.create_categories(new_categories)
+        errors = {error['index']: error['message'] for error in result['errors']}
+        for i, category in enumerate(new_categories):
+            if i in errors:
+                click.echo(f"   ❌ Failed to create category: {category.name} ({errors[i]})")
+            else:
+                click.echo(f"   • {category.name}")
 
-        return count
+        return result['inserted']
 
     def load_tags_from_csv(self) -> List[Dict]:
         """Load tag data from CSV file."""
@@ -275,38 +294,34 @@ class DatabaseSeeder:
 
         click.echo(f" ✓ ({len(tags_data)} found)")
 
-        count = 0
+        new_tags = []
+        existing_slugs = set(self.client.get_tag_lookup().by_slug)
         for tag_data in tags_data:
             # Check if tag already exists
-            try:
-                existing = self.client.get_tag_by_slug(tag_data['slug'])
-                if existing:
-                    click.echo(f"   • {tag_data['name']} (already exists)")
-                    continue
-            except Exception as e:
-                click.echo(f"   ⚠️ Error checking if tag exists {tag_data['name']}: {e}")
-                # Continue with creation attempt
+            if tag_data['slug'] in existing_slugs:
+                click.echo(f"   • {tag_data['name']} (already exists)")
+                continue
+            existing_slugs.add(tag_data['slug'])
 
             # Create new tag
-            tag = RecipeTagModel(
+            new_tags.append(RecipeTagModel(
                 name=tag_data['name'],
                 slug=tag_data['slug'],
                 description=tag_data['description'],
                 color=tag_data['color'],
                 is_system=True  # Mark as system-created
-            )
+            ))
 
-            try:
-                result = self.client.create_tag(tag)
-                if result:
-                    count += 1
-                    click.echo(f"   • {tag_data['name']}")
-                else:
-                    click.echo(f"   ❌ Failed to create tag: {tag_data['name']} (result: {result})")
-            except Exception as e:
-                click.echo(f"   ❌ Error creating tag {tag_data['name']}: {e}")
+        # Insert the new tags with bulk writes
+        result = self.client.create_tags(new_tags)
+        errors = {error['index']: error['message'] for error in result['errors']}
+        for i, tag in enumerate(new_tags):
+            if i in errors:
+                click.echo(f"   ❌ Failed to create tag: {tag.name} ({errors[i]})")
+            else:
+                click.echo(f"   • {tag.name}")
 
-        return count
+        return result['inserted']
 
     def seed_recipes(self) -> int:
         """Seed recipes from CSV file."""
@@ -323,18 +338,18 @@ class DatabaseSeeder:
 
         click.echo(f" ✓ ({len(recipes_data)} found)")
 
-        count = 0
+        # Existing recipe names and the category/tag slug maps, one query each
+        existing_names = self.load_existing_recipe_names()
+        categories_by_slug = self.client.get_category_lookup().by_slug
+        tags_by_slug = self.client.get_tag_lookup().by_slug
+
+        # Build every new recipe in memory, computing nutrition in one batch
+        batch = NutritionBatch()
+        pending = []
         for recipe_data in recipes_data:
             # Check if recipe already exists
-            try:
-                db = self.client.get_db_connection()
-                if db is not None:
-                    collection = db["recipes"]
-                    existing = collection.find_one({"name": recipe_data['name']})
-                    if existing:
-                        continue
-            except Exception:
-                pass
+            if recipe_data['name'] in existing_names:
+                continue
 
             # Create RecipeIngredient objects
             recipe_ingredients = []
@@ -355,131 +370,92 @@ class DatabaseSeeder:
                     )
                     recipe_ingredients.append(recipe_ingredient)
 
-            if recipe_ingredients:
-                # Handle category - find dynamic category by slug
-                category_id = None
-
-                # Category is now a raw string from CSV
-                category_value = str(recipe_data['category'])
-
-                # Convert to slug format for lookup
-                category_slug = category_value.lower().replace(' ', '_').replace('-', '_')
-                try:
-                    category_obj = self.client.get_category_by_slug(category_slug)
-                    if category_obj:
-                        category_id = category_obj.id
-                    else:
-                        print(f"⚠️  Skipping recipe '{recipe_data['name']}' - category '{category_value}' not found")
-                        continue  # Skip this recipe
-                except Exception as e:
-                    print(f"⚠️  Skipping recipe '{recipe_data['name']}' - error looking up category '{category_value}': {e}")
-                    continue  # Skip this recipe
-
-                # Calculate nutrition for the recipe
-                nutrition = self.calculate_recipe_nutrition(recipe_ingredients, recipe_data['servings'])
-
-                # Handle tags - convert string tags to tag IDs where possible
-                tag_ids = []
-
-                if recipe_data['tags']:
-                    for tag_name in recipe_data['tags']:
-                        try:
-                            # Convert tag name to slug format (same as how tags are created)
-                            # Handle various separators and formats
-                            tag_slug = str(tag_name).lower().replace(' ', '-').replace('_', '-').replace(',', '').strip('-')
-                            tag_obj = self.client.get_tag_by_slug(tag_slug)
-                            if tag_obj:
-                                tag_ids.append(str(tag_obj.id))
-                            # If tag not found, skip it (don't add to legacy_tags)
-                        except Exception as e:
-                            print(f"Warning: Error processing tag '{tag_name}': {e}")
-
-                # Create recipe with new dynamic format
-                recipe = Recipe(
-                    id=uuid4(),
-                    name=recipe_data['name'],
-                    description=recipe_data['description'],
-                    category_id=category_id,
-                    prep_time_minutes=recipe_data['prep_time_minutes'],
-                    cook_time_minutes=recipe_data['cook_time_minutes'],
-                    servings=recipe_data['servings'],
-                    difficulty=recipe_data['difficulty'],
-                    ingredients=recipe_ingredients,
-                    instructions=recipe_data['instructions'],
-                    tag_ids=tag_ids,
-                    # Store calculated nutrition values
-                    calories_per_serving_stored=nutrition['calories_per_serving'],
-                    protein_per_serving_stored=nutrition['protein_per_serving'],
-                    fat_per_serving_stored=nutrition['fat_per_serving'],
-                    carbs_per_serving_stored=nutrition['carbs_per_serving'],
-                    total_calories_stored=nutrition['total_calories'],
-                    total_protein_stored=nutrition['total_protein'],
-                    total_fat_stored=nutrition['total_fat'],
-                    total_carbs_stored=nutrition['total_carbs'],
-                    is_system=True,  # Mark as system-created
-                    created_at=datetime.now(timezone.utc)
-                )
-
-                result = self.client.create_recipe(recipe)
-                if result:
-                    count += 1
-                    click.echo(f"   • {recipe_data['name']}")
-
-                    # Update usage counts for category and tags
-                    try:
-                        self.client.increment_category_usage(category_id)
-
-                        if tag_ids:
-                            for tag_id in tag_ids:
-                                try:
-                                    self.client.increment_tag_usage(UUID(tag_id))
-                                except (ValueError, TypeError):
-                                    pass
-                    except Exception as e:
-                        print(f"Warning: Failed to update usage counts for recipe {recipe_data['name']}: {e}")
+            if not recipe_ingredients:
+                continue
 
-        return count
+            # Handle category - find dynamic category by slug
+            # Category is now a raw string from CSV
+            category_value = str(recipe_data['category'])
+
+            # Convert to slug format for lookup
+            category_slug = category_value.lower().replace(' ', '_').replace('-', '_')
+            category_obj = categories_by_slug.get(category_slug)
+            if category_obj is None:
+                print(f"⚠️  Skipping recipe '{recipe_data['name']}' - category '{category_value}' not found")
+                continue  # Skip this recipe
+
+            # Handle tags - convert string tags to tag IDs where possible
+            tag_ids = []
+            for tag_name in recipe_data['tags'] or []:
+                # Convert tag name to slug format (same as how tags are created)
+                # Handle various separators and formats
+                tag_slug = str(tag_name).lower().replace(' ', '-').replace('_', '-').replace(',', '').strip('-')
+                tag_obj = tags_by_slug.get(tag_slug)
+                if tag_obj:
+                    tag_ids.append(str(tag_obj.id))
+                # If tag not found, skip it (don't add to legacy_tags)
+
+            batch.add_recipe(recipe_ingredients, recipe_data['servings'])
+            pending.append((recipe_data, recipe_ingredients, category_obj.id, tag_ids))
+            existing_names.add(recipe_data['name'])
+
+        recipes = []
+        for (recipe_data, recipe_ingredients, category_id, tag_ids), nutrition in zip(pending, batch.compute()):
+            # Create recipe with new dynamic format
+            recipes.append(Recipe(
+                id=uuid4(),
+                name=recipe_data['name'],
+                description=recipe_data['description'],
+                category_id=category_id,
+                prep_time_minutes=recipe_data['prep_time_minutes'],
+                cook_time_minutes=recipe_data['cook_time_minutes'],
+                servings=recipe_data['servings'],
+                difficulty=recipe_data['difficulty'],
+                ingredients=recipe_ingredients,
+                instructions=recipe_data['instructions'],
+                tag_ids=tag_ids,
+                # Store calculated nutrition values
+                **stored_nutrition(nutrition),
+                is_system=True,  # Mark as system-created
+                created_at=datetime.now(timezone.utc)
+            ))
+
+        # Insert in chunks of CALORIA_BULK_BATCH_SIZE
+        result = self.client.create_recipes(recipes)
+
+        # Update usage counts for categories and tags, aggregated over the inserted recipes
+        category_counts: Dict[str, int] = {}
+        tag_counts: Dict[str, int] = {}
+        for recipe, inserted_id in zip(recipes, result['inserted_ids']):
+            if inserted_id is None:
+                continue
+            click.echo(f"   • {recipe.name}")
+            category_counts[str(recipe.category_id)] = category_counts.get(str(recipe.category_id), 0) + 1
+            for tag_id in recipe.tag_ids:
+                tag_counts[tag_id] = tag_counts.get(tag_id, 0) + 1
+        for error in result['errors']:
+            click.echo(f"   ❌ Failed to create recipe {recipes[error['index']].name}: {error['message']}")
+
+        self.client.increment_category_usages(category_counts)
+        self.client.increment_tag_usages(tag_counts)
+
+        return result['inserted']
+
+    def load_existing_recipe_names(self) -> Set[str]:
+        """Load the names of every stored recipe."""
+        try:
+            db = self.client.get_db_connection()
+            if db is not None:
+                return {doc['name'] for doc in db["recipes"].find({}, {"name": 1, "_id": 0}) if doc.get('name')}
+        except Exception as e:
+            click.echo(f"   ⚠️ Error loading existing recipe names: {e}")
+        return set()
 
     def calculate_recipe_nutrition(self, recipe_ingredients, servings):
         """Calculate nutrition for a recipe based on its ingredients."""
-        total_calories = 0
-        total_protein = 0
-        total_fat = 0
-        total_carbs = 0
-
-        for ingredient in recipe_ingredients:
-            if ingredient.ingredient and ingredient.amount:
-                # Get nutrition per 100g
-                kcal_per_100g = ingredient.ingredient.kcal_per_100g or 0
-                protein_per_100g = ingredient.ingredient.protein_per_100g or 0
-                fat_per_100g = ingredient.ingredient.fat_per_100g or 0
-                carbs_per_100g = ingredient.ingredient.carbs_per_100g or 0
-
-                # Convert amount to grams
-                amount_in_grams = ingredient.ingredient.amount_to_grams(ingredient.amount, ingredient.unit)
-
-                # Calculate nutrition for this ingredient
-                total_calories += (kcal_per_100g * amount_in_grams) / 100
-                total_protein += (protein_per_100g * amount_in_grams) / 100
-                total_fat += (fat_per_100g * amount_in_grams) / 100
-                total_carbs += (carbs_per_100g * amount_in_grams) / 100
-
-        # Calculate per serving values
-        calories_per_serving = total_calories / servings if servings > 0 else total_calories
-        protein_per_serving = total_protein / servings if servings > 0 else total_protein
-        fat_per_serving = total_fat / servings if servings > 0 else total_fat
-        carbs_per_serving = total_carbs / servings if servings > 0 else total_carbs
-
-        return {
-            'calories_per_serving': round(calories_per_serving, 1),
-            'protein_per_serving': round(protein_per_serving, 1),
-            'fat_per_serving': round(fat_per_serving, 1),
-            'carbs_per_serving': round(carbs_per_serving, 1),
-            'total_calories': round(total_calories, 1),
-            'total_protein': round(total_protein, 1),
-            'total_fat': round(total_fat, 1),
-            'total_carbs': round(total_carbs, 1)
-        }
+        batch = NutritionBatch()
+        batch.add_recipe(recipe_ingredients, servings)
+        return batch.compute()[0]
 
     # Removed seed_meals method - meal seeding deprecated in favor of recipe seeding
     
@@ -544,6 +520,7 @@ class DatabaseSeeder:
             query = {"is_system": True}
             delete_result = collection.delete_many(query)
             results['categories'] = delete_result.deleted_count
+            self.client.invalidate_category_lookup()
             click.echo(f" ✓ Removed {results['categories']} system categories")
         except Exception as e:
             click.echo(f" ❌ Error removing categories: {e}")
@@ -561,6 +538,7 @@ class DatabaseSeeder:
             query = {"is_system": True}
             delete_result = collection.delete_many(query)
             results['tags'] = delete_result.deleted_count
+            self.client.invalidate_tag_lookup()
             click.echo(f" ✓ Removed {results['tags']} system tags")
         except Exception as e:
             click.echo(f" ❌ Error removing tags: {e}")
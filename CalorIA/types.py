@@ -1,7 +1,9 @@
 # types.py
 from __future__ import annotations
+import math
 from enum import Enum
-from typing import Any, Dict, Type, TypeVar, Iterable, List, Optional, Literal, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, Type, TypeVar, Iterable, List, Optional, Literal, Tuple, Union, get_args, get_origin
 from decimal import Decimal
 from uuid import UUID, uuid4
 from datetime import datetime, date, time, timezone
@@ -82,6 +84,33 @@ _CUP_TO_ML = 240.0
 _LITER_TO_ML = 1000.0
 _TBSP_TO_ML = 15.0
 _TSP_TO_ML = 5.0
+_OZ_TO_G = 28.349523125
+
+# Position of each IngredientUnit in a gram factor table (see gram_factors); keyed by member and value,
+# since the str-Enum members hash by name
+UNIT_INDEX: Dict[Any, int] = {unit: i for i, unit in enumerate(IngredientUnit)}
+UNIT_INDEX.update({unit.value: i for i, unit in enumerate(IngredientUnit)})
+
+
+@lru_cache(maxsize=1024)
+def gram_factors(density_g_per_ml: Optional[float], grams_per_unit: Optional[float]) -> Tuple[float, ...]:
+    """
+    Grams in one of each IngredientUnit (UNIT_INDEX order) for an ingredient's conversion data.
+    - volume units use density_g_per_ml, assuming 1 g/ml when it is unknown
+    - UNIT uses grams_per_unit and is NaN when that is unknown
+    Tables depend only on these two values, so ingredients sharing them share one cached tuple.
+    """
+    density = float(density_g_per_ml) if density_g_per_ml is not None else 1.0
+    factors = [math.nan] * len(IngredientUnit)
+    factors[UNIT_INDEX[IngredientUnit.G]] = 1.0
+    factors[UNIT_INDEX[IngredientUnit.ML]] = density
+    factors[UNIT_INDEX[IngredientUnit.TBSP]] = _TBSP_TO_ML * density
+    factors[UNIT_INDEX[IngredientUnit.TSP]] = _TSP_TO_ML * density
+    factors[UNIT_INDEX[IngredientUnit.CUP]] = _CUP_TO_ML * density
+    factors[UNIT_INDEX[IngredientUnit.OZ]] = _OZ_TO_G  # weight ounce
+    if grams_per_unit is not None:
+        factors[UNIT_INDEX[IngredientUnit.UNIT]] = float(grams_per_unit)
+    return tuple(factors)
 
 T = TypeVar("T", bound="CalorIAModel")
 
@@ -116,6 +145,99 @@ def _primitive(value: Any, serialize_datetime: bool = True) -> Any:
     # primitives (str/int/float/bool/None)
     return value
 
+# Per-(model class, by_alias) serializers compiled for CalorIAModel.to_dict
+_serializers: Dict[Tuple[type, bool], Callable[[Any, bool, bool], Dict[str, Any]]] = {}
+
+
+def _serializer_expression(annotation: Any, value: str, namespace: Dict[str, Any]) -> str:
+    """Source expression converting `value` (a non-None field value) to its primitive.
+
+    Mirrors what pydantic's dict() followed by _primitive() produce for the
+    declared type; anything not recognised goes through _primitive itself.
+    """
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return _serializer_expression(args[0], value, namespace)
+    elif origin in (list, set, tuple):
+        args = get_args(annotation)
+        if len(args) == 1 or (len(args) == 2 and args[1] is Ellipsis):
+            item = _serializer_expression(args[0], "x", namespace)
+            if item == "x":
+                return f"list({value})"
+            return f"[None if x is None else {item} for x in {value}]"
+    elif origin is dict:
+        args = get_args(annotation)
+        if len(args) == 2 and args[0] is str:
+            item = _serializer_expression(args[1], "x", namespace)
+            if item == "x":
+                return f"dict({value})"
+            if not item.startswith("primitive("):
+                return f"{{k: None if x is None else {item} for k, x in {value}.items()}}"
+    elif isinstance(annotation, type):
+        if issubclass(annotation, CalorIAModel):
+            name = f"dump_{len(namespace)}"
+            namespace[name] = _nested_serializer(annotation)
+            return f"{name}({value}, exclude_none, serialize_datetime, by_alias)"
+        if issubclass(annotation, Enum):
+            return f"{value}.value"
+        if annotation is UUID:
+            return f"str({value})"
+        if annotation in (datetime, date, time):
+            return f"({value}.isoformat() if serialize_datetime else {value})"
+        if annotation is Decimal:
+            return f"float({value})"
+        if annotation in (str, int, float, bool):
+            return value
+    return f"primitive({value}, serialize_datetime)"
+
+
+def _nested_serializer(model_cls: Type["CalorIAModel"]) -> Callable[..., Dict[str, Any]]:
+    """Serializer for a nested model field, compiled lazily (the class may be defined later)."""
+    def dump(model: Any, exclude_none: bool, serialize_datetime: bool, by_alias: bool) -> Any:
+        if not isinstance(model, model_cls):
+            return _primitive(model, serialize_datetime)
+        serializer = _serializers.get((model_cls, by_alias)) or _compile_serializer(model_cls, by_alias)
+        return serializer(model, exclude_none, serialize_datetime)
+    return dump
+
+
+def _compile_serializer(cls: Type["CalorIAModel"], by_alias: bool) -> Callable[[Any, bool, bool], Dict[str, Any]]:
+    """Compile (once per class) the serializer used by to_dict.
+
+    It is generated source with one block per field, so a dump walks the model once and converts each value by its declared type.
+    Nested models are serialized by their declared class, as pydantic does.
+    """
+    if not getattr(cls, '__pydantic_complete__', True):
+        cls.model_rebuild()
+
+    namespace: Dict[str, Any] = {"primitive": _primitive}
+    lines = [
+        "def dump(model, exclude_none, serialize_datetime):",
+        f"    by_alias = {by_alias!r}",
+        "    fields = model.__dict__",
+        "    out = {}",
+    ]
+    for name, field in cls.model_fields.items():
+        key = field.alias if by_alias and field.alias else name
+        expression = _serializer_expression(field.annotation, "v", namespace)
+        lines += [
+            f"    v = fields[{name!r}]",
+            "    if v is None:",
+            "        if not exclude_none:",
+            f"            out[{key!r}] = None",
+            "    else:",
+            f"        out[{key!r}] = {expression}",
+        ]
+    lines.append("    return out")
+    exec("\n".join(lines), namespace)
+
+    dump = namespace["dump"]
+    _serializers[(cls, by_alias)] = dump
+    return dump
+
+
 class CalorIAModel(BaseModel):
     """
     Base model that provides:
@@ -136,9 +258,14 @@ class CalorIAModel(BaseModel):
         - by_alias: use field aliases if defined
         - serialize_datetime: convert datetimes/dates/times to ISO strings (True) or keep as native objects (False)
         """
-        # use pydantic's dict() to get field structure, then convert leaves to primitives
-        raw = super().dict(exclude_none=exclude_none, by_alias=by_alias)
-        return _primitive(raw, serialize_datetime=serialize_datetime)
+        serializer = _serializers.get((type(self), by_alias)) or _compile_serializer(type(self), by_alias)
+        try:
+            return serializer(self, exclude_none, serialize_datetime)
+        except (AttributeError, KeyError, TypeError):
+            # Values that do not match their declared types (e.g. from model_construct):
+            # use pydantic's dict() to get field structure, then convert leaves to primitives
+            raw = super().model_dump(exclude_none=exclude_none, by_alias=by_alias)
+            return _primitive(raw, serialize_datetime=serialize_datetime)
 
     @classmethod
     def from_dict(cls: Type[T], data: Dict[str, Any], /) -> T:
@@ -147,8 +274,9 @@ class CalorIAModel(BaseModel):
         This uses pydantic's parsing which handles UUIDs, datetimes, Enums, nested models, etc.
         """
         try:
-            # parse_obj allows nested parsing, accepts many primitive representations
-            return cls.parse_obj(data)
+            # model_validate allows nested parsing, accepts many primitive representations
+            # (parse_obj is its deprecated alias and pays for a warning on every call)
+            return cls.model_validate(data)
         except ValidationError as exc:
             # re-raise with a helpful message (caller can catch)
             raise
@@ -268,11 +396,19 @@ class MealItem(CalorIAModel):
     sodium_mg: float = Field(0.0, ge=0.0)
 
 class Meal(CalorIAModel):
+    id: UUID = Field(default_factory=uuid4)
     user_id: UUID
     meal_type: MealType
     food_items: List["FoodItem"]
     notes: Optional[str] = None
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    on_date: Optional[date] = Field(None, description="Calendar date of the meal (indexed, derived from timestamp)")
+
+    @validator("on_date", always=True)
+    def default_on_date_from_timestamp(cls, v, values):
+        if v is None and values.get("timestamp") is not None:
+            return values["timestamp"].date()
+        return v
 
     def total_calories(self) -> int:
         return sum(item.calories for item in self.food_items)
@@ -282,11 +418,31 @@ class DailyLog(CalorIAModel):
     log_date: date = Field(default_factory=lambda: datetime.now(timezone.utc).date())
     meals: List["Meal"] = Field(default_factory=list)
     goal_calories: Optional[int] = None
+    meal_count: int = Field(0, description="Number of meals, $inc'ed together with every $push to meals")
+    totals: Dict[str, float] = Field(default_factory=dict, description="Nutrient sums of the meals (ROLLUP_NUTRIENT_FIELDS), $inc'ed on every append")
 
     def total_calories(self) -> int:
         return sum(m.total_calories() for m in self.meals)
 
 
+class DailyRollup(CalorIAModel):
+    """Materialized per-user daily totals, kept up to date on every meal/water/activity/weight write."""
+    user_id: UUID
+    on_date: date
+    calories: float = 0
+    protein_g: float = 0
+    carbs_g: float = 0
+    fat_g: float = 0
+    fiber_g: float = 0
+    sugar_g: float = 0
+    sodium_mg: float = 0
+    water_ml: float = 0
+    burned_calories: float = 0
+    meal_count: int = 0
+    latest_weight_kg: Optional[float] = None
+    updated_at: Optional[datetime] = None
+
+
 class Recipe(CalorIAModel):
     """Recipe model for storing recipe templates that can be used to create meals."""
     id: UUID = Field(default_factory=uuid4)
@@ -321,7 +477,7 @@ class Recipe(CalorIAModel):
 
     def total_calories(self) -> int:
         """Calculate total calories for the entire recipe (all servings)."""
-        return sum(ingredient.calories() or 0 for ingredient in self.ingredients if ingredient.calories() is not None)
+        return sum(calories for calories in (ingredient.calories() for ingredient in self.ingredients) if calories)
 
     def calories_per_serving(self) -> float:
         """Calculate calories per serving."""
@@ -479,47 +635,46 @@ class Ingredient(CalorIAModel):
         # This will be called via the client instance
         return self.name  # Placeholder - will be overridden by mixin method
 
+    def gram_factors(self) -> Tuple[float, ...]:
+        """Grams in one of each IngredientUnit (UNIT_INDEX order), NaN where unknown; cached."""
+        return gram_factors(self.density_g_per_ml, self.grams_per_unit)
+
+    def grams_or_nan(self, amount: float, unit: IngredientUnit) -> float:
+        """
+        Convert amount in `unit` to grams through the cached gram factor table.
+        Returns NaN when the conversion is unknown (unit without grams_per_unit, unsupported unit).
+        """
+        index = UNIT_INDEX.get(unit)
+        if index is None:
+            return math.nan
+        return float(amount) * self.gram_factors()[index]
+
     def amount_to_grams(self, amount: float, unit: IngredientUnit) -> float:
         """
         Convert amount in `unit` to grams using best available data.
         Fallback assumptions:
          - ml -> grams: uses density_g_per_ml if present, else assumes 1 g/ml
-         - cup/tbsp/tsp/oz -> convert to ml then to grams (assume 1 g/ml unless density given)
+         - cup/tbsp/tsp -> convert to ml then to grams (assume 1 g/ml unless density given)
+         - oz -> weight ounce (28.35 g)
          - unit -> uses grams_per_unit (must be provided) otherwise raises ValueError
         """
-        if unit == IngredientUnit.G:
-            return float(amount)
-        if unit == IngredientUnit.ML:
-            density = self.density_g_per_ml if self.density_g_per_ml is not None else 1.0
-            return float(amount) * density
-        if unit == IngredientUnit.TBSP:
-            ml = float(amount) * _TBSP_TO_ML
-            density = self.density_g_per_ml if self.density_g_per_ml is not None else 1.0
-            return ml * density
-        if unit == IngredientUnit.TSP:
-            ml = float(amount) * _TSP_TO_ML
-            density = self.density_g_per_ml if self.density_g_per_ml is not None else 1.0
-            return ml * density
-        if unit == IngredientUnit.CUP:
-            ml = float(amount) * _CUP_TO_ML
-            density = self.density_g_per_ml if self.density_g_per_ml is not None else 1.0
-            return ml * density
-        if unit == IngredientUnit.OZ:
-            # oz as weight -> convert to grams (1 oz = 28.3495 g)
-            return float(amount) * 28.349523125
-        if unit == IngredientUnit.UNIT:
-            if self.grams_per_unit is None:
+        grams = self.grams_or_nan(amount, unit)
+        if math.isnan(grams):
+            if UNIT_INDEX.get(unit) == UNIT_INDEX[IngredientUnit.UNIT]:
                 raise ValueError("grams_per_unit required to convert 'unit' to grams for this ingredient")
-            return float(amount) * float(self.grams_per_unit)
-        raise ValueError(f"Unsupported unit: {unit}")
+            raise ValueError(f"Unsupported unit: {unit}")
+        return grams
 
     def calories_for(self, amount: float, unit: IngredientUnit) -> Optional[float]:
         """
-        Return calories for given amount+unit. Returns None if kcal_per_100g not set.
+        Return calories for given amount+unit. Returns None if kcal_per_100g not set
+        or the amount cannot be converted to grams.
         """
         if self.kcal_per_100g is None:
             return None
-        grams = self.amount_to_grams(amount, unit)
+        grams = self.grams_or_nan(amount, unit)
+        if math.isnan(grams):
+            return None
         return float(self.kcal_per_100g) * (grams / 100.0)
 
 class RecipeIngredient(CalorIAModel):
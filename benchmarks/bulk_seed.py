@@ -0,0 +1,118 @@
+"""Benchmark recipe seeding: per-recipe lookups and inserts vs. the bulk DatabaseSeeder.seed_recipes pipeline.
+
+Runs against the MongoDB configured by MONGODB_URI. It creates one synthetic
+category and tag, seeds synthetic recipes through both paths and removes
+everything it created afterwards. The per-recipe path replays the former
+seed_recipes (find_one by name, category and tag lookups by slug,
+create_recipe and usage increments per recipe) on a sample of --sample
+recipes and is extrapolated to the full catalog.
+
+Usage:
+    python benchmarks/bulk_seed.py --recipes 100000 --sample 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CalorIA import types as Type
+from CalorIA.mixins.nutrition import stored_nutrition
+from CalorIA.seed import DatabaseSeeder
+
+
+class SyntheticSeeder(DatabaseSeeder):
+    """Seeds generated recipes (in the load_recipes_from_csv format) instead of the CSV file."""
+
+    def __init__(self, recipes):
+        super().__init__()
+        self.recipes = recipes
+
+    def load_recipes_from_csv(self):
+        return self.recipes
+
+
+def synthetic_catalog(count, prefix, category_slug, tag_slug, ingredient_names):
+    random.seed(42)
+    return [{
+        'name': f"{prefix} {i}", 'category': category_slug, 'prep_time_minutes': 10, 'cook_time_minutes': 20,
+        'servings': random.randint(1, 6), 'difficulty': Type.DifficultyLevel.EASY, 'tags': [tag_slug],
+        'description': "Synthetic benchmark recipe", 'instructions': ["Cook"],
+        'ingredients': [{'name': name, 'amount': random.uniform(10, 300), 'unit': Type.IngredientUnit.G}
+                        for name in random.sample(ingredient_names, 6)],
+    } for i in range(count)]
+
+
+def per_recipe(seeder, recipes):
+    """The former seed_recipes loop, without its CSV parsing."""
+    db = seeder.client.get_db_connection()
+    for recipe_data in recipes:
+        if db["recipes"].find_one({"name": recipe_data['name']}):
+            continue
+        recipe_ingredients = [Type.RecipeIngredient(ingredient_id=seeder.seeded_ingredients[line['name']].id,
+                                                    ingredient=seeder.seeded_ingredients[line['name']],
+                                                    amount=line['amount'], unit=line['unit'])
+                              for line in recipe_data['ingredients']]
+        category = seeder.client.get_category_by_slug(recipe_data['category'])
+        tag_ids = [str(seeder.client.get_tag_by_slug(tag).id) for tag in recipe_data['tags']]
+        nutrition = seeder.calculate_recipe_nutrition(recipe_ingredients, recipe_data['servings'])
+        recipe = Type.Recipe(name=recipe_data['name'], description=recipe_data['description'], category_id=category.id,
+                             prep_time_minutes=recipe_data['prep_time_minutes'],
+                             cook_time_minutes=recipe_data['cook_time_minutes'], servings=recipe_data['servings'],
+                             difficulty=recipe_data['difficulty'], ingredients=recipe_ingredients,
+                             instructions=recipe_data['instructions'], tag_ids=tag_ids,
+                             **stored_nutrition(nutrition), is_system=True)
+        if seeder.client.create_recipe(recipe):
+            seeder.client.increment_category_usage(category.id)
+            for tag_id in tag_ids:
+                seeder.client.increment_tag_usage(tag_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=100000, help="Synthetic recipes seeded by the bulk pipeline")
+    parser.add_argument("--sample", type=int, default=500, help="Recipes seeded one by one (extrapolated)")
+    args = parser.parse_args()
+
+    run = uuid4().hex[:8]
+    category_slug, tag_slug = f"bench_{run}", f"bench-{run}"
+    bulk = SyntheticSeeder(synthetic_catalog(args.recipes, f"Bench {run} bulk", category_slug, tag_slug,
+                                             [f"Ingredient {i}" for i in range(200)]))
+    client = bulk.client
+    if client.get_db_connection() is None:
+        sys.exit("Failed to connect to MongoDB (check MONGODB_URI)")
+    bulk.seeded_ingredients = {f"Ingredient {i}": Type.Ingredient(name=f"Ingredient {i}", kcal_per_100g=100 + i,
+                                                                  protein_per_100g=5, fat_per_100g=3, carbs_per_100g=10)
+                               for i in range(200)}
+
+    category = Type.RecipeCategoryModel(name=f"Bench {run}", slug=category_slug)
+    tag = Type.RecipeTagModel(name=f"Bench {run}", slug=tag_slug)
+    client.create_category(category)
+    client.create_tag(tag)
+    try:
+        sample = synthetic_catalog(args.sample, f"Bench {run} single", category_slug, tag_slug,
+                                   list(bulk.seeded_ingredients))
+        start = time.perf_counter()
+        per_recipe(bulk, sample)
+        single_s = (time.perf_counter() - start) / max(args.sample, 1) * args.recipes
+
+        start = time.perf_counter()
+        seeded = bulk.seed_recipes()
+        bulk_s = time.perf_counter() - start
+    finally:
+        db = client.get_db_connection()
+        db["recipes"].delete_many({"category_id": str(category.id)})
+        client.delete_category(category.id)
+        client.delete_tag(tag.id)
+
+    print(f"\n{seeded} of {args.recipes} recipes seeded by the bulk pipeline\n")
+    print(f"{'path':<34}{'seconds':>10}{'speedup':>10}")
+    print(f"{'per-recipe (extrapolated)':<34}{single_s:>10.1f}{1:>9.1f}x")
+    print(f"{'DatabaseSeeder.seed_recipes':<34}{bulk_s:>10.1f}{single_s / bulk_s:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
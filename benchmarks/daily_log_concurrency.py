@@ -0,0 +1,113 @@
+"""Benchmark concurrent meal logging: read-modify-write daily log vs. the atomic add_meal_to_log upsert.
+
+Runs against the MongoDB configured by MONGODB_URI. Several threads append
+meals to the same user's daily log at once; afterwards the stored log is
+checked for lost meals and for totals that drifted from its meals. The
+read-modify-write path is the former add_meal_to_log (get the log, append,
+write the whole document back). Each path uses its own synthetic user, whose
+data is removed afterwards. Exits with status 1 if the atomic path lost or
+failed meals, created more than one log or let its totals drift, so it can
+serve as a regression check (the read-modify-write path is expected to lose
+meals and only reported).
+
+Usage:
+    python benchmarks/daily_log_concurrency.py --threads 8 --meals 50
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CalorIA as caloria
+from CalorIA import types as Type
+
+
+def make_meal(user_id, i):
+    return Type.Meal(user_id=user_id, meal_type=list(Type.MealType)[i % len(Type.MealType)],
+                     food_items=[Type.FoodItem(name=f"item {i}", calories=100, protein_g=5, carbs_g=10, fat_g=3)])
+
+
+def read_modify_write(client, user_id, meal):
+    """The former add_meal_to_log: the last writer replaces the meals appended since its read."""
+    query = {"user_id": str(user_id), "log_date": datetime.now().date().isoformat()}
+    daily_log = client.get_document("daily_logs", query, Type.DailyLog)
+    if daily_log:
+        daily_log.meals.append(meal)
+        return client.update_document("daily_logs", query, daily_log.to_dict())
+    return client.create_document("daily_logs", Type.DailyLog(user_id=user_id, meals=[meal])) is not None
+
+
+def atomic(client, user_id, meal):
+    return client.add_meal_to_log(user_id, meal)
+
+
+def run(add, client, threads, meals):
+    """Log threads * meals meals for a fresh user and check the resulting log."""
+    user_id = uuid4()
+    barrier = threading.Barrier(threads)
+    failures = []
+
+    def worker(offset):
+        barrier.wait()
+        for i in range(meals):
+            if not add(client, user_id, make_meal(user_id, offset * meals + i)):
+                failures.append(i)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    db = client.get_db_connection()
+    try:
+        logs = list(db["daily_logs"].find({"user_id": str(user_id)}))
+    finally:
+        db["daily_logs"].delete_many({"user_id": str(user_id)})
+    stored = sum(len(log.get("meals") or []) for log in logs)
+    counted = sum(log.get("meal_count", 0) for log in logs)
+    calories = sum((log.get("totals") or {}).get("calories", 0) for log in logs)
+    return {
+        "ms": elapsed * 1000,
+        "logs": len(logs),
+        "lost": threads * meals - stored,
+        "failed": len(failures),
+        "totals_ok": counted == stored and calories == stored * 100,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent writers")
+    parser.add_argument("--meals", type=int, default=50, help="Meals logged by each writer")
+    args = parser.parse_args()
+
+    client = caloria.Client()
+    if client.get_db_connection() is None:
+        sys.exit("Failed to connect to MongoDB (check MONGODB_URI)")
+
+    results = {
+        "read-modify-write": run(read_modify_write, client, args.threads, args.meals),
+        "add_meal_to_log (atomic)": run(atomic, client, args.threads, args.meals),
+    }
+
+    print(f"{args.threads} threads x {args.meals} meals = {args.threads * args.meals} meals per path\n")
+    print(f"{'path':<26}{'ms':>10}{'logs':>6}{'lost':>7}{'failed':>8}{'totals':>8}")
+    for name, stats in results.items():
+        totals = "ok" if stats["totals_ok"] else "-"
+        print(f"{name:<26}{stats['ms']:>10.0f}{stats['logs']:>6}{stats['lost']:>7}{stats['failed']:>8}{totals:>8}")
+
+    atomic_stats = results["add_meal_to_log (atomic)"]
+    if atomic_stats["lost"] or atomic_stats["failed"] or atomic_stats["logs"] != 1 or not atomic_stats["totals_ok"]:
+        sys.exit("\nFAILED: add_meal_to_log lost meals or miscounted the daily log")
+
+
+if __name__ == "__main__":
+    main()
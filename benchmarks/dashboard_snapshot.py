@@ -0,0 +1,110 @@
+"""Benchmark the dashboard data load: six sequential reads vs. get_dashboard_snapshot.
+
+Runs against the MongoDB configured by MONGODB_URI. It seeds one synthetic
+user with a day of meals, water, activity and weight entries, times both
+paths and removes the seeded data afterwards.
+
+Usage:
+    python benchmarks/dashboard_snapshot.py --iterations 500 --meals 6
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CalorIA as caloria
+from CalorIA import types as Type
+
+
+def seed(client, user_id, meals):
+    """Create a user with a day of entries and build its daily rollup."""
+    client.create_user(Type.User(
+        user_id=user_id,
+        name="Benchmark User",
+        email=f"bench-{user_id}@example.com",
+        password_hash="-",
+        preferences=Type.UserPreferences(sex=list(Type.Sex)[0], height=175, daily_calorie_goal=2000)
+    ))
+    for i in range(meals):
+        client.add_meal_entry(Type.Meal(
+            user_id=user_id,
+            meal_type=list(Type.MealType)[i % len(Type.MealType)],
+            food_items=[Type.FoodItem(name=f"item {i}-{j}", calories=100 + j, protein_g=5, carbs_g=10, fat_g=3)
+                        for j in range(4)],
+            timestamp=datetime.now(timezone.utc)
+        ))
+    client.add_water_entry(Type.WaterEntry(user_id=user_id, amount=500))
+    client.add_activity_entry(Type.ActivityEntry(user_id=user_id, activity_name="Run", duration_minutes=30,
+                                                 calories_burned=300))
+    client.add_weight_entry(Type.WeightEntry(user_id=user_id, weight=72.5))
+
+
+def cleanup(client, user_id):
+    db = client.get_db_connection()
+    for collection in ("users", "meals", "water_entries", "activity_entries", "weight_entries", "daily_rollups"):
+        db[collection].delete_many({"user_id": str(user_id)})
+
+
+def sequential(client, user_id, day):
+    """The six reads the dashboard endpoint used to make one after another."""
+    client.get_user_by_id(user_id)
+    client.get_user_nutritional_summary(user_id, day)
+    client.get_user_daily_activity(user_id, day)
+    client.get_latest_weight_entry(user_id)
+    client.get_user_daily_water_log(user_id, day)
+    client.get_user_daily_meals(user_id, day)
+
+
+def snapshot(client, user_id, day):
+    client.get_dashboard_snapshot(user_id, day)
+
+
+def measure(func, client, user_id, day, iterations):
+    for _ in range(min(20, iterations)):  # warm up the connection pool and plan cache
+        func(client, user_id, day)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(client, user_id, day)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "mean": statistics.fmean(samples)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--meals", type=int, default=5, help="Meals logged on the benchmark day")
+    args = parser.parse_args()
+
+    client = caloria.Client()
+    if client.get_db_connection() is None:
+        sys.exit("Failed to connect to MongoDB (check MONGODB_URI)")
+
+    user_id = uuid4()
+    day = date.today()
+    seed(client, user_id, args.meals)
+    try:
+        results = {
+            "sequential (6 reads)": measure(sequential, client, user_id, day, args.iterations),
+            "get_dashboard_snapshot": measure(snapshot, client, user_id, day, args.iterations)
+        }
+    finally:
+        cleanup(client, user_id)
+
+    print(f"{'path':<26}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<26}{stats['p50']:>10.2f}{stats['p99']:>10.2f}{stats['mean']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
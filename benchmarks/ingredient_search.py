@@ -0,0 +1,79 @@
+"""Microbenchmark ingredient autocomplete: regex scan over every ingredient vs. the in-memory search index.
+
+The regex baseline runs the old search filter (unanchored, case-insensitive
+on name and aliases) in-process over the same documents and sorts by name;
+it leaves out the MongoDB round trip, so it understates the old cost. No
+database needed.
+
+Usage:
+    python benchmarks/ingredient_search.py --ingredients 5000 --number 200
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import timeit
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from CalorIA.mixins.search_index import IngredientSearchIndex
+
+WORDS = ["chicken", "beef", "pork", "salmon", "tuna", "rice", "brown", "white", "wild", "green", "red", "black",
+         "bean", "lentil", "pepper", "tomato", "cherry", "apple", "banana", "oat", "flour", "whole", "wheat",
+         "almond", "milk", "butter", "cheese", "cheddar", "yogurt", "greek", "olive", "oil", "sweet", "potato",
+         "spinach", "kale", "onion", "garlic", "ginger", "lemon", "lime", "honey", "maple", "syrup", "egg"]
+
+QUERIES = {"prefix": "chi", "two words": "brown ri", "exact name": "olive oil", "typo": "spinnach"}
+
+
+def ingredient_documents(count):
+    random.seed(42)
+    docs = []
+    for i in range(count):
+        name = " ".join(random.sample(WORDS, random.randint(1, 3))).title()
+        docs.append({"_id": ObjectId(), "id": str(uuid4()), "name": f"{name} {i}", "aliases": [random.choice(WORDS)],
+                     "tags": [random.choice(WORDS)], "category": "Benchmark", "default_unit": "g",
+                     "popularity_score": random.uniform(0, 100), "is_system": True})
+    return docs
+
+
+def regex_search(docs, term, limit):
+    pattern = re.compile(term, re.IGNORECASE)
+    matches = [doc for doc in docs if pattern.search(doc["name"]) or any(pattern.search(a) for a in doc["aliases"])]
+    return sorted(matches, key=lambda doc: doc["name"])[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ingredients", type=int, default=5000, help="Synthetic ingredients to index")
+    parser.add_argument("--number", type=int, default=200, help="Searches per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements (best is reported)")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    args = parser.parse_args()
+
+    docs = ingredient_documents(args.ingredients)
+    index = IngredientSearchIndex()
+    start = time.perf_counter()
+    index.load(docs)
+    print(f"Indexed {len(index)} ingredients in {(time.perf_counter() - start) * 1000:.0f}ms\n")
+
+    print(f"{'query':<22}{'regex us':>10}{'index us':>10}{'speedup':>10}{'matches':>9}")
+    for label, term in QUERIES.items():
+        timings = {}
+        searches = (("regex", lambda: regex_search(docs, term, args.limit)),
+                    ("index", lambda: index.search(term, limit=args.limit)))
+        for name, search in searches:
+            best = min(timeit.repeat(search, number=args.number, repeat=args.repeat))
+            timings[name] = best / args.number * 1e6
+        total = index.search(term, limit=args.limit)[1]
+        print(f"{label + ' ' + repr(term):<22}{timings['regex']:>10.0f}{timings['index']:>10.0f}"
+              f"{timings['regex'] / timings['index']:>9.1f}x{total:>9}")
+
+
+if __name__ == "__main__":
+    main()
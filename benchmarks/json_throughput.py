@@ -0,0 +1,109 @@
+"""Benchmark listing throughput: to_dict() + stdlib JSON vs. the app's orjson provider.
+
+Runs the Flask app in-process (test client) against the MongoDB configured by
+MONGODB_URI. It seeds synthetic recipes and ingredients, requests
+/api/recipes and /api/ingredients with each encoder and removes the seeded
+data afterwards.
+
+Usage:
+    python benchmarks/json_throughput.py --recipes 200 --ingredients 500 --requests 200
+"""
+import argparse
+import os
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+
+import CalorIA as caloria
+from CalorIA import types as Type
+from CalorIA.backend.app import create_app
+from CalorIA.backend.json_provider import CalorIAJSONProvider, ORJSON_AVAILABLE
+from model_loading import recipe_document
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """How responses were encoded before: every model through to_dict(), then the stdlib encoder."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Type.CalorIAModel):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+
+def seed(client, recipes, ingredients):
+    recipe_ids = []
+    for _ in range(recipes):
+        recipe = Type.Recipe.from_dict(recipe_document())
+        client.create_recipe(recipe)
+        recipe_ids.append(str(recipe.id))
+    ingredient_ids = []
+    for i in range(ingredients):
+        ingredient = Type.Ingredient(name=f"Benchmark ingredient {uuid4()}", slug=f"benchmark-{i}",
+                                     aliases=["bench"], category="Benchmark", kcal_per_100g=100.0 + i,
+                                     protein_per_100g=3.0, fat_per_100g=1.0, carbs_per_100g=20.0)
+        client.create_ingredient(ingredient)
+        ingredient_ids.append(str(ingredient.id))
+    return recipe_ids, ingredient_ids
+
+
+def cleanup(client, recipe_ids, ingredient_ids):
+    db = client.get_db_connection()
+    db["recipes"].delete_many({"id": {"$in": recipe_ids}})
+    db["ingredients"].delete_many({"id": {"$in": ingredient_ids}})
+
+
+def throughput(test_client, url, requests):
+    for _ in range(min(10, requests)):  # warm up
+        test_client.get(url)
+    start = time.perf_counter()
+    size = 0
+    for _ in range(requests):
+        response = test_client.get(url)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        size = len(response.get_data())
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=200, help="Recipes to seed (and list)")
+    parser.add_argument("--ingredients", type=int, default=500, help="Ingredients to seed (and list)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and encoder")
+    args = parser.parse_args()
+
+    if not ORJSON_AVAILABLE:
+        print("orjson is not installed (pip install orjson): both runs use the stdlib encoder")
+
+    client = caloria.Client()
+    if client.get_db_connection() is None:
+        sys.exit("Failed to connect to MongoDB (check MONGODB_URI)")
+
+    app = create_app()
+    test_client = app.test_client()
+    urls = [f"/api/recipes?limit={args.recipes}", f"/api/ingredients?limit={args.ingredients}"]
+    encoders = {"to_dict + stdlib": StdlibJSONProvider(app), "CalorIAJSONProvider": CalorIAJSONProvider(app)}
+
+    recipe_ids, ingredient_ids = seed(client, args.recipes, args.ingredients)
+    try:
+        results = []
+        for url in urls:
+            for name, provider in encoders.items():
+                app.json = provider
+                requests_per_second, size = throughput(test_client, url, args.requests)
+                results.append((url.split("?")[0], name, requests_per_second, size))
+    finally:
+        cleanup(client, recipe_ids, ingredient_ids)
+
+    print(f"{'endpoint':<18}{'encoder':<22}{'req/s':>10}{'body KB':>10}")
+    for url, name, requests_per_second, size in results:
+        print(f"{url:<18}{name:<22}{requests_per_second:>10.1f}{size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
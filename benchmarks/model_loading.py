@@ -0,0 +1,79 @@
+"""Microbenchmark loading stored documents into models: deprecated parse_obj vs. from_dict (model_validate).
+
+Pydantic 2 keeps parse_obj as an alias that emits a deprecation warning on
+every call; from_dict calls model_validate directly. Uses realistic
+in-memory recipe and meal documents, no database needed.
+
+Usage:
+    python benchmarks/model_loading.py --number 2000
+"""
+import argparse
+import os
+import sys
+import timeit
+import warnings
+from datetime import datetime, timezone
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CalorIA import types as Type
+
+
+def recipe_document(ingredient_count=12):
+    """A stored recipe with populated category, tags and full ingredient objects."""
+    ingredients = []
+    for i in range(ingredient_count):
+        ingredient = Type.Ingredient(
+            id=uuid4(), name=f"Ingredient {i}", slug=f"ingredient-{i}", aliases=[f"alias {i}"],
+            category="Vegetables", default_unit=Type.IngredientUnit.G, kcal_per_100g=120.0 + i,
+            protein_per_100g=4.5, fat_per_100g=1.2, carbs_per_100g=20.0, tags=["vegan"],
+            created_at=datetime.now(timezone.utc), is_system=True
+        )
+        ingredients.append(Type.RecipeIngredient(ingredient_id=ingredient.id, ingredient=ingredient,
+                                                 amount=50 + i, unit=Type.IngredientUnit.G))
+    recipe = Type.Recipe(
+        name="Vegetable Stir Fry", description="Quick weeknight dinner", category_id=uuid4(),
+        category=Type.RecipeCategoryModel(name="Dinner", slug="dinner"),
+        prep_time_minutes=15, cook_time_minutes=10, servings=4, ingredients=ingredients,
+        instructions=[f"Step {i}" for i in range(6)], tag_ids=[uuid4(), uuid4()],
+        tags=[Type.RecipeTagModel(name="Vegan", slug="vegan"), Type.RecipeTagModel(name="Quick", slug="quick")],
+        calories_per_serving_stored=420.0, total_calories_stored=1680.0
+    )
+    return recipe.to_dict()
+
+
+def meal_document(item_count=5):
+    meal = Type.Meal(
+        user_id=uuid4(), meal_type=Type.MealType.LUNCH, notes="Office lunch",
+        food_items=[Type.FoodItem(name=f"Food {i}", calories=150 + i, protein_g=10.0, carbs_g=15.0,
+                                  fat_g=5.0, portion_size="100 g") for i in range(item_count)]
+    )
+    return meal.to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Loads per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements (best is reported)")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    cases = {
+        "Recipe (12 ingredients)": (Type.Recipe, recipe_document()),
+        "Meal (5 food items)": (Type.Meal, meal_document()),
+    }
+
+    print(f"{'document':<26}{'parse_obj us':>14}{'from_dict us':>14}{'speedup':>10}")
+    for name, (model, doc) in cases.items():
+        assert model.from_dict(doc) == model.parse_obj(doc)
+        timings = {}
+        for loader in ("parse_obj", "from_dict"):
+            load = getattr(model, loader)
+            best = min(timeit.repeat(lambda: load(doc), number=args.number, repeat=args.repeat))
+            timings[loader] = best / args.number * 1e6
+        print(f"{name:<26}{timings['parse_obj']:>14.1f}{timings['from_dict']:>14.1f}"
+              f"{timings['parse_obj'] / timings['from_dict']:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Microbenchmark to_dict: generic dict() + _primitive walk vs. the compiled per-class serializer.
+
+Uses realistic in-memory models, no database needed.
+
+Usage:
+    python benchmarks/model_serialization.py --number 2000
+"""
+import argparse
+import os
+import sys
+import timeit
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import BaseModel
+
+from CalorIA import types as Type
+from model_loading import recipe_document
+
+
+def meal_prep_profile():
+    return Type.MealPrepProfile(
+        user_id=uuid4(), profile_name="Cutting plan", goal="lose_weight", weight=82.5, weight_unit="kg",
+        height=180, height_unit="cm", age=34, activity_level="moderate", meals_per_day="3",
+        allergies=["peanuts", "shellfish"], intolerances=["lactose"], dietary_preference="omnivore",
+        ingredient_preferences={f"ingredient {i}": "like" if i % 2 else "dislike" for i in range(20)},
+        excluded_ingredients=["cilantro"], loved_meals=["chili", "curry"], hated_meals=["liver"],
+        cooking_time="30min", batch_cooking="yes", kitchen_equipment=["oven", "blender", "air fryer"],
+        skill_level="intermediate", meal_times=Type.MealTimes(breakfast="07:30", lunch="12:30", dinner="19:00"),
+        want_snacks="yes", snack_count=2, timing_rules=["no food after 21:00"], target_calories=2100,
+        weekly_budget=90.0, shopping_format="list", supplements=["vitamin D", "creatine"]
+    )
+
+
+def generic_to_dict(model):
+    """What to_dict did before the compiled serializers: dict() then a second generic walk."""
+    return Type._primitive(BaseModel.model_dump(model, exclude_none=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Serializations per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements (best is reported)")
+    args = parser.parse_args()
+
+    cases = {
+        "Recipe (12 ingredients)": Type.Recipe.from_dict(recipe_document()),
+        "MealPrepProfile": meal_prep_profile(),
+    }
+
+    print(f"{'model':<26}{'generic us':>12}{'compiled us':>13}{'speedup':>10}")
+    for name, model in cases.items():
+        assert model.to_dict() == generic_to_dict(model)
+        timings = {}
+        for label, dump in (("generic", generic_to_dict), ("compiled", lambda m: m.to_dict())):
+            best = min(timeit.repeat(lambda: dump(model), number=args.number, repeat=args.repeat))
+            timings[label] = best / args.number * 1e6
+        print(f"{name:<26}{timings['generic']:>12.1f}{timings['compiled']:>13.1f}"
+              f"{timings['generic'] / timings['compiled']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
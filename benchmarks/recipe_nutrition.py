@@ -0,0 +1,96 @@
+"""Microbenchmark recipe nutrition: per-recipe Python loop vs. one NutritionBatch pass over the catalog.
+
+The baseline is the seeder's former calculate_recipe_nutrition (a loop over
+every ingredient line calling amount_to_grams), run once per recipe. The
+batch numbers include adding the recipes to the batch. No database needed.
+
+Usage:
+    python benchmarks/recipe_nutrition.py --recipes 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CalorIA import types as Type
+from CalorIA.mixins import nutrition
+from CalorIA.mixins.nutrition import NutritionBatch
+
+
+def catalog(recipe_count, ingredient_count=500, lines=8):
+    random.seed(42)
+    ingredients = [Type.Ingredient(id=None, name=f"Ingredient {i}", kcal_per_100g=random.uniform(10, 900),
+                                   protein_per_100g=random.uniform(0, 30), fat_per_100g=random.uniform(0, 50),
+                                   carbs_per_100g=random.uniform(0, 80), density_g_per_ml=random.choice([None, 0.9, 1.03]),
+                                   grams_per_unit=random.choice([None, 50.0, 120.0]))
+                   for i in range(ingredient_count)]
+    units = list(Type.IngredientUnit)
+    recipes = []
+    for _ in range(recipe_count):
+        recipe_ingredients = []
+        for ingredient in random.sample(ingredients, lines):
+            unit = random.choice(units)
+            if unit == Type.IngredientUnit.UNIT and ingredient.grams_per_unit is None:
+                unit = Type.IngredientUnit.G
+            recipe_ingredients.append(Type.RecipeIngredient(ingredient=ingredient, amount=random.uniform(1, 300), unit=unit))
+        recipes.append((recipe_ingredients, random.randint(1, 8)))
+    return recipes
+
+
+def loop_nutrition(recipe_ingredients, servings):
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for line in recipe_ingredients:
+        if line.ingredient and line.amount:
+            grams = line.ingredient.amount_to_grams(line.amount, line.unit)
+            for i, field in enumerate(nutrition.NUTRIENT_FIELDS):
+                totals[i] += ((getattr(line.ingredient, field) or 0) * grams) / 100
+    per_serving = [value / servings if servings > 0 else value for value in totals]
+    return [round(value, 1) for value in per_serving + totals]
+
+
+def batch_nutrition(recipes):
+    batch = NutritionBatch()
+    for recipe_ingredients, servings in recipes:
+        batch.add_recipe(recipe_ingredients, servings)
+    return batch.compute()
+
+
+def best_of(repeat, function, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=20000, help="Synthetic recipes to compute")
+    parser.add_argument("--repeat", type=int, default=3, help="Measurements (best is reported)")
+    args = parser.parse_args()
+
+    recipes = catalog(args.recipes)
+    loop_ms, expected = best_of(args.repeat, lambda: [loop_nutrition(*recipe) for recipe in recipes])
+    numpy_ms, results = best_of(args.repeat, batch_nutrition, recipes)
+    numpy_available = nutrition.NUMPY_AVAILABLE
+    nutrition.NUMPY_AVAILABLE = False
+    python_ms, _ = best_of(args.repeat, batch_nutrition, recipes)
+    nutrition.NUMPY_AVAILABLE = numpy_available
+
+    keys = nutrition.PER_SERVING_KEYS + nutrition.TOTAL_KEYS
+    mismatches = sum(1 for values, result in zip(expected, results)
+                     if any(abs(value - result[key]) > 0.1 for value, key in zip(values, keys)))
+    print(f"{args.recipes} recipes, {mismatches} differ from the per-recipe loop by more than 0.1\n")
+    print(f"{'method':<28}{'ms':>10}{'speedup':>10}")
+    print(f"{'per-recipe loop':<28}{loop_ms:>10.0f}{1:>9.1f}x")
+    print(f"{'NutritionBatch (python)':<28}{python_ms:>10.0f}{loop_ms / python_ms:>9.1f}x")
+    if numpy_available:
+        print(f"{'NutritionBatch (numpy)':<28}{numpy_ms:>10.0f}{loop_ms / numpy_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
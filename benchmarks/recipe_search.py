@@ -0,0 +1,84 @@
+"""Microbenchmark recipe search: four-regex scan over every recipe vs. the in-memory BM25 index.
+
+The regex baseline runs the old search filter (unanchored, case-insensitive
+on name, description, legacy tags and ingredient names) in-process over the
+same documents and sorts newest first; it leaves out the MongoDB round trip,
+so it understates the old cost. No database needed.
+
+Usage:
+    python benchmarks/recipe_search.py --recipes 20000 --number 50
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CalorIA.mixins.search_index import RecipeSearchIndex
+from ingredient_search import WORDS
+
+DISHES = ["curry", "soup", "salad", "stew", "bowl", "pasta", "pie", "stir fry", "tacos", "pancakes", "omelette"]
+QUERIES = {"one word": "curry", "two words": "chicken soup", "ingredient": "spinach", "three words": "sweet potato salad"}
+
+
+def recipe_documents(count):
+    random.seed(42)
+    categories = {str(uuid4()): name for name in ("Breakfast", "Lunch", "Dinner", "Snack")}
+    tags = {str(uuid4()): name for name in ("Vegan", "Quick", "High protein", "Gluten free")}
+    now = datetime.now(timezone.utc)
+    docs = []
+    for i in range(count):
+        words = random.sample(WORDS, 2)
+        docs.append({
+            "id": str(uuid4()), "name": f"{' '.join(words).title()} {random.choice(DISHES).title()}",
+            "description": f"A {random.choice(WORDS)} {random.choice(DISHES)} with {random.choice(WORDS)}",
+            "category_id": random.choice(list(categories)), "tag_ids": random.sample(list(tags), 2),
+            "ingredients": [{"ingredient": {"name": f"{w} {random.choice(WORDS)}"}} for w in random.sample(WORDS, 6)],
+            "difficulty": random.choice(["easy", "medium", "hard"]), "created_at": now - timedelta(minutes=i),
+        })
+    return docs, categories, tags
+
+
+def regex_search(docs, term, limit):
+    pattern = re.compile(term, re.IGNORECASE)
+    matches = [doc for doc in docs
+               if pattern.search(doc["name"]) or pattern.search(doc["description"])
+               or any(pattern.search(item["ingredient"]["name"]) for item in doc["ingredients"])]
+    return sorted(matches, key=lambda doc: doc["created_at"], reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=20000, help="Synthetic recipes to index")
+    parser.add_argument("--number", type=int, default=50, help="Searches per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements (best is reported)")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    args = parser.parse_args()
+
+    docs, categories, tags = recipe_documents(args.recipes)
+    index = RecipeSearchIndex()
+    start = time.perf_counter()
+    index.load(docs, categories, tags)
+    print(f"Indexed {len(index)} recipes in {(time.perf_counter() - start) * 1000:.0f}ms\n")
+
+    print(f"{'query':<34}{'regex ms':>10}{'index ms':>10}{'speedup':>10}{'matches':>9}")
+    for label, term in QUERIES.items():
+        timings = {}
+        searches = (("regex", lambda: regex_search(docs, term, args.limit)),
+                    ("index", lambda: index.search(term, limit=args.limit)))
+        for name, search in searches:
+            best = min(timeit.repeat(search, number=args.number, repeat=args.repeat))
+            timings[name] = best / args.number * 1e3
+        total = index.search(term, limit=args.limit)[1]
+        print(f"{label + ' ' + repr(term):<34}{timings['regex']:>10.2f}{timings['index']:>10.2f}"
+              f"{timings['regex'] / timings['index']:>9.1f}x{total:>9}")
+
+
+if __name__ == "__main__":
+    main()